@@ -83,6 +83,7 @@ asr_config= # Config for asr model training.
 asr_args=   # Arguments for asr model training, e.g., "--max_epoch 10".
             # Note that it will overwrite args in asr config.
 feats_normalize=global_mvn # Normalizaton layer type.
+asr_feats_cache=false # Cache the frontend outputs in stats collection and reuse them in training.
 num_splits_asr=1           # Number of splitting for lm corpus.
 
 # Decoding related
@@ -179,6 +180,7 @@ Options:
                        # e.g., --asr_args "--max_epoch 10"
                        # Note that it will overwrite args in asr config.
     --feats_normalize  # Normalizaton layer type (default="${feats_normalize}").
+    --asr_feats_cache  # Cache the frontend outputs in stats collection and reuse them in training (default="${asr_feats_cache}").
     --num_splits_asr   # Number of splitting for lm corpus  (default="${num_splits_asr}").
 
     # Decoding related
@@ -425,8 +427,8 @@ if ! "${skip_data_prep}"; then
                 steps/make_fbank_pitch.sh --nj "${_nj}" --cmd "${train_cmd}" "${data_feats}${_suf}/${dset}"
                 utils/fix_data_dir.sh "${data_feats}${_suf}/${dset}"
 
-                # 3. Derive the the frame length and feature dimension
-                scripts/feats/feat_to_shape.sh --nj "${_nj}" --cmd "${train_cmd}" \
+                # 3. Derive the the frame length and feature dimension from the ark headers
+                ${python} -m espnet2.bin.data_to_shape --data_type kaldi_ark --nj "${_nj}" \
                     "${data_feats}${_suf}/${dset}/feats.scp" "${data_feats}${_suf}/${dset}/feats_shape"
 
                 # 4. Write feats_dim
@@ -802,6 +804,10 @@ if ! "${skip_train}"; then
             # "sound" supports "wav", "flac", etc.
             _type=sound
             _opts+="--frontend_conf fs=${fs} "
+            if "${asr_feats_cache}"; then
+                # The features are written into ${asr_stats_dir}/{train,valid}/collect_feats/feats
+                _opts+="--write_collected_feats true --collected_feats_format mmap "
+            fi
         else
             _scp=feats.scp
             _type=kaldi_ark
@@ -900,6 +906,11 @@ if ! "${skip_train}"; then
             _type=sound
             _fold_length="$((asr_speech_fold_length * 100))"
             _opts+="--frontend_conf fs=${fs} "
+            if "${asr_feats_cache}"; then
+                # Skip the frontend in training by giving the cached features
+                _opts+="--train_data_path_and_name_and_type ${asr_stats_dir}/train/collect_feats/feats,feats,mmap "
+                _opts+="--valid_data_path_and_name_and_type ${asr_stats_dir}/valid/collect_feats/feats,feats,mmap "
+            fi
         else
             _scp=feats.scp
             _type=kaldi_ark
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 import argparse
+from collections import deque
 import logging
 from io import BytesIO
+import multiprocessing
 from pathlib import Path
 from typing import Tuple, Optional
 
@@ -15,7 +17,7 @@ from typeguard import check_argument_types
 
 from espnet.utils.cli_utils import get_commandline_args
 from espnet2.fileio.read_text import read_2column_text
-from espnet2.fileio.sound_scp import SoundScpWriter
+from espnet2.utils.types import str2bool
 
 
 def humanfriendly_or_none(value: str):
@@ -37,6 +39,92 @@ def str2int_tuple(integers: str) -> Optional[Tuple[int, ...]]:
     return tuple(map(int, integers.strip().split(",")))
 
 
+def resample(wave: np.ndarray, rate: int, fs: Optional[int]) -> Tuple[np.ndarray, int]:
+    if fs is not None and fs != rate:
+        # FIXME(kamo): To use sox?
+        wave = resampy.resample(wave.astype(np.float64), rate, fs, axis=0)
+        wave = wave.astype(np.int16)
+        rate = fs
+    return wave, rate
+
+
+def process(
+    uttid: str,
+    wavpath: Optional[str],
+    rate: Optional[int],
+    wave: Optional[np.ndarray],
+    ref_channels: Optional[Tuple[int, ...]],
+    fs: Optional[int],
+    audio_format: str,
+    owavpath: Optional[str],
+) -> Tuple[str, Optional[str], Optional[bytes], int]:
+    """Read, resample and write an utterance.
+
+    This function is executed in the worker processes.
+
+    Returns:
+        The tuple of the uttid, the path of the output audio,
+        the encoded audio to be packed into the archive, and the number of samples.
+        The output path is the input path as is if it can be used without change.
+    """
+    save_asis = False
+    if wave is None:
+        if wavpath.endswith("|"):
+            # Streaming input e.g. cat a.wav |
+            with kaldiio.open_like_kaldi(wavpath, "rb") as f:
+                with BytesIO(f.read()) as g:
+                    wave, rate = soundfile.read(g, dtype=np.int16)
+        else:
+            wave, rate = soundfile.read(wavpath, dtype=np.int16)
+            save_asis = (
+                owavpath is not None
+                and Path(wavpath).suffix == "." + audio_format
+                and (fs is None or fs == rate)
+            )
+
+    # wave: (Time,) or (Time, Nmic)
+    if wave.ndim == 2 and ref_channels is not None:
+        wave = wave[:, ref_channels]
+        save_asis = False
+
+    if save_asis:
+        # Neither --segments nor --fs are specified and
+        # the line doesn't end with "|",
+        # i.e. not using unix-pipe,
+        # only in this case,
+        # just using the original file as is.
+        return uttid, wavpath, None, len(wave)
+
+    wave, rate = resample(wave, rate, fs)
+    if owavpath is not None:
+        soundfile.write(owavpath, wave, rate)
+        return uttid, owavpath, None, len(wave)
+    else:
+        # Kaldi-compatible wav entry in the ark
+        with BytesIO() as f:
+            soundfile.write(f, wave, rate, format="wav", subtype="PCM_16")
+            return uttid, None, f.getvalue(), len(wave)
+
+
+def imap_readahead(pool, func, iterable, readahead: int):
+    """Apply the function in the pool, keeping the order of the outputs.
+
+    At most "readahead" inputs are submitted ahead of the output being consumed,
+    so the memory usage is bounded even if the writer is slow.
+    """
+    if pool is None:
+        for args in iterable:
+            yield func(*args)
+        return
+    queue = deque()
+    for args in iterable:
+        queue.append(pool.apply_async(func, args))
+        if len(queue) >= readahead:
+            yield queue.popleft().get()
+    while len(queue) > 0:
+        yield queue.popleft().get()
+
+
 def main():
     logfmt = "%(asctime)s (%(module)s:%(lineno)d) %(levelname)s: %(message)s"
     logging.basicConfig(level=logging.INFO, format=logfmt)
@@ -61,6 +149,26 @@ def main():
         help="If the sampling rate specified, " "Change the sampling rate.",
     )
     parser.add_argument("--audio-format", default="wav")
+    parser.add_argument(
+        "--archive",
+        type=str2bool,
+        default=False,
+        help="Pack all waves into a Kaldi-ark file instead of a file per utterance. "
+        "The waves are stored in wav format regardless of --audio-format",
+    )
+    parser.add_argument(
+        "--nj",
+        type=int,
+        default=1,
+        help="The number of worker processes to read, resample, and encode waves",
+    )
+    parser.add_argument(
+        "--readahead",
+        type=int,
+        default=None,
+        help="The maximum number of utterances processed ahead of writing. "
+        "If None, 4 * nj",
+    )
     group = parser.add_mutually_exclusive_group()
     group.add_argument("--ref-channels", default=None, type=str2int_tuple)
     group.add_argument("--utt2ref-channels", default=None, type=str)
@@ -83,92 +191,78 @@ def main():
     else:
         utt2ref_channels = None
 
+    Path(args.outdir).mkdir(parents=True, exist_ok=True)
+    wavdir = Path(args.outdir) / f"data_{args.name}"
+    if not args.archive:
+        wavdir.mkdir(parents=True, exist_ok=True)
+    out_wavscp = Path(args.outdir) / f"{args.name}.scp"
+    out_ark = Path(args.outdir) / f"data_{args.name}.ark"
+
+    def owavpath(uttid: str) -> Optional[str]:
+        if args.archive:
+            return None
+        return str(wavdir / f"{uttid}.{args.audio_format}")
+
+    def ref_channels(uttid: str) -> Optional[Tuple[int, ...]]:
+        if utt2ref_channels is None:
+            return None
+        return utt2ref_channels(uttid)
+
     if args.segments is not None:
         # Note: kaldiio supports only wav-pcm-int16le file.
         loader = kaldiio.load_scp_sequential(args.scp, segments=args.segments)
-        with SoundScpWriter(
-            args.outdir,
-            Path(args.outdir) / f"{args.name}.scp",
-            format=args.audio_format,
-        ) as writer, out_num_samples.open("w") as fnum_samples:
-            for uttid, (rate, wave) in tqdm(loader):
-                # wave: (Time,) or (Time, Nmic)
-                if wave.ndim == 2 and utt2ref_channels is not None:
-                    wave = wave[:, utt2ref_channels(uttid)]
-
-                if args.fs is not None and args.fs != rate:
-                    # FIXME(kamo): To use sox?
-                    wave = resampy.resample(
-                        wave.astype(np.float64), rate, args.fs, axis=0
-                    )
-                    wave = wave.astype(np.int16)
-                    rate = args.fs
-                writer[uttid] = rate, wave
-                fnum_samples.write(f"{uttid} {len(wave)}\n")
+        inputs = (
+            (
+                uttid,
+                None,
+                rate,
+                wave,
+                ref_channels(uttid),
+                args.fs,
+                args.audio_format,
+                owavpath(uttid),
+            )
+            for uttid, (rate, wave) in loader
+        )
     else:
-        wavdir = Path(args.outdir) / f"data_{args.name}"
-        wavdir.mkdir(parents=True, exist_ok=True)
-        out_wavscp = Path(args.outdir) / f"{args.name}.scp"
-
-        with Path(args.scp).open("r") as fscp, out_wavscp.open(
-            "w"
-        ) as fout, out_num_samples.open("w") as fnum_samples:
-            for line in tqdm(fscp):
-                uttid, wavpath = line.strip().split(None, 1)
-
-                if wavpath.endswith("|"):
-                    # Streaming input e.g. cat a.wav |
-                    with kaldiio.open_like_kaldi(wavpath, "rb") as f:
-                        with BytesIO(f.read()) as g:
-                            wave, rate = soundfile.read(g, dtype=np.int16)
-                            if wave.ndim == 2 and utt2ref_channels is not None:
-                                wave = wave[:, utt2ref_channels(uttid)]
-
-                        if args.fs is not None and args.fs != rate:
-                            # FIXME(kamo): To use sox?
-                            wave = resampy.resample(
-                                wave.astype(np.float64), rate, args.fs, axis=0
-                            )
-                            wave = wave.astype(np.int16)
-                            rate = args.fs
-
-                        owavpath = str(wavdir / f"{uttid}.{args.audio_format}")
-                        soundfile.write(owavpath, wave, rate)
-                        fout.write(f"{uttid} {owavpath}\n")
-                else:
-                    wave, rate = soundfile.read(wavpath, dtype=np.int16)
-                    if wave.ndim == 2 and utt2ref_channels is not None:
-                        wave = wave[:, utt2ref_channels(uttid)]
-                        save_asis = False
-
-                    elif Path(wavpath).suffix == "." + args.audio_format and (
-                        args.fs is None or args.fs == rate
-                    ):
-                        save_asis = True
-
-                    else:
-                        save_asis = False
-
-                    if save_asis:
-                        # Neither --segments nor --fs are specified and
-                        # the line doesn't end with "|",
-                        # i.e. not using unix-pipe,
-                        # only in this case,
-                        # just using the original file as is.
-                        fout.write(f"{uttid} {wavpath}\n")
-                    else:
-                        if args.fs is not None and args.fs != rate:
-                            # FIXME(kamo): To use sox?
-                            wave = resampy.resample(
-                                wave.astype(np.float64), rate, args.fs, axis=0
-                            )
-                            wave = wave.astype(np.int16)
-                            rate = args.fs
-
-                        owavpath = str(wavdir / f"{uttid}.{args.audio_format}")
-                        soundfile.write(owavpath, wave, rate)
-                        fout.write(f"{uttid} {owavpath}\n")
-                fnum_samples.write(f"{uttid} {len(wave)}\n")
+
+        def _inputs():
+            with Path(args.scp).open("r") as fscp:
+                for line in fscp:
+                    uttid, wavpath = line.strip().split(None, 1)
+                    yield (
+                        uttid,
+                        wavpath,
+                        None,
+                        None,
+                        ref_channels(uttid),
+                        args.fs,
+                        args.audio_format,
+                        owavpath(uttid),
+                    )
+
+        inputs = _inputs()
+
+    pool = multiprocessing.Pool(args.nj) if args.nj > 1 else None
+    readahead = args.readahead if args.readahead is not None else 4 * args.nj
+    fark = out_ark.open("wb") if args.archive else None
+    try:
+        with out_wavscp.open("w") as fout, out_num_samples.open("w") as fnum_samples:
+            for uttid, path, buf, num_samples in tqdm(
+                imap_readahead(pool, process, inputs, readahead)
+            ):
+                if buf is not None:
+                    fark.write(f"{uttid} ".encode("utf-8"))
+                    path = f"{out_ark}:{fark.tell()}"
+                    fark.write(buf)
+                fout.write(f"{uttid} {path}\n")
+                fnum_samples.write(f"{uttid} {num_samples}\n")
+    finally:
+        if fark is not None:
+            fark.close()
+        if pool is not None:
+            pool.close()
+            pool.join()
 
 
 if __name__ == "__main__":
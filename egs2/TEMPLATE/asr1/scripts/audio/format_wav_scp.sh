@@ -24,6 +24,8 @@ Options
   --segments <segments>
   --nj <nj>
   --cmd <cmd>
+  --archive <true|false>  # Pack the waves into an ark per job
+  --worker_nj <worker_nj>  # The number of processes in each job
 EOF
 )
 
@@ -37,6 +39,8 @@ ref_channels=
 utt2ref_channels=
 
 audio_format=wav
+archive=false
+worker_nj=1
 write_utt2num_samples=true
 
 log "$0 $*"
@@ -84,6 +88,7 @@ if [ -n "${utt2ref_channels}" ]; then
 elif [ -n "${ref_channels}" ]; then
     opts="--ref-channels ${ref_channels} "
 fi
+opts+="--archive ${archive} --nj ${worker_nj} "
 
 
 if [ -n "${segments}" ]; then
@@ -75,6 +75,7 @@ tts_stats_dir=""   # Specify the direcotry path for statistics. If empty, automa
 num_splits=1       # Number of splitting for tts corpus.
 teacher_dumpdir="" # Directory of teacher outputs (needed if tts=fastspeech).
 write_collected_feats=false # Whether to dump features in stats collection.
+collected_feats_format=npy  # The format of the dumped features (npy or mmap).
 
 # Decoding related
 inference_config="" # Config for decoding.
@@ -156,6 +157,7 @@ Options:
                     # If empty, automatically decided (default="${tts_stats_dir}").
     --num_splits    # Number of splitting for tts corpus (default="${num_splits}").
     --write_collected_feats # Whether to dump features in statistics collection (default="${write_collected_feats}").
+    --collected_feats_format # The format of the dumped features, npy or mmap (default="${collected_feats_format}").
 
     # Decoding related
     --inference_config  # Config for decoding (default="${inference_config}").
@@ -342,8 +344,8 @@ if ! "${skip_data_prep}"; then
                     "${data_feats}${_suf}/${dset}"
                 utils/fix_data_dir.sh "${data_feats}${_suf}/${dset}"
 
-                # 3. Derive the the frame length and feature dimension
-                scripts/feats/feat_to_shape.sh --nj "${_nj}" --cmd "${train_cmd}" \
+                # 3. Derive the the frame length and feature dimension from the ark headers
+                ${python} -m espnet2.bin.data_to_shape --data_type kaldi_ark --nj "${_nj}" \
                     "${data_feats}${_suf}/${dset}/feats.scp" "${data_feats}${_suf}/${dset}/feats_shape"
 
                 # 4. Write feats_dim
@@ -532,6 +534,7 @@ if ! "${skip_train}"; then
             ${python} -m espnet2.bin.tts_train \
                 --collect_stats true \
                 --write_collected_feats "${write_collected_feats}" \
+                --collected_feats_format "${collected_feats_format}" \
                 --use_preprocessor true \
                 --token_type "${token_type}" \
                 --token_list "${token_list}" \
@@ -698,7 +701,13 @@ if ! "${skip_train}"; then
 
         # If there are dumped files of additional inputs, we use it to reduce computational cost
         # NOTE (kan-bayashi): Use dumped files of the target features as well?
-        if [ -e "${tts_stats_dir}/train/collect_feats/pitch.scp" ]; then
+        if [ -e "${tts_stats_dir}/train/collect_feats/pitch/index" ]; then
+            # The memory-mapped stores created with --collected_feats_format mmap
+            _train_collect_dir=${tts_stats_dir}/train/collect_feats
+            _valid_collect_dir=${tts_stats_dir}/valid/collect_feats
+            _opts+="--train_data_path_and_name_and_type ${_train_collect_dir}/pitch,pitch,mmap "
+            _opts+="--valid_data_path_and_name_and_type ${_valid_collect_dir}/pitch,pitch,mmap "
+        elif [ -e "${tts_stats_dir}/train/collect_feats/pitch.scp" ]; then
             _scp=pitch.scp
             _type=npy
             _train_collect_dir=${tts_stats_dir}/train/collect_feats
@@ -706,7 +715,12 @@ if ! "${skip_train}"; then
             _opts+="--train_data_path_and_name_and_type ${_train_collect_dir}/${_scp},pitch,${_type} "
             _opts+="--valid_data_path_and_name_and_type ${_valid_collect_dir}/${_scp},pitch,${_type} "
         fi
-        if [ -e "${tts_stats_dir}/train/collect_feats/energy.scp" ]; then
+        if [ -e "${tts_stats_dir}/train/collect_feats/energy/index" ]; then
+            _train_collect_dir=${tts_stats_dir}/train/collect_feats
+            _valid_collect_dir=${tts_stats_dir}/valid/collect_feats
+            _opts+="--train_data_path_and_name_and_type ${_train_collect_dir}/energy,energy,mmap "
+            _opts+="--valid_data_path_and_name_and_type ${_valid_collect_dir}/energy,energy,mmap "
+        elif [ -e "${tts_stats_dir}/train/collect_feats/energy.scp" ]; then
             _scp=energy.scp
             _type=npy
             _train_collect_dir=${tts_stats_dir}/train/collect_feats
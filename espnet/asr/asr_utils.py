@@ -2,6 +2,7 @@
 # Apache 2.0  (http://www.apache.org/licenses/LICENSE-2.0)
 
 import argparse
+import collections
 import copy
 import json
 import logging
@@ -12,6 +13,8 @@ import tempfile
 import numpy as np
 import torch
 
+from espnet.utils.forked_imap import forked_imap
+
 
 # * -------------------- training iterator related -------------------- *
 
@@ -855,6 +858,172 @@ def add_results_to_json(js, nbest_hyps, char_list):
     return new_js
 
 
+def iter_recog_json(path):
+    """Iterate over the utterances of the recognition data.
+
+    The data is read one line at a time if the file is a json-lines file
+    (``*.jsonl``), where each line is a json object such as
+    ``{"utt_id": {"input": [...], "output": [...], "utt2spk": ...}}``.
+    Otherwise, the file is read as the conventional ``{"utts": {...}}`` json.
+
+    Args:
+        path (str): Filename of the recognition data.
+
+    Yields:
+        tuple(str, dict[str, Any]): Utterance id and its information.
+
+    """
+    if str(path).endswith(".jsonl"):
+        with open(path, "rb") as f:
+            for line in f:
+                line = line.strip()
+                if len(line) == 0:
+                    continue
+                for name, info in json.loads(line).items():
+                    yield name, info
+    else:
+        with open(path, "rb") as f:
+            js = json.load(f)["utts"]
+        for name, info in js.items():
+            yield name, info
+
+
+class JsonlResultWriter(object):
+    """Append the recognition results to a json-lines file one by one.
+
+    The results written by the previous run are kept, so that the decoding
+    can be resumed by skipping the utterances which are found in this file.
+    An incomplete line left by an interrupted run is removed.
+
+    Args:
+        path (str): Filename of the json-lines file.
+
+    """
+
+    def __init__(self, path):
+        """Initialize the writer and read the finished utterances."""
+        self.path = path
+        self.done = set()
+        offset = 0
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                for line in f:
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("No line break")
+                        self.done.update(json.loads(line))
+                    except ValueError:
+                        logging.warning(f"Drop the incomplete result in {path}")
+                        break
+                    offset += len(line)
+            with open(path, "r+b") as f:
+                f.truncate(offset)
+        self.f = open(path, "ab")
+
+    def __contains__(self, name):
+        """Return whether the result of the utterance is already written."""
+        return name in self.done
+
+    def __len__(self):
+        """Return the number of written utterances."""
+        return len(self.done)
+
+    def __setitem__(self, name, info):
+        """Write the result of an utterance and flush it immediately."""
+        line = json.dumps({name: info}, ensure_ascii=False, sort_keys=True)
+        self.f.write((line + "\n").encode("utf_8"))
+        self.f.flush()
+        self.done.add(name)
+
+    def close(self):
+        """Close the file."""
+        self.f.close()
+
+
+def decode_recog_json(
+    decode_fn,
+    recog_json,
+    result_label,
+    batchsize=1,
+    sort_in_input_length=False,
+    result_jsonl=None,
+    num_workers=1,
+):
+    """Decode all utterances of the recognition data and write the results.
+
+    Args:
+        decode_fn (Callable): Function to decode a list of utterances,
+            which takes ``list[tuple(str, dict)]`` and returns the list of
+            the new utterance dicts in the same order.
+        recog_json (str): Filename of the recognition data (json or json-lines).
+        result_label (str): Filename of the result label data (json).
+        batchsize (int): The number of utterances given to decode_fn at once.
+        sort_in_input_length (bool): Sort the utterances in descending order of
+            the input length before making batches. Note that all utterances are
+            kept in memory in this case.
+        result_jsonl (str): If given, each result is appended to this
+            json-lines file immediately, and the utterances already found
+            in the file are skipped, i.e. the decoding can be resumed.
+        num_workers (int): The number of worker processes.
+            The model is shared with the forked workers and
+            the intra-op threads are divided among them.
+
+    """
+    writer = JsonlResultWriter(result_jsonl) if result_jsonl is not None else None
+    if writer is not None and len(writer) > 0:
+        logging.info(f"Skip {len(writer)} utterances decoded in {result_jsonl}")
+
+    def batches():
+        items = (
+            (name, info)
+            for name, info in iter_recog_json(recog_json)
+            if writer is None or name not in writer
+        )
+        if sort_in_input_length:
+            items = sorted(items, key=lambda x: -x[1]["input"][0]["shape"][0])
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) == max(batchsize, 1):
+                yield batch
+                batch = []
+        if len(batch) > 0:
+            yield batch
+
+    # Keep the batches in the parent to pair them with the results
+    pending = collections.deque()
+
+    def feed():
+        for batch in batches():
+            pending.append(batch)
+            yield batch
+
+    new_js = {}
+    idx = 0
+    # NOTE: The model is inherited from the parent process by fork,
+    # so decode_fn doesn't need to be picklable.
+    for new_infos in forked_imap(decode_fn, feed(), num_workers):
+        batch = pending.popleft()
+        for (name, _), new_info in zip(batch, new_infos):
+            idx += 1
+            logging.info("(%d) decoded %s", idx, name)
+            if writer is not None:
+                writer[name] = new_info
+            else:
+                new_js[name] = new_info
+
+    if writer is not None:
+        writer.close()
+        new_js = dict(iter_recog_json(result_jsonl))
+
+    with open(result_label, "wb") as f:
+        f.write(
+            json.dumps(
+                {"utts": new_js}, indent=4, ensure_ascii=False, sort_keys=True
+            ).encode("utf_8")
+        )
+
+
 def plot_spectrogram(
     plt,
     spec,
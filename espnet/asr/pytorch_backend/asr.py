@@ -25,6 +25,7 @@ from torch.nn.parallel import data_parallel
 from espnet.asr.asr_utils import adadelta_eps_decay
 from espnet.asr.asr_utils import add_results_to_json
 from espnet.asr.asr_utils import CompareValueTrigger
+from espnet.asr.asr_utils import decode_recog_json
 from espnet.asr.asr_utils import format_mulenc_args
 from espnet.asr.asr_utils import get_model_conf
 from espnet.asr.asr_utils import plot_spectrogram
@@ -974,10 +975,8 @@ def recog(args):
         if rnnlm:
             rnnlm.cuda()
 
-    # read json data
-    with open(args.recog_json, "rb") as f:
-        js = json.load(f)["utts"]
-    new_js = {}
+    if args.num_workers > 1 and args.ngpu > 0:
+        raise NotImplementedError("--num-workers > 1 is supported only on CPU")
 
     load_inputs_and_targets = LoadInputsAndTargets(
         mode="asr",
@@ -989,143 +988,99 @@ def recog(args):
         preprocess_args={"train": False},
     )
 
-    if args.batchsize == 0:
-        with torch.no_grad():
-            for idx, name in enumerate(js.keys(), 1):
-                logging.info("(%d/%d) decoding " + name, idx, len(js.keys()))
-                batch = [(name, js[name])]
-                feat = load_inputs_and_targets(batch)
-                feat = (
-                    feat[0][0]
-                    if args.num_encs == 1
-                    else [feat[idx][0] for idx in range(model.num_encs)]
-                )
-                if args.streaming_mode == "window" and args.num_encs == 1:
-                    logging.info(
-                        "Using streaming recognizer with window size %d frames",
-                        args.streaming_window,
-                    )
-                    se2e = WindowStreamingE2E(e2e=model, recog_args=args, rnnlm=rnnlm)
-                    for i in range(0, feat.shape[0], args.streaming_window):
-                        logging.info(
-                            "Feeding frames %d - %d", i, i + args.streaming_window
-                        )
-                        se2e.accept_input(feat[i : i + args.streaming_window])
-                    logging.info("Running offline attention decoder")
-                    se2e.decode_with_attention_offline()
-                    logging.info("Offline attention decoder finished")
-                    nbest_hyps = se2e.retrieve_recognition()
-                elif args.streaming_mode == "segment" and args.num_encs == 1:
-                    logging.info(
-                        "Using streaming recognizer with threshold value %d",
-                        args.streaming_min_blank_dur,
-                    )
-                    nbest_hyps = []
-                    for n in range(args.nbest):
-                        nbest_hyps.append({"yseq": [], "score": 0.0})
-                    se2e = SegmentStreamingE2E(e2e=model, recog_args=args, rnnlm=rnnlm)
-                    r = np.prod(model.subsample)
-                    for i in range(0, feat.shape[0], r):
-                        hyps = se2e.accept_input(feat[i : i + r])
-                        if hyps is not None:
-                            text = "".join(
-                                [
-                                    train_args.char_list[int(x)]
-                                    for x in hyps[0]["yseq"][1:-1]
-                                    if int(x) != -1
-                                ]
-                            )
-                            text = text.replace(
-                                "\u2581", " "
-                            ).strip()  # for SentencePiece
-                            text = text.replace(model.space, " ")
-                            text = text.replace(model.blank, "")
-                            logging.info(text)
-                            for n in range(args.nbest):
-                                nbest_hyps[n]["yseq"].extend(hyps[n]["yseq"])
-                                nbest_hyps[n]["score"] += hyps[n]["score"]
-                elif hasattr(model, "decoder_mode") and model.decoder_mode == "maskctc":
-                    nbest_hyps = model.recognize_maskctc(
-                        feat, args, train_args.char_list
-                    )
-                else:
-                    nbest_hyps = model.recognize(
-                        feat, args, train_args.char_list, rnnlm
-                    )
-                new_js[name] = add_results_to_json(
-                    js[name], nbest_hyps, train_args.char_list
-                )
-
-    else:
-
-        def grouper(n, iterable, fillvalue=None):
-            kargs = [iter(iterable)] * n
-            return zip_longest(*kargs, fillvalue=fillvalue)
+    @torch.no_grad()
+    def decode(batch):
+        name, info = batch[0]
+        logging.info("decoding " + name)
+        feat = load_inputs_and_targets(batch)
+        feat = (
+            feat[0][0]
+            if args.num_encs == 1
+            else [feat[idx][0] for idx in range(model.num_encs)]
+        )
+        if args.streaming_mode == "window" and args.num_encs == 1:
+            logging.info(
+                "Using streaming recognizer with window size %d frames",
+                args.streaming_window,
+            )
+            se2e = WindowStreamingE2E(e2e=model, recog_args=args, rnnlm=rnnlm)
+            for i in range(0, feat.shape[0], args.streaming_window):
+                logging.info("Feeding frames %d - %d", i, i + args.streaming_window)
+                se2e.accept_input(feat[i : i + args.streaming_window])
+            logging.info("Running offline attention decoder")
+            se2e.decode_with_attention_offline()
+            logging.info("Offline attention decoder finished")
+            nbest_hyps = se2e.retrieve_recognition()
+        elif args.streaming_mode == "segment" and args.num_encs == 1:
+            logging.info(
+                "Using streaming recognizer with threshold value %d",
+                args.streaming_min_blank_dur,
+            )
+            nbest_hyps = decode_segment_streaming(feat)
+        elif hasattr(model, "decoder_mode") and model.decoder_mode == "maskctc":
+            nbest_hyps = model.recognize_maskctc(feat, args, train_args.char_list)
+        else:
+            nbest_hyps = model.recognize(feat, args, train_args.char_list, rnnlm)
+        return [add_results_to_json(info, nbest_hyps, train_args.char_list)]
+
+    @torch.no_grad()
+    def decode_batch(batch):
+        feats = (
+            load_inputs_and_targets(batch)[0]
+            if args.num_encs == 1
+            else load_inputs_and_targets(batch)
+        )
+        if args.streaming_mode == "window" and args.num_encs == 1:
+            raise NotImplementedError
+        elif args.streaming_mode == "segment" and args.num_encs == 1:
+            if args.batchsize > 1:
+                raise NotImplementedError
+            nbest_hyps = [decode_segment_streaming(feats[0])]
+        else:
+            nbest_hyps = model.recognize_batch(
+                feats, args, train_args.char_list, rnnlm=rnnlm
+            )
 
-        # sort data if batchsize > 1
-        keys = list(js.keys())
-        if args.batchsize > 1:
-            feat_lens = [js[key]["input"][0]["shape"][0] for key in keys]
-            sorted_index = sorted(range(len(feat_lens)), key=lambda i: -feat_lens[i])
-            keys = [keys[i] for i in sorted_index]
+        return [
+            add_results_to_json(info, nbest_hyp, train_args.char_list)
+            for (_, info), nbest_hyp in zip(batch, nbest_hyps)
+        ]
 
-        with torch.no_grad():
-            for names in grouper(args.batchsize, keys, None):
-                names = [name for name in names if name]
-                batch = [(name, js[name]) for name in names]
-                feats = (
-                    load_inputs_and_targets(batch)[0]
-                    if args.num_encs == 1
-                    else load_inputs_and_targets(batch)
+    def decode_segment_streaming(feat):
+        nbest_hyps = []
+        for n in range(args.nbest):
+            nbest_hyps.append({"yseq": [], "score": 0.0})
+        se2e = SegmentStreamingE2E(e2e=model, recog_args=args, rnnlm=rnnlm)
+        r = np.prod(model.subsample)
+        for i in range(0, feat.shape[0], r):
+            hyps = se2e.accept_input(feat[i : i + r])
+            if hyps is not None:
+                text = "".join(
+                    [
+                        train_args.char_list[int(x)]
+                        for x in hyps[0]["yseq"][1:-1]
+                        if int(x) != -1
+                    ]
                 )
-                if args.streaming_mode == "window" and args.num_encs == 1:
-                    raise NotImplementedError
-                elif args.streaming_mode == "segment" and args.num_encs == 1:
-                    if args.batchsize > 1:
-                        raise NotImplementedError
-                    feat = feats[0]
-                    nbest_hyps = []
-                    for n in range(args.nbest):
-                        nbest_hyps.append({"yseq": [], "score": 0.0})
-                    se2e = SegmentStreamingE2E(e2e=model, recog_args=args, rnnlm=rnnlm)
-                    r = np.prod(model.subsample)
-                    for i in range(0, feat.shape[0], r):
-                        hyps = se2e.accept_input(feat[i : i + r])
-                        if hyps is not None:
-                            text = "".join(
-                                [
-                                    train_args.char_list[int(x)]
-                                    for x in hyps[0]["yseq"][1:-1]
-                                    if int(x) != -1
-                                ]
-                            )
-                            text = text.replace(
-                                "\u2581", " "
-                            ).strip()  # for SentencePiece
-                            text = text.replace(model.space, " ")
-                            text = text.replace(model.blank, "")
-                            logging.info(text)
-                            for n in range(args.nbest):
-                                nbest_hyps[n]["yseq"].extend(hyps[n]["yseq"])
-                                nbest_hyps[n]["score"] += hyps[n]["score"]
-                    nbest_hyps = [nbest_hyps]
-                else:
-                    nbest_hyps = model.recognize_batch(
-                        feats, args, train_args.char_list, rnnlm=rnnlm
-                    )
-
-                for i, nbest_hyp in enumerate(nbest_hyps):
-                    name = names[i]
-                    new_js[name] = add_results_to_json(
-                        js[name], nbest_hyp, train_args.char_list
-                    )
-
-    with open(args.result_label, "wb") as f:
-        f.write(
-            json.dumps(
-                {"utts": new_js}, indent=4, ensure_ascii=False, sort_keys=True
-            ).encode("utf_8")
-        )
+                text = text.replace("\u2581", " ").strip()  # for SentencePiece
+                text = text.replace(model.space, " ")
+                text = text.replace(model.blank, "")
+                logging.info(text)
+                for n in range(args.nbest):
+                    nbest_hyps[n]["yseq"].extend(hyps[n]["yseq"])
+                    nbest_hyps[n]["score"] += hyps[n]["score"]
+        return nbest_hyps
+
+    decode_recog_json(
+        decode if args.batchsize == 0 else decode_batch,
+        args.recog_json,
+        args.result_label,
+        batchsize=args.batchsize,
+        # sort data if batchsize > 1
+        sort_in_input_length=args.batchsize > 1,
+        result_jsonl=args.result_jsonl,
+        num_workers=args.num_workers,
+    )
 
 
 def enhance(args):
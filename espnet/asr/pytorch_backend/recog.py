@@ -1,11 +1,11 @@
 """V2 backend for `asr_recog.py` using py:class:`espnet.nets.beam_search.BeamSearch`."""
 
-import json
 import logging
 
 import torch
 
 from espnet.asr.asr_utils import add_results_to_json
+from espnet.asr.asr_utils import decode_recog_json
 from espnet.asr.asr_utils import get_model_conf
 from espnet.asr.asr_utils import torch_load
 from espnet.asr.pytorch_backend.asr import load_trained_model
@@ -96,6 +96,10 @@ def recog_v2(args):
         eos=model.eos,
         token_list=train_args.char_list,
         pre_beam_score_key=None if args.ctc_weight == 1.0 else "full",
+        score_threshold=args.score_threshold,
+        adaptive_beam_patience=args.adaptive_beam_patience,
+        min_beam_size=args.min_beam_size,
+        ctc_endpoint_margin=args.ctc_endpoint_margin,
     )
     # TODO(karita): make all scorers batchfied
     if args.batchsize == 1:
@@ -124,29 +128,27 @@ def recog_v2(args):
     model.to(device=device, dtype=dtype).eval()
     beam_search.to(device=device, dtype=dtype).eval()
 
-    # read json data
-    with open(args.recog_json, "rb") as f:
-        js = json.load(f)["utts"]
-    new_js = {}
-    with torch.no_grad():
-        for idx, name in enumerate(js.keys(), 1):
-            logging.info("(%d/%d) decoding " + name, idx, len(js.keys()))
-            batch = [(name, js[name])]
-            feat = load_inputs_and_targets(batch)[0][0]
+    if args.num_workers > 1 and device != "cpu":
+        raise NotImplementedError("--num-workers > 1 is supported only on CPU")
+
+    def decode(batch):
+        name, info = batch[0]
+        logging.info("decoding " + name)
+        feat = load_inputs_and_targets(batch)[0][0]
+        with torch.no_grad():
             enc = model.encode(torch.as_tensor(feat).to(device=device, dtype=dtype))
             nbest_hyps = beam_search(
                 x=enc, maxlenratio=args.maxlenratio, minlenratio=args.minlenratio
             )
-            nbest_hyps = [
-                h.asdict() for h in nbest_hyps[: min(len(nbest_hyps), args.nbest)]
-            ]
-            new_js[name] = add_results_to_json(
-                js[name], nbest_hyps, train_args.char_list
-            )
-
-    with open(args.result_label, "wb") as f:
-        f.write(
-            json.dumps(
-                {"utts": new_js}, indent=4, ensure_ascii=False, sort_keys=True
-            ).encode("utf_8")
-        )
+        nbest_hyps = [
+            h.asdict() for h in nbest_hyps[: min(len(nbest_hyps), args.nbest)]
+        ]
+        return [add_results_to_json(info, nbest_hyps, train_args.char_list)]
+
+    decode_recog_json(
+        decode,
+        args.recog_json,
+        args.result_label,
+        result_jsonl=args.result_jsonl,
+        num_workers=args.num_workers,
+    )
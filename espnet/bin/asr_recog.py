@@ -81,7 +81,9 @@ def get_parser():
     )
     # task related
     parser.add_argument(
-        "--recog-json", type=str, help="Filename of recognition data (json)"
+        "--recog-json",
+        type=str,
+        help="Filename of recognition data (json or json-lines with .jsonl suffix)",
     )
     parser.add_argument(
         "--result-label",
@@ -89,6 +91,25 @@ def get_parser():
         required=True,
         help="Filename of result label data (json)",
     )
+    parser.add_argument(
+        "--result-jsonl",
+        type=str,
+        default=None,
+        help="""If given, each result is appended to this json-lines file
+                        as soon as it is decoded, and the utterances found in
+                        the file are skipped, i.e. the decoding can be resumed
+                        after a crash. --result-label is written at the end.
+                        Only available with the pytorch backend""",
+    )
+    parser.add_argument(
+        "--num-workers",
+        type=int,
+        default=1,
+        help="""Number of worker processes for CPU decoding.
+                        The utterances are decoded in parallel by forked workers
+                        sharing the model, and the threads are divided among them.
+                        Only available with the pytorch backend""",
+    )
     # model (parameter) related
     parser.add_argument(
         "--model", type=str, required=True, help="Model file parameters to read"
@@ -127,6 +148,33 @@ def get_parser():
     parser.add_argument(
         "--ctc-weight", type=float, default=0.0, help="CTC weight in joint decoding"
     )
+    parser.add_argument(
+        "--score-threshold",
+        type=float,
+        default=None,
+        help="Prune the hypotheses whose scores are lower than "
+        "the best score minus this value at each step",
+    )
+    parser.add_argument(
+        "--adaptive-beam-patience",
+        type=int,
+        default=0,
+        help="If positive, halve the beam size when the best hypothesis "
+        "has been extended from the previous best one for this number of steps",
+    )
+    parser.add_argument(
+        "--min-beam-size",
+        type=int,
+        default=1,
+        help="The minimum beam size for --adaptive-beam-patience",
+    )
+    parser.add_argument(
+        "--ctc-endpoint-margin",
+        type=int,
+        default=None,
+        help="If given, limit the output length to the number of tokens "
+        "of the CTC greedy path plus this value",
+    )
     parser.add_argument(
         "--weights-ctc-dec",
         type=float,
@@ -317,6 +365,14 @@ def main(args):
         )
         sys.exit(1)
 
+    if (args.result_jsonl is not None or args.num_workers > 1) and (
+        args.backend != "pytorch" or args.num_spkrs != 1
+    ):
+        raise NotImplementedError(
+            "--result-jsonl and --num-workers are only supported "
+            "with the pytorch backend and --num-spkrs 1"
+        )
+
     # recog
     logging.info("backend = " + args.backend)
     if args.num_spkrs == 1:
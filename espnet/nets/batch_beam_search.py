@@ -283,6 +283,30 @@ class BatchBeamSearch(BeamSearch):
             )
         return self.batchfy(best_hyps)
 
+    def prune(self, hyps: BatchHypothesis, beam_size: int) -> BatchHypothesis:
+        """Prune the sorted hypotheses by the beam size and the score threshold.
+
+        Args:
+            hyps (BatchHypothesis): Hypotheses sorted by the score
+            beam_size (int): The number of hypotheses to keep
+
+        Returns:
+            BatchHypothesis: The pruned hypotheses
+
+        """
+        n_batch = min(len(hyps), beam_size)
+        if self.score_threshold is not None:
+            threshold = hyps.score[0] - self.score_threshold
+            n_batch = int((hyps.score[:n_batch] >= threshold).sum())
+        if n_batch == len(hyps):
+            return hyps
+        return self._batch_select(hyps, list(range(n_batch)))
+
+    @staticmethod
+    def best_yseq(hyps: BatchHypothesis) -> torch.Tensor:
+        """Get the prefix tokens of the best hypothesis from sorted hypotheses."""
+        return hyps.yseq[0, : hyps.length[0]]
+
     def post_process(
         self,
         i: int,
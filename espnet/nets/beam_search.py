@@ -14,6 +14,7 @@ import torch
 from espnet.nets.e2e_asr_common import end_detect
 from espnet.nets.scorer_interface import PartialScorerInterface
 from espnet.nets.scorer_interface import ScorerInterface
+from espnet.nets.scorers.ctc import CTCPrefixScorer
 
 
 class Hypothesis(NamedTuple):
@@ -47,6 +48,10 @@ class BeamSearch(torch.nn.Module):
         token_list: List[str] = None,
         pre_beam_ratio: float = 1.5,
         pre_beam_score_key: str = None,
+        score_threshold: float = None,
+        adaptive_beam_patience: int = 0,
+        min_beam_size: int = 1,
+        ctc_endpoint_margin: int = None,
     ):
         """Initialize beam search.
 
@@ -64,6 +69,16 @@ class BeamSearch(torch.nn.Module):
             pre_beam_score_key (str): key of scores to perform pre-beam search
             pre_beam_ratio (float): beam size in the pre-beam search
                 will be `int(pre_beam_ratio * beam_size)`
+            score_threshold (float): If given, the hypotheses whose scores are
+                lower than the best score minus this value are pruned at each step
+            adaptive_beam_patience (int): If positive, the beam size is halved
+                (down to `min_beam_size`) when the best hypothesis has been
+                extended from the previous best one for this number of steps,
+                and restored to `beam_size` when the best one is changed
+            min_beam_size (int): The minimum beam size of the adaptive beam
+            ctc_endpoint_margin (int): If given, the maximum output length is
+                limited to the number of tokens of the CTC greedy path
+                plus this value
 
         """
         super().__init__()
@@ -104,6 +119,10 @@ class BeamSearch(torch.nn.Module):
         ):
             raise KeyError(f"{pre_beam_score_key} is not found in {self.full_scorers}")
         self.pre_beam_score_key = pre_beam_score_key
+        self.score_threshold = score_threshold
+        self.adaptive_beam_patience = adaptive_beam_patience
+        self.min_beam_size = min(min_beam_size, beam_size)
+        self.ctc_endpoint_margin = ctc_endpoint_margin
         self.do_pre_beam = (
             self.pre_beam_score_key is not None
             and self.pre_beam_size < self.n_vocab
@@ -291,7 +310,10 @@ class BeamSearch(torch.nn.Module):
             List[Hypotheses]: Best sorted hypotheses
 
         """
-        best_hyps = []
+        # The new hypotheses are made after pruning, not to copy the prefix tokens
+        # and select the scorer states for the candidates which are pruned.
+        # The candidates extended from the same hypothesis share its states.
+        candidates = []
         part_ids = torch.arange(self.n_vocab, device=x.device)  # no pre-beam
         for hyp in running_hyps:
             # scoring
@@ -313,26 +335,78 @@ class BeamSearch(torch.nn.Module):
             # add previous hyp score
             weighted_scores += hyp.score
 
-            # update hyps
+            # update candidates
             for j, part_j in zip(*self.beam(weighted_scores, part_ids)):
                 # will be (2 x beam at most)
-                best_hyps.append(
-                    Hypothesis(
-                        score=weighted_scores[j],
-                        yseq=self.append_token(hyp.yseq, j),
-                        scores=self.merge_scores(
-                            hyp.scores, scores, j, part_scores, part_j
-                        ),
-                        states=self.merge_states(states, part_states, part_j),
+                candidates.append(
+                    (
+                        weighted_scores[j],
+                        hyp,
+                        j,
+                        part_j,
+                        (scores, states, part_scores, part_states),
                     )
                 )
 
             # sort and prune 2 x beam -> beam
-            best_hyps = sorted(best_hyps, key=lambda x: x.score, reverse=True)[
-                : min(len(best_hyps), self.beam_size)
+            candidates = sorted(candidates, key=lambda x: x[0], reverse=True)[
+                : min(len(candidates), self.beam_size)
             ]
+
+        best_hyps = []
+        for score, hyp, j, part_j, scored in candidates:
+            scores, states, part_scores, part_states = scored
+            best_hyps.append(
+                Hypothesis(
+                    score=score,
+                    yseq=self.append_token(hyp.yseq, j),
+                    scores=self.merge_scores(
+                        hyp.scores, scores, j, part_scores, part_j
+                    ),
+                    states=self.merge_states(states, part_states, part_j),
+                )
+            )
         return best_hyps
 
+    def prune(self, hyps: List[Hypothesis], beam_size: int) -> List[Hypothesis]:
+        """Prune the sorted hypotheses by the beam size and the score threshold.
+
+        Args:
+            hyps (List[Hypothesis]): Hypotheses sorted by the score
+            beam_size (int): The number of hypotheses to keep
+
+        Returns:
+            List[Hypothesis]: The pruned hypotheses
+
+        """
+        hyps = hyps[:beam_size]
+        if self.score_threshold is not None:
+            threshold = hyps[0].score - self.score_threshold
+            hyps = [h for h in hyps if h.score >= threshold]
+        return hyps
+
+    @staticmethod
+    def best_yseq(hyps: List[Hypothesis]) -> torch.Tensor:
+        """Get the prefix tokens of the best hypothesis from sorted hypotheses."""
+        return hyps[0].yseq
+
+    def ctc_length(self, x: torch.Tensor) -> Union[int, None]:
+        """Count the tokens of the CTC greedy path.
+
+        Args:
+            x (torch.Tensor): Encoded speech feature (T, D)
+
+        Returns:
+            int: The number of the tokens, or None if there is no CTC scorer
+
+        """
+        for d in self.scorers.values():
+            if isinstance(d, CTCPrefixScorer):
+                # The blank id is assumed to be 0
+                ids = torch.unique_consecutive(d.ctc.argmax(x.unsqueeze(0))[0])
+                return int((ids != 0).sum())
+        return None
+
     def forward(
         self, x: torch.Tensor, maxlenratio: float = 0.0, minlenratio: float = 0.0
     ) -> List[Hypothesis]:
@@ -355,6 +429,11 @@ class BeamSearch(torch.nn.Module):
         else:
             maxlen = max(1, int(maxlenratio * x.size(0)))
         minlen = int(minlenratio * x.size(0))
+        if self.ctc_endpoint_margin is not None:
+            ctc_length = self.ctc_length(x)
+            if ctc_length is not None:
+                # <eos> is added at the last step if not ended
+                maxlen = min(maxlen, max(1, ctc_length + self.ctc_endpoint_margin))
         logging.info("decoder input length: " + str(x.shape[0]))
         logging.info("max output length: " + str(maxlen))
         logging.info("min output length: " + str(minlen))
@@ -362,9 +441,24 @@ class BeamSearch(torch.nn.Module):
         # main loop of prefix search
         running_hyps = self.init_hyp(x)
         ended_hyps = []
+        beam_size = self.beam_size
+        prev_yseq = None
+        n_stable = 0
         for i in range(maxlen):
             logging.debug("position " + str(i))
             best = self.search(running_hyps, x)
+            if self.adaptive_beam_patience > 0:
+                yseq = self.best_yseq(best)
+                if prev_yseq is not None and torch.equal(yseq[:-1], prev_yseq):
+                    n_stable += 1
+                    if n_stable >= self.adaptive_beam_patience:
+                        beam_size = max(beam_size // 2, self.min_beam_size)
+                        n_stable = 0
+                else:
+                    beam_size = self.beam_size
+                    n_stable = 0
+                prev_yseq = yseq
+            best = self.prune(best, beam_size)
             # post process of one iteration
             running_hyps = self.post_process(i, maxlen, maxlenratio, best, ended_hyps)
             # end detection
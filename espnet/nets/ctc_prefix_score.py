@@ -44,16 +44,20 @@ class CTCPrefixScoreTH(object):
             else torch.device("cpu")
         )
         # Pad the rest of posteriors in the batch
-        # TODO(takaaki-hori): need a better way without for-loops
-        for i, l in enumerate(xlens):
-            if l < self.input_length:
-                x[i, l:, :] = self.logzero
-                x[i, l:, blank] = 0
+        xlens = torch.as_tensor(xlens, device=self.device)
+        pad_mask = torch.arange(self.input_length, device=self.device).unsqueeze(
+            0
+        ) >= xlens.unsqueeze(1)
+        x.masked_fill_(pad_mask.unsqueeze(2), self.logzero)
+        x[:, :, blank].masked_fill_(pad_mask, 0)
         # Reshape input x
-        xn = x.transpose(0, 1)  # (B, T, O) -> (T, B, O)
-        xb = xn[:, :, self.blank].unsqueeze(2).expand(-1, -1, self.odim)
-        self.x = torch.stack([xn, xb])  # (2, T, B, O)
-        self.end_frames = torch.as_tensor(xlens) - 1
+        self.x = x.transpose(0, 1).contiguous()  # (B, T, O) -> (T, B, O)
+        # The blank posteriors are kept as a separate tensor
+        # instead of being duplicated to the output dim
+        self.xb = self.x[:, :, self.blank].contiguous()  # (T, B)
+        self.end_frames = xlens - 1
+        # The forward probabilities are never computed beyond this frame
+        self.max_frame = int(xlens.max()) if self.batch > 0 else 0
 
         # Setup CTC windowing
         self.margin = margin
@@ -76,10 +80,17 @@ class CTCPrefixScoreTH(object):
         :return new_state, ctc_local_scores (BW, O)
         """
         output_length = len(y[0]) - 1  # ignore sos
-        last_ids = [yi[-1] for yi in y]  # last output label ids
+        # last output label ids
+        if isinstance(y, torch.Tensor):
+            last_ids = y[:, -1].to(self.device)
+        else:
+            last_ids = torch.as_tensor([int(yi[-1]) for yi in y], device=self.device)
         n_bh = len(last_ids)  # batch * hyps
         n_hyps = n_bh // self.batch  # assuming each utterance has the same # of hyps
         self.scoring_num = scoring_ids.size(-1) if scoring_ids is not None else 0
+        if self.idx_bh is None or n_bh > len(self.idx_bh):
+            self.idx_bh = torch.arange(n_bh, device=self.device).view(-1, 1)
+        idx_bh = self.idx_bh[:n_bh, 0]
         # prepare state info
         if state is None:
             r_prev = torch.full(
@@ -88,7 +99,7 @@ class CTCPrefixScoreTH(object):
                 dtype=self.dtype,
                 device=self.device,
             )
-            r_prev[:, 1] = torch.cumsum(self.x[0, :, :, self.blank], 0).unsqueeze(2)
+            r_prev[:, 1] = torch.cumsum(self.xb, 0).unsqueeze(2)
             r_prev = r_prev.view(-1, 2, n_bh)
             s_prev = 0.0
             f_min_prev = 0
@@ -97,13 +108,12 @@ class CTCPrefixScoreTH(object):
             r_prev, s_prev, f_min_prev, f_max_prev = state
 
         # select input dimensions for scoring
+        # x_ and xb_ are broadcastable to (T, B, W, S) without copying
         if self.scoring_num > 0:
             scoring_idmap = torch.full(
                 (n_bh, self.odim), -1, dtype=torch.long, device=self.device
             )
             snum = self.scoring_num
-            if self.idx_bh is None or n_bh > len(self.idx_bh):
-                self.idx_bh = torch.arange(n_bh, device=self.device).view(-1, 1)
             scoring_idmap[self.idx_bh[:n_bh], scoring_ids] = torch.arange(
                 snum, device=self.device
             )
@@ -111,13 +121,14 @@ class CTCPrefixScoreTH(object):
                 scoring_ids + self.idx_bo.repeat(1, n_hyps).view(-1, 1)
             ).view(-1)
             x_ = torch.index_select(
-                self.x.view(2, -1, self.batch * self.odim), 2, scoring_idx
-            ).view(2, -1, n_bh, snum)
+                self.x.view(-1, self.batch * self.odim), 1, scoring_idx
+            ).view(-1, self.batch, n_hyps, snum)
         else:
             scoring_ids = None
             scoring_idmap = None
             snum = self.odim
-            x_ = self.x.unsqueeze(3).repeat(1, 1, 1, n_hyps, 1).view(2, -1, n_bh, snum)
+            x_ = self.x.unsqueeze(2)  # (T, B, 1, O)
+        xb_ = self.xb.view(-1, self.batch, 1, 1)
 
         # new CTC forward probs are prepared as a (T x 2 x BW x S) tensor
         # that corresponds to r_t^n(h) and r_t^b(h) in a batch.
@@ -128,18 +139,16 @@ class CTCPrefixScoreTH(object):
             device=self.device,
         )
         if output_length == 0:
-            r[0, 0] = x_[0, 0]
+            r[0, 0].view(self.batch, n_hyps, snum)[:] = x_[0]
 
         r_sum = torch.logsumexp(r_prev, 1)
         log_phi = r_sum.unsqueeze(2).repeat(1, 1, snum)
         if scoring_ids is not None:
-            for idx in range(n_bh):
-                pos = scoring_idmap[idx, last_ids[idx]]
-                if pos >= 0:
-                    log_phi[:, idx, pos] = r_prev[:, 1, idx]
+            pos = scoring_idmap[idx_bh, last_ids]
+            hit = pos >= 0
+            log_phi[:, idx_bh[hit], pos[hit]] = r_prev[:, 1, hit]
         else:
-            for idx in range(n_bh):
-                log_phi[:, idx, last_ids[idx]] = r_prev[:, 1, idx]
+            log_phi[:, idx_bh, last_ids] = r_prev[:, 1]
 
         # decide start and end frames based on attention weights
         if att_w is not None and self.margin > 0:
@@ -147,40 +156,40 @@ class CTCPrefixScoreTH(object):
             f_min = max(int(f_arg.min().cpu()), f_min_prev)
             f_max = max(int(f_arg.max().cpu()), f_max_prev)
             start = min(f_max_prev, max(f_min - self.margin, output_length, 1))
-            end = min(f_max + self.margin, self.input_length)
+            end = min(f_max + self.margin, self.max_frame)
         else:
             f_min = f_max = 0
             start = max(output_length, 1)
-            end = self.input_length
+            end = self.max_frame
 
         # compute forward probabilities log(r_t^n(h)) and log(r_t^b(h))
         for t in range(start, end):
             rp = r[t - 1]
             rr = torch.stack([rp[0], log_phi[t - 1], rp[0], rp[1]]).view(
-                2, 2, n_bh, snum
+                2, 2, self.batch, n_hyps, snum
             )
-            r[t] = torch.logsumexp(rr, 1) + x_[:, t]
+            r_t = torch.logsumexp(rr, 1)
+            rt = r[t].view(2, self.batch, n_hyps, snum)
+            torch.add(r_t[0], x_[t], out=rt[0])
+            torch.add(r_t[1], xb_[t], out=rt[1])
 
         # compute log prefix probabilites log(psi)
-        log_phi_x = torch.cat((log_phi[0].unsqueeze(0), log_phi[:-1]), dim=0) + x_[0]
+        log_phi_x = torch.cat((log_phi[0].unsqueeze(0), log_phi[:-1]), dim=0)
+        log_phi_x = (
+            log_phi_x[start:end].view(-1, self.batch, n_hyps, snum) + x_[start:end]
+        ).view(-1, n_bh, snum)
+        log_psi_ = torch.logsumexp(
+            torch.cat((log_phi_x, r[start - 1, 0].unsqueeze(0)), dim=0), dim=0
+        )
         if scoring_ids is not None:
             log_psi = torch.full(
                 (n_bh, self.odim), self.logzero, dtype=self.dtype, device=self.device
             )
-            log_psi_ = torch.logsumexp(
-                torch.cat((log_phi_x[start:end], r[start - 1, 0].unsqueeze(0)), dim=0),
-                dim=0,
-            )
-            for si in range(n_bh):
-                log_psi[si, scoring_ids[si]] = log_psi_[si]
+            log_psi.scatter_(1, scoring_ids, log_psi_)
         else:
-            log_psi = torch.logsumexp(
-                torch.cat((log_phi_x[start:end], r[start - 1, 0].unsqueeze(0)), dim=0),
-                dim=0,
-            )
+            log_psi = log_psi_
 
-        for si in range(n_bh):
-            log_psi[si, self.eos] = r_sum[self.end_frames[si // n_hyps], si]
+        log_psi[:, self.eos] = r_sum[self.end_frames.repeat_interleave(n_hyps), idx_bh]
 
         # exclude blank probs
         log_psi[:, self.blank] = self.logzero
@@ -201,7 +210,7 @@ class CTCPrefixScoreTH(object):
         vidx = (best_ids + (self.idx_b * (n_hyps * self.odim)).view(-1, 1)).view(-1)
         # select hypothesis scores
         s_new = torch.index_select(s.view(-1), 0, vidx)
-        s_new = s_new.view(-1, 1).repeat(1, self.odim).view(n_bh, self.odim)
+        s_new = s_new.view(-1, 1).expand(n_bh, self.odim)
         # convert ids to BHS space (S: scoring_num)
         if scoring_idmap is not None:
             snum = self.scoring_num
@@ -113,6 +113,31 @@ class MultiHeadedAttention(nn.Module):
         scores = torch.matmul(q, k.transpose(-2, -1)) / math.sqrt(self.d_k)
         return self.forward_attention(v, scores, mask)
 
+    def forward_kv_cache(self, query, key, value, mask, cache=None):
+        """Compute attention reusing the transformed keys and values of the past.
+
+        Args:
+            query (torch.Tensor): Query tensor of new frames (#batch, time1, size).
+            key (torch.Tensor): Key tensor of new frames (#batch, time1, size).
+            value (torch.Tensor): Value tensor of new frames (#batch, time1, size).
+            mask (torch.Tensor): Mask tensor (#batch, 1, time2) or
+                (#batch, time1, time2), where time2 = cache_time + time1.
+            cache (Tuple[torch.Tensor, torch.Tensor]): Transformed key and value
+                of the past frames (#batch, n_head, cache_time, d_k).
+
+        Returns:
+            torch.Tensor: Output tensor (#batch, time1, d_model).
+            Tuple[torch.Tensor, torch.Tensor]: Transformed key and value
+                including the new frames (#batch, n_head, time2, d_k).
+
+        """
+        q, k, v = self.forward_qkv(query, key, value)
+        if cache is not None:
+            k = torch.cat([cache[0], k], dim=2)
+            v = torch.cat([cache[1], v], dim=2)
+        scores = torch.matmul(q, k.transpose(-2, -1)) / math.sqrt(self.d_k)
+        return self.forward_attention(v, scores, mask), (k, v)
+
 
 class RelPositionMultiHeadedAttention(MultiHeadedAttention):
     """Multi-Head Attention layer with relative position encoding.
@@ -99,3 +99,44 @@ class EncoderLayer(nn.Module):
             x = torch.cat([cache, x], dim=1)
 
         return x, mask
+
+    def forward_kv_cache(self, x, mask, cache=None):
+        """Compute encoded features of new frames with the key-value cache.
+
+        Unlike the cache of forward(), which keeps the outputs of this layer,
+        the transformed keys and values of the past frames are kept,
+        so only the new frames are computed.
+
+        Args:
+            x (torch.Tensor): Input tensor of new frames (#batch, time1, size).
+            mask (torch.Tensor): Mask tensor (#batch, time1, time2),
+                where time2 = cache_time + time1.
+            cache (Tuple[torch.Tensor, torch.Tensor]): Key-value cache of
+                the self-attention (#batch, n_head, cache_time, d_k).
+
+        Returns:
+            torch.Tensor: Output tensor (#batch, time1, size).
+            torch.Tensor: Mask tensor (#batch, time1, time2).
+            Tuple[torch.Tensor, torch.Tensor]: New key-value cache.
+
+        """
+        residual = x
+        if self.normalize_before:
+            x = self.norm1(x)
+
+        x_att, cache = self.self_attn.forward_kv_cache(x, x, x, mask, cache)
+        if self.concat_after:
+            x = residual + self.concat_linear(torch.cat((x, x_att), dim=-1))
+        else:
+            x = residual + self.dropout(x_att)
+        if not self.normalize_before:
+            x = self.norm1(x)
+
+        residual = x
+        if self.normalize_before:
+            x = self.norm2(x)
+        x = residual + self.dropout(self.feed_forward(x))
+        if not self.normalize_before:
+            x = self.norm2(x)
+
+        return x, mask, cache
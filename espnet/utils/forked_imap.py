@@ -0,0 +1,94 @@
+import multiprocessing
+import threading
+from typing import Callable
+from typing import Iterable
+from typing import Iterator
+from typing import Optional
+
+import torch
+from typeguard import check_argument_types
+
+_func = None
+
+
+def _init_worker(num_threads: int):
+    torch.set_num_threads(num_threads)
+
+
+def _call_func(item):
+    return _func(item)
+
+
+def forked_imap(
+    func: Callable,
+    iterable: Iterable,
+    num_workers: int,
+    num_threads: Optional[int] = None,
+    max_pending: Optional[int] = None,
+) -> Iterator:
+    """Apply the function to the items in forked worker processes.
+
+    The workers are forked after "func" is given, so the model referred
+    by "func" is shared with the workers by copy-on-write
+    and it doesn't need to be picklable.
+    The results are yielded in the same order as the input.
+
+    Examples:
+        >>> model = build_model()
+        >>> def decode(item):
+        ...     keys, batch = item
+        ...     return keys, model(**batch)
+        >>> for keys, result in forked_imap(decode, loader, num_workers=4):
+        ...     writer[keys[0]] = result
+
+    Args:
+        func: The function applied to each item.
+        iterable: The input items. Each item must be picklable.
+        num_workers: The number of worker processes.
+            If 1, "func" is applied in the current process.
+        num_threads: The number of intra-op threads for each worker.
+            By default, the current number of threads are divided among workers.
+        max_pending: The maximum number of the items read ahead from "iterable".
+    """
+    assert check_argument_types()
+    if num_workers <= 1:
+        for item in iterable:
+            yield func(item)
+        return
+
+    global _func
+    if num_threads is None:
+        num_threads = max(torch.get_num_threads() // num_workers, 1)
+    if max_pending is None:
+        max_pending = 2 * num_workers
+    # Limit the number of the items sent to the workers at once,
+    # otherwise Pool reads all items from "iterable" in advance.
+    semaphore = threading.BoundedSemaphore(max_pending)
+    # Set when the consumer stops early, e.g. by an exception or "break".
+    # Pool.terminate() joins the thread feeding the items,
+    # so it must not be left blocked in acquire().
+    stop = threading.Event()
+
+    def feed():
+        for item in iterable:
+            while not semaphore.acquire(timeout=0.1):
+                if stop.is_set():
+                    return
+            if stop.is_set():
+                return
+            yield item
+
+    _func = func
+    ctx = multiprocessing.get_context("fork")
+    try:
+        with ctx.Pool(
+            num_workers, initializer=_init_worker, initargs=(num_threads,)
+        ) as pool:
+            try:
+                for result in pool.imap(_call_func, feed()):
+                    semaphore.release()
+                    yield result
+            finally:
+                stop.set()
+    finally:
+        _func = None
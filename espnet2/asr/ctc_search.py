@@ -0,0 +1,209 @@
+import math
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+import torch
+
+from espnet.nets.pytorch_backend.nets_utils import make_pad_mask
+from espnet.nets.scorer_interface import BatchScorerInterface
+
+
+def ctc_greedy_search(
+    logp: torch.Tensor, lengths: torch.Tensor, blank: int = 0
+) -> List[Tuple[List[int], float]]:
+    """Decode the batch of CTC posteriors by the best path.
+
+    Args:
+        logp: Log posteriors (B, T, V)
+        lengths: (B,)
+        blank: The blank id
+    Returns:
+        List of token-ids and the log-probability of the path for each utterance
+
+    """
+    best, ids = logp.max(dim=-1)
+    valid = ~make_pad_mask(lengths, ids).to(ids.device)
+    # Collapse the repeated tokens and remove the blanks
+    prev = torch.nn.functional.pad(ids, [1, 0], value=-1)[:, :-1]
+    keep = (ids != blank) & (ids != prev) & valid
+    scores = best.masked_fill(~valid, 0.0).sum(dim=1).tolist()
+    return [(ids[b][keep[b]].tolist(), scores[b]) for b in range(len(ids))]
+
+
+def _batch_lm_score(
+    lm: BatchScorerInterface,
+    prefixes: List[Tuple[int, ...]],
+    parent_states: List,
+    sos: int,
+    device: torch.device,
+) -> Tuple[List[torch.Tensor], List]:
+    """Compute the LM scores of the next tokens for the prefixes."""
+    logps = [None] * len(prefixes)
+    states = [None] * len(prefixes)
+    # The prefixes are grouped by the length,
+    # because LMs such as TransformerLM need the same lengths in a batch
+    groups: Dict[int, List[int]] = {}
+    for i, prefix in enumerate(prefixes):
+        groups.setdefault(len(prefix), []).append(i)
+    for indices in groups.values():
+        ys = torch.tensor(
+            [(sos,) + prefixes[i] for i in indices], dtype=torch.long, device=device
+        )
+        logp, new_states = lm.batch_score(ys, [parent_states[i] for i in indices], None)
+        for j, i in enumerate(indices):
+            logps[i] = logp[j]
+            states[i] = new_states[j]
+    return logps, states
+
+
+def ctc_prefix_beam_search(
+    logp: torch.Tensor,
+    beam_size: int,
+    blank: int = 0,
+    lm: Optional[BatchScorerInterface] = None,
+    lm_weight: float = 0.0,
+    sos_eos: Optional[int] = None,
+    penalty: float = 0.0,
+    blank_skip_threshold: float = 1.0,
+) -> List[Tuple[List[int], float]]:
+    """Decode the CTC posteriors of an utterance by the prefix beam search.
+
+    The blank and non-blank probabilities of the prefixes in the beam
+    are updated for all prefixes and the top-`beam_size` tokens of each frame
+    at once. An LM is optionally fused at the token level:
+
+        score = log P_ctc(prefix) + lm_weight * log P_lm(prefix) + penalty * |prefix|
+
+    Args:
+        logp: Log posteriors (T, V)
+        beam_size: The number of prefixes kept in the beam
+        blank: The blank id
+        lm: The LM implementing batch_score(), e.g. TransformerLM
+        lm_weight: The weight of the LM
+        sos_eos: The id of <sos/eos> for the LM
+        penalty: The insertion penalty for each token
+        blank_skip_threshold: The frames whose blank posterior is higher than
+            this value don't extend the prefixes
+    Returns:
+        N-best list of the token-ids and the score
+
+    """
+    if lm is not None and sos_eos is None:
+        raise ValueError("sos_eos is required for the LM")
+    device = logp.device
+    ninf = float("-inf")
+    k = min(beam_size, logp.size(1) - 1)
+    log_threshold = math.log(blank_skip_threshold) if blank_skip_threshold < 1 else 0
+
+    # The beam: the prefixes and their probabilities ending with blank/non-blank
+    prefixes: List[Tuple[int, ...]] = [()]
+    pb = torch.zeros(1, device=device, dtype=logp.dtype)
+    pnb = torch.full((1,), ninf, device=device, dtype=logp.dtype)
+    # The last token of each prefix, -1 for the empty prefix
+    last = torch.full((1,), -1, device=device, dtype=torch.long)
+    # The accumulated score of the LM and the penalty
+    lm_scores = torch.zeros(1, device=device, dtype=logp.dtype)
+    if lm is not None:
+        lm_next, lm_states = _batch_lm_score(lm, prefixes, [None], sos_eos, device)
+        lm_next = torch.stack(lm_next).to(logp.dtype)
+
+    for lp in logp:
+        total = torch.logaddexp(pb, pnb)
+        # 1. The prefixes don't change: "a" + blank or "a" + "a"
+        lp_last = torch.where(last >= 0, lp[last.clamp(min=0)], lp.new_tensor(ninf))
+        new_pb = total + lp[blank]
+        new_pnb = pnb + lp_last
+        if lp[blank] > log_threshold:
+            pb, pnb = new_pb, new_pnb
+            continue
+
+        # 2. The extension of a prefix which is also in the beam: "a" + "b" -> "ab"
+        index = {prefix: i for i, prefix in enumerate(prefixes)}
+        parent = torch.tensor(
+            [
+                index.get(prefix[:-1], -1) if len(prefix) > 0 else -1
+                for prefix in prefixes
+            ],
+            device=device,
+        )
+        children = (parent >= 0).nonzero(as_tuple=True)[0]
+        if len(children) > 0:
+            p = parent[children]
+            c = last[children]
+            # "a" + blank + "a" -> "aa", but "a" + "a" -> "a"
+            merged = torch.where(c == last[p], pb[p], total[p]) + lp[c]
+            new_pnb[children] = torch.logaddexp(new_pnb[children], merged)
+
+        # 3. The new prefixes
+        lp_token = lp.clone()
+        lp_token[blank] = ninf
+        ids = lp_token.topk(k).indices
+        ext = torch.where(ids[None] == last[:, None], pb[:, None], total[:, None])
+        ext = ext + lp[ids][None]
+        if len(children) > 0:
+            # Already merged in 2.
+            rows, cols = (ids[None] == last[children][:, None]).nonzero(as_tuple=True)
+            ext[parent[children][rows], cols] = ninf
+        ext_lm = (lm_scores[:, None] + penalty).expand_as(ext)
+        if lm is not None:
+            ext_lm = ext_lm + lm_weight * lm_next[:, ids]
+
+        # 4. Select the top-beam_size prefixes
+        scores = torch.cat(
+            [torch.logaddexp(new_pb, new_pnb) + lm_scores, (ext + ext_lm).view(-1)]
+        )
+        n = min(beam_size, int(torch.isfinite(scores).sum()))
+        top = scores.topk(n).indices.tolist()
+        n_prefix = len(prefixes)
+        ids_list = ids.tolist()
+        new_prefixes = []
+        rows = []
+        cols = []
+        for i in top:
+            if i < n_prefix:
+                new_prefixes.append(prefixes[i])
+                rows.append(i)
+                cols.append(-1)
+            else:
+                r, col = divmod(i - n_prefix, k)
+                new_prefixes.append(prefixes[r] + (ids_list[col],))
+                rows.append(r)
+                cols.append(col)
+        rows = torch.tensor(rows, device=device)
+        cols = torch.tensor(cols, device=device)
+        is_ext = cols >= 0
+        cols = cols.clamp(min=0)
+        pb = torch.where(is_ext, pb.new_tensor(ninf), new_pb[rows])
+        pnb = torch.where(is_ext, ext[rows, cols], new_pnb[rows])
+        last = torch.where(is_ext, ids[cols], last[rows])
+        lm_scores = torch.where(is_ext, ext_lm[rows, cols], lm_scores[rows])
+
+        if lm is not None:
+            lm_next = lm_next[rows]
+            new_lm_states = [lm_states[r] for r in rows.tolist()]
+            extended = is_ext.nonzero(as_tuple=True)[0].tolist()
+            if len(extended) > 0:
+                logps, states = _batch_lm_score(
+                    lm,
+                    [new_prefixes[i] for i in extended],
+                    [new_lm_states[i] for i in extended],
+                    sos_eos,
+                    device,
+                )
+                lm_next[extended] = torch.stack(logps).to(logp.dtype)
+                for i, state in zip(extended, states):
+                    new_lm_states[i] = state
+            lm_states = new_lm_states
+        prefixes = new_prefixes
+
+    scores = torch.logaddexp(pb, pnb) + lm_scores
+    if lm is not None:
+        # The end of the sentence
+        scores = scores + lm_weight * lm_next[:, sos_eos]
+    scores = scores.tolist()
+    return sorted(
+        [(list(prefix), score) for prefix, score in zip(prefixes, scores)],
+        key=lambda x: -x[1],
+    )
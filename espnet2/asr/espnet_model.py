@@ -99,6 +99,8 @@ class ESPnetASRModel(AbsESPnetModel):
         speech_lengths: torch.Tensor,
         text: torch.Tensor,
         text_lengths: torch.Tensor,
+        feats: torch.Tensor = None,
+        feats_lengths: torch.Tensor = None,
     ) -> Tuple[torch.Tensor, Dict[str, torch.Tensor], torch.Tensor]:
         """Frontend + Encoder + Decoder + Calc loss
 
@@ -107,6 +109,9 @@ class ESPnetASRModel(AbsESPnetModel):
             speech_lengths: (Batch, )
             text: (Batch, Length)
             text_lengths: (Batch,)
+            feats: (Batch, NFrames, Dim) The cached output of the frontend.
+                If given, the frontend is skipped.
+            feats_lengths: (Batch,)
         """
         assert text_lengths.dim() == 1, text_lengths.shape
         # Check that batch_size is unified
@@ -122,7 +127,9 @@ class ESPnetASRModel(AbsESPnetModel):
         text = text[:, : text_lengths.max()]
 
         # 1. Encoder
-        encoder_out, encoder_out_lens = self.encode(speech, speech_lengths)
+        encoder_out, encoder_out_lens = self.encode(
+            speech, speech_lengths, feats, feats_lengths
+        )
 
         # 2a. Attention-decoder branch
         if self.ctc_weight == 1.0:
@@ -171,22 +178,34 @@ class ESPnetASRModel(AbsESPnetModel):
         speech_lengths: torch.Tensor,
         text: torch.Tensor,
         text_lengths: torch.Tensor,
+        feats: torch.Tensor = None,
+        feats_lengths: torch.Tensor = None,
     ) -> Dict[str, torch.Tensor]:
-        feats, feats_lengths = self._extract_feats(speech, speech_lengths)
+        feats, feats_lengths = self._extract_feats(
+            speech, speech_lengths, feats, feats_lengths
+        )
         return {"feats": feats, "feats_lengths": feats_lengths}
 
     def encode(
-        self, speech: torch.Tensor, speech_lengths: torch.Tensor
+        self,
+        speech: torch.Tensor,
+        speech_lengths: torch.Tensor,
+        feats: torch.Tensor = None,
+        feats_lengths: torch.Tensor = None,
     ) -> Tuple[torch.Tensor, torch.Tensor]:
         """Frontend + Encoder. Note that this method is used by asr_inference.py
 
         Args:
             speech: (Batch, Length, ...)
             speech_lengths: (Batch, )
+            feats: (Batch, NFrames, Dim) The cached output of the frontend
+            feats_lengths: (Batch, )
         """
         with autocast(False):
             # 1. Extract feats
-            feats, feats_lengths = self._extract_feats(speech, speech_lengths)
+            feats, feats_lengths = self._extract_feats(
+                speech, speech_lengths, feats, feats_lengths
+            )
 
             # 2. Data augmentation for spectrogram
             if self.specaug is not None and self.training:
@@ -213,10 +232,23 @@ class ESPnetASRModel(AbsESPnetModel):
         return encoder_out, encoder_out_lens
 
     def _extract_feats(
-        self, speech: torch.Tensor, speech_lengths: torch.Tensor
+        self,
+        speech: torch.Tensor,
+        speech_lengths: torch.Tensor,
+        feats: torch.Tensor = None,
+        feats_lengths: torch.Tensor = None,
     ) -> Tuple[torch.Tensor, torch.Tensor]:
         assert speech_lengths.dim() == 1, speech_lengths.shape
 
+        if feats is not None:
+            # The frontend outputs are given from the feats cache,
+            #  e.g. created by collect_stats with --collected_feats_format mmap
+            assert feats_lengths is not None
+            assert feats.size(0) == speech.size(0), (feats.size(), speech.size())
+            # for data-parallel
+            feats = feats[:, : feats_lengths.max()]
+            return feats, feats_lengths
+
         # for data-parallel
         speech = speech[:, : speech_lengths.max()]
 
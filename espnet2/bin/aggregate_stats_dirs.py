@@ -9,6 +9,7 @@ from typing import Union
 import numpy as np
 
 from espnet.utils.cli_utils import get_commandline_args
+from espnet2.fileio.mmap_store import merge_mmap_stores
 
 
 def aggregate_stats_dirs(
@@ -69,6 +70,11 @@ def aggregate_stats_dirs(
                             for line in fin:
                                 fout.write(line)
 
+            # if --write_collected_feats=true and --collected_feats_format=mmap
+            p = Path(mode) / "collect_feats" / key
+            if (input_dirs[0] / p / "index").exists():
+                merge_mmap_stores([idir / p for idir in input_dirs], output_dir / p)
+
 
 def get_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
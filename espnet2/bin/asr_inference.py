@@ -17,11 +17,16 @@ from typing import List
 from espnet.nets.batch_beam_search import BatchBeamSearch
 from espnet.nets.beam_search import BeamSearch
 from espnet.nets.beam_search import Hypothesis
+from espnet.nets.pytorch_backend.nets_utils import make_pad_mask
 from espnet.nets.scorer_interface import BatchScorerInterface
 from espnet.nets.scorers.ctc import CTCPrefixScorer
 from espnet.nets.scorers.length_bonus import LengthBonus
 from espnet.utils.cli_utils import get_commandline_args
+from espnet.utils.forked_imap import forked_imap
+from espnet2.asr.ctc_search import ctc_greedy_search
+from espnet2.asr.ctc_search import ctc_prefix_beam_search
 from espnet2.fileio.datadir_writer import DatadirWriter
+from espnet2.lm.batch_lm_score import batch_lm_score
 from espnet2.tasks.asr import ASRTask
 from espnet2.tasks.lm import LMTask
 from espnet2.text.build_tokenizer import build_tokenizer
@@ -29,6 +34,8 @@ from espnet2.text.token_id_converter import TokenIDConverter
 from espnet2.torch_utils.device_funcs import to_device
 from espnet2.torch_utils.set_all_random_seed import set_all_random_seed
 from espnet2.utils import config_argparse
+from espnet2.utils.types import float_or_none
+from espnet2.utils.types import int_or_none
 from espnet2.utils.types import str2bool
 from espnet2.utils.types import str2triple_str
 from espnet2.utils.types import str_or_none
@@ -64,8 +71,16 @@ class Speech2Text:
         lm_weight: float = 1.0,
         penalty: float = 0.0,
         nbest: int = 1,
+        score_threshold: float = None,
+        adaptive_beam_patience: int = 0,
+        min_beam_size: int = 1,
+        ctc_endpoint_margin: int = None,
+        ctc_search: str = None,
+        ctc_blank_skip_threshold: float = 1.0,
     ):
         assert check_argument_types()
+        if ctc_search not in (None, "greedy", "prefix_beam", "attention_rescoring"):
+            raise ValueError(f"Unknown ctc_search: {ctc_search}")
 
         # 1. Build ASR model
         scorers = {}
@@ -106,6 +121,10 @@ class Speech2Text:
             vocab_size=len(token_list),
             token_list=token_list,
             pre_beam_score_key=None if ctc_weight == 1.0 else "full",
+            score_threshold=score_threshold,
+            adaptive_beam_patience=adaptive_beam_patience,
+            min_beam_size=min_beam_size,
+            ctc_endpoint_margin=ctc_endpoint_margin,
         )
         # TODO(karita): make all scorers batchfied
         if batch_size == 1:
@@ -152,6 +171,13 @@ class Speech2Text:
         self.converter = converter
         self.tokenizer = tokenizer
         self.beam_search = beam_search
+        self.ctc_search = ctc_search
+        self.ctc_blank_skip_threshold = ctc_blank_skip_threshold
+        self.lm = scorers.get("lm")
+        self.beam_size = beam_size
+        self.lm_weight = lm_weight
+        self.penalty = penalty
+        self.weights = weights
         self.maxlenratio = maxlenratio
         self.minlenratio = minlenratio
         self.device = device
@@ -177,45 +203,184 @@ class Speech2Text:
             speech = torch.tensor(speech)
 
         # data: (Nsamples,) -> (1, Nsamples)
-        speech = speech.unsqueeze(0).to(getattr(torch, self.dtype))
+        speech = speech.unsqueeze(0)
         # lenghts: (1,)
         lengths = speech.new_full([1], dtype=torch.long, fill_value=speech.size(1))
-        batch = {"speech": speech, "speech_lengths": lengths}
+        return self.batch_decode(speech, lengths)[0]
+
+    @torch.no_grad()
+    def batch_decode(
+        self, speech: torch.Tensor, speech_lengths: torch.Tensor
+    ) -> List[List[Tuple[Optional[str], List[str], List[int], Hypothesis]]]:
+        """Inference for a batch of utterances
+
+        Args:
+            speech: Input speech data (Batch, Nsamples)
+            speech_lengths: (Batch,)
+        Returns:
+            The list of (text, token, token_int, hyp) for each utterance
+
+        """
+        assert check_argument_types()
+        speech = speech.to(getattr(torch, self.dtype))
+        batch = {"speech": speech, "speech_lengths": speech_lengths}
 
         # a. To device
         batch = to_device(batch, device=self.device)
 
         # b. Forward Encoder
-        enc, _ = self.asr_model.encode(**batch)
-        assert len(enc) == 1, len(enc)
+        enc, enc_lens = self.asr_model.encode(**batch)
+        assert len(enc) == len(speech), (len(enc), len(speech))
 
         # c. Passed the encoder result and the beam search
-        nbest_hyps = self.beam_search(
-            x=enc[0], maxlenratio=self.maxlenratio, minlenratio=self.minlenratio
-        )
-        nbest_hyps = nbest_hyps[: self.nbest]
+        if self.ctc_search is not None:
+            return self._ctc_decode(enc, enc_lens)
 
         results = []
-        for hyp in nbest_hyps:
-            assert isinstance(hyp, Hypothesis), type(hyp)
+        for x, x_len in zip(enc, enc_lens):
+            nbest_hyps = self.beam_search(
+                x=x[:x_len], maxlenratio=self.maxlenratio, minlenratio=self.minlenratio
+            )
+            nbest_hyps = nbest_hyps[: self.nbest]
+            results.append([self._to_result(hyp) for hyp in nbest_hyps])
+        return results
 
-            # remove sos/eos and get results
-            token_int = hyp.yseq[1:-1].tolist()
+    def _ctc_decode(
+        self, enc: torch.Tensor, enc_lens: torch.Tensor
+    ) -> List[List[Tuple[Optional[str], List[str], List[int], Hypothesis]]]:
+        """Decode with the CTC prefix search.
 
-            # remove blank symbol id, which is assumed to be 0
-            token_int = list(filter(lambda x: x != 0, token_int))
+        In "attention_rescoring", the attention decoder is used only to rescore
+        the N-best of the CTC prefix beam search.
+        """
+        logp = self.asr_model.ctc.log_softmax(enc)
+        if self.ctc_search == "greedy":
+            nbests = [[r] for r in ctc_greedy_search(logp, enc_lens)]
+        elif self.ctc_search == "prefix_beam":
+            nbests = [
+                ctc_prefix_beam_search(
+                    lp[:lp_len],
+                    beam_size=self.beam_size,
+                    lm=self.lm,
+                    lm_weight=self.lm_weight,
+                    sos_eos=self.asr_model.eos,
+                    penalty=self.penalty,
+                    blank_skip_threshold=self.ctc_blank_skip_threshold,
+                )[: self.nbest]
+                for lp, lp_len in zip(logp, enc_lens)
+            ]
+        else:
+            # The first pass by the CTC only: the LM is applied in the second pass
+            nbests = [
+                ctc_prefix_beam_search(
+                    lp[:lp_len],
+                    beam_size=self.beam_size,
+                    blank_skip_threshold=self.ctc_blank_skip_threshold,
+                )
+                for lp, lp_len in zip(logp, enc_lens)
+            ]
 
-            # Change integer-ids to tokens
-            token = self.converter.ids2tokens(token_int)
+        hyps = [
+            [
+                Hypothesis(
+                    yseq=torch.tensor(
+                        [self.asr_model.sos] + token_int + [self.asr_model.eos]
+                    ),
+                    score=score,
+                    scores={"ctc": score},
+                )
+                for token_int, score in nbest
+            ]
+            for nbest in nbests
+        ]
+        if self.ctc_search == "attention_rescoring":
+            hyps = self._attention_rescoring(enc, enc_lens, hyps)
 
-            if self.tokenizer is not None:
-                text = self.tokenizer.tokens2text(token)
-            else:
-                text = None
-            results.append((text, token, token_int, hyp))
+        return [[self._to_result(hyp) for hyp in nbest[: self.nbest]] for nbest in hyps]
 
-        assert check_return_type(results)
-        return results
+    def _attention_rescoring(
+        self,
+        enc: torch.Tensor,
+        enc_lens: torch.Tensor,
+        hyps: List[List[Hypothesis]],
+    ) -> List[List[Hypothesis]]:
+        """Rescore the hypotheses with the attention decoder and the LM.
+
+        The hypotheses of all utterances are forwarded at once
+        by the teacher-forcing, and re-ranked by the weighted sum of
+        the CTC, decoder, LM and length_bonus scores as in the beam search.
+        """
+        sos, eos = self.asr_model.sos, self.asr_model.eos
+        utt_ids = [b for b, nbest in enumerate(hyps) for _ in nbest]
+        seqs = [hyp.yseq[1:-1].tolist() for nbest in hyps for hyp in nbest]
+        if len(seqs) == 0:
+            return hyps
+        device = enc.device
+
+        # ys_in: <sos> a b c, ys_out: a b c <eos>
+        ys_lens = torch.tensor([len(s) + 1 for s in seqs], device=device)
+        ys_in = torch.full((len(seqs), int(ys_lens.max())), eos, dtype=torch.long)
+        ys_out = torch.full_like(ys_in, eos)
+        for i, seq in enumerate(seqs):
+            ys_in[i, : len(seq) + 1] = torch.tensor([sos] + seq)
+            ys_out[i, : len(seq)] = torch.tensor(seq)
+        ys_in = ys_in.to(device)
+        ys_out = ys_out.to(device)
+
+        index = torch.tensor(utt_ids, device=device)
+        logits, _ = self.asr_model.decoder(enc[index], enc_lens[index], ys_in, ys_lens)
+        logp = torch.log_softmax(logits.float(), dim=-1)
+        token_logp = logp.gather(-1, ys_out[..., None]).squeeze(-1)
+        token_logp = token_logp.masked_fill(make_pad_mask(ys_lens, token_logp), 0.0)
+        att_scores = token_logp.sum(dim=1).tolist()
+
+        if self.lm is not None:
+            lm_scores = batch_lm_score(
+                self.lm,
+                seqs,
+                sos_eos=eos,
+                batch_bins=int(ys_lens.sum()),
+                device=device,
+            ).tolist()
+        else:
+            lm_scores = [0.0] * len(seqs)
+
+        new_hyps = [[] for _ in hyps]
+        flat = (hyp for nbest in hyps for hyp in nbest)
+        for b, hyp, att, lm, seq in zip(utt_ids, flat, att_scores, lm_scores, seqs):
+            scores = dict(
+                decoder=att,
+                ctc=hyp.scores["ctc"],
+                lm=lm,
+                length_bonus=float(len(seq) + 1),
+            )
+            if self.lm is None:
+                scores.pop("lm")
+            score = sum(self.weights[k] * v for k, v in scores.items())
+            new_hyps[b].append(hyp._replace(score=score, scores=scores))
+        return [sorted(nbest, key=lambda x: -x.score) for nbest in new_hyps]
+
+    def _to_result(
+        self, hyp: Hypothesis
+    ) -> Tuple[Optional[str], List[str], List[int], Hypothesis]:
+        assert isinstance(hyp, Hypothesis), type(hyp)
+
+        # remove sos/eos and get results
+        token_int = hyp.yseq[1:-1].tolist()
+
+        # remove blank symbol id, which is assumed to be 0
+        token_int = list(filter(lambda x: x != 0, token_int))
+
+        # Change integer-ids to tokens
+        token = self.converter.ids2tokens(token_int)
+
+        if self.tokenizer is not None:
+            text = self.tokenizer.tokens2text(token)
+        else:
+            text = None
+        result = (text, token, token_int, hyp)
+        assert check_return_type(result)
+        return result
 
 
 def inference(
@@ -231,7 +396,14 @@ def inference(
     lm_weight: float,
     penalty: float,
     nbest: int,
+    score_threshold: Optional[float],
+    adaptive_beam_patience: int,
+    min_beam_size: int,
+    ctc_endpoint_margin: Optional[int],
+    ctc_search: Optional[str],
+    ctc_blank_skip_threshold: float,
     num_workers: int,
+    num_decode_workers: int,
     log_level: Union[int, str],
     data_path_and_name_and_type: Sequence[Tuple[str, str, str]],
     key_file: Optional[str],
@@ -246,12 +418,14 @@ def inference(
     allow_variable_data_keys: bool,
 ):
     assert check_argument_types()
-    if batch_size > 1:
-        raise NotImplementedError("batch decoding is not implemented")
+    if batch_size > 1 and ctc_search is None:
+        raise NotImplementedError("batch decoding is supported only with ctc_search")
     if word_lm_train_config is not None:
         raise NotImplementedError("Word LM is not implemented")
     if ngpu > 1:
         raise NotImplementedError("only single GPU decoding is supported")
+    if num_decode_workers > 1 and ngpu > 0:
+        raise NotImplementedError("--num_decode_workers > 1 is supported only on CPU")
 
     logging.basicConfig(
         level=log_level,
@@ -283,6 +457,12 @@ def inference(
         lm_weight=lm_weight,
         penalty=penalty,
         nbest=nbest,
+        score_threshold=score_threshold,
+        adaptive_beam_patience=adaptive_beam_patience,
+        min_beam_size=min_beam_size,
+        ctc_endpoint_margin=ctc_endpoint_margin,
+        ctc_search=ctc_search,
+        ctc_blank_skip_threshold=ctc_blank_skip_threshold,
     )
 
     # 3. Build data-iterator
@@ -298,32 +478,39 @@ def inference(
         inference=True,
     )
 
+    def decode(item):
+        keys, batch = item
+        assert isinstance(batch, dict), type(batch)
+        assert all(isinstance(s, str) for s in keys), keys
+        _bs = len(next(iter(batch.values())))
+        assert len(keys) == _bs, f"{len(keys)} != {_bs}"
+
+        # N-best list of (text, token, token_int, hyp_object) for each utterance
+        results = speech2text.batch_decode(batch["speech"], batch["speech_lengths"])
+        # Drop the scorer states not to send them to the parent process
+        return keys, [
+            [(text, token, tint, hyp.score) for text, token, tint, hyp in nbest]
+            for nbest in results
+        ]
+
     # 7 .Start for-loop
     # FIXME(kamo): The output format should be discussed about
     with DatadirWriter(output_dir) as writer:
-        for keys, batch in loader:
-            assert isinstance(batch, dict), type(batch)
-            assert all(isinstance(s, str) for s in keys), keys
-            _bs = len(next(iter(batch.values())))
-            assert len(keys) == _bs, f"{len(keys)} != {_bs}"
-            batch = {k: v[0] for k, v in batch.items() if not k.endswith("_lengths")}
-
-            # N-best list of (text, token, token_int, hyp_object)
-            results = speech2text(**batch)
-
-            # Only supporting batch_size==1
-            key = keys[0]
-            for n, (text, token, token_int, hyp) in zip(range(1, nbest + 1), results):
-                # Create a directory: outdir/{n}best_recog
-                ibest_writer = writer[f"{n}best_recog"]
+        for keys, batch_results in forked_imap(decode, loader, num_decode_workers):
+            for key, results in zip(keys, batch_results):
+                for n, (text, token, token_int, score) in zip(
+                    range(1, nbest + 1), results
+                ):
+                    # Create a directory: outdir/{n}best_recog
+                    ibest_writer = writer[f"{n}best_recog"]
 
-                # Write the result to each file
-                ibest_writer["token"][key] = " ".join(token)
-                ibest_writer["token_int"][key] = " ".join(map(str, token_int))
-                ibest_writer["score"][key] = str(hyp.score)
+                    # Write the result to each file
+                    ibest_writer["token"][key] = " ".join(token)
+                    ibest_writer["token_int"][key] = " ".join(map(str, token_int))
+                    ibest_writer["score"][key] = str(score)
 
-                if text is not None:
-                    ibest_writer["text"][key] = text
+                    if text is not None:
+                        ibest_writer["text"][key] = text
 
 
 def get_parser():
@@ -362,6 +549,14 @@ def get_parser():
         default=1,
         help="The number of workers used for DataLoader",
     )
+    parser.add_argument(
+        "--num_decode_workers",
+        type=int,
+        default=1,
+        help="The number of processes for decoding. "
+        "The model is shared with the forked processes and "
+        "the threads are divided among them. (CPU only)",
+    )
 
     group = parser.add_argument_group("Input data related")
     group.add_argument(
@@ -413,6 +608,50 @@ def get_parser():
         help="CTC weight in joint decoding",
     )
     group.add_argument("--lm_weight", type=float, default=1.0, help="RNNLM weight")
+    group.add_argument(
+        "--score_threshold",
+        type=float_or_none,
+        default=None,
+        help="Prune the hypotheses whose scores are lower than "
+        "the best score minus this value at each step",
+    )
+    group.add_argument(
+        "--adaptive_beam_patience",
+        type=int,
+        default=0,
+        help="If positive, halve the beam size when the best hypothesis "
+        "has been extended from the previous best one for this number of steps",
+    )
+    group.add_argument(
+        "--min_beam_size",
+        type=int,
+        default=1,
+        help="The minimum beam size for --adaptive_beam_patience",
+    )
+    group.add_argument(
+        "--ctc_endpoint_margin",
+        type=int_or_none,
+        default=None,
+        help="If given, limit the output length to the number of tokens "
+        "of the CTC greedy path plus this value",
+    )
+    group.add_argument(
+        "--ctc_search",
+        type=str_or_none,
+        default=None,
+        choices=[None, "greedy", "prefix_beam", "attention_rescoring"],
+        help="If given, decode with the CTC prefix search instead of "
+        "the joint CTC/attention beam search. The LM is fused in prefix_beam. "
+        "attention_rescoring rescores the N-best of prefix_beam "
+        "with the attention decoder and the LM",
+    )
+    group.add_argument(
+        "--ctc_blank_skip_threshold",
+        type=float,
+        default=1.0,
+        help="The frames whose blank posterior is higher than this value "
+        "don't extend the hypotheses in --ctc_search prefix_beam",
+    )
 
     group = parser.add_argument_group("Text converter related")
     group.add_argument(
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import re
+import struct
+import sys
+from typing import BinaryIO
+from typing import Tuple
+
+import kaldiio
+import numpy as np
+import soundfile
+
+from espnet.utils.cli_utils import get_commandline_args
+from espnet2.fileio.mmap_store import MmapStoreReader
+from espnet2.fileio.read_text import read_2column_text
+
+
+def _read_wav_header_shape(f: BinaryIO) -> Tuple[int, ...]:
+    riff, _, wave = struct.unpack("<4sI4s", f.read(12))
+    if riff != b"RIFF" or wave != b"WAVE":
+        raise RuntimeError("Not a wav file")
+    channels = None
+    block_align = None
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            raise RuntimeError("data chunk is not found")
+        chunk_id, size = struct.unpack("<4sI", chunk)
+        if chunk_id == b"fmt ":
+            fmt = f.read(size)
+            channels, _, _, block_align = struct.unpack("<HIIH", fmt[2:14])
+        elif chunk_id == b"data":
+            if block_align is None:
+                raise RuntimeError("fmt chunk is not found")
+            frames = size // block_align
+            return (frames,) if channels == 1 else (frames, channels)
+        else:
+            # Chunks are aligned to 2 bytes
+            f.seek(size + size % 2, 1)
+
+
+def _read_token(f: BinaryIO) -> bytes:
+    # A token is terminated by a space, e.g. "FM " or "CM2 "
+    token = b""
+    while True:
+        c = f.read(1)
+        if c in (b" ", b""):
+            return token
+        token += c
+
+
+def get_kaldi_ark_shape(value: str) -> Tuple[int, ...]:
+    """Derive the shape from the header of the Kaldi-ark entry.
+
+    "path:offset" pointing to a binary matrix, vector, compressed matrix,
+    or wav file is supported. The other entries, e.g. with slicing or pipe,
+    are loaded as is.
+    """
+    m = re.match(r"^(.+):(\d+)$", value)
+    if m is not None and not value.rstrip().endswith("|"):
+        with open(m.group(1), "rb") as f:
+            f.seek(int(m.group(2)))
+            flag = f.read(2)
+            if flag == b"\0B":
+                token = _read_token(f)
+                if token in (b"FM", b"DM"):
+                    # <size-of-int32> <rows> <size-of-int32> <cols>
+                    rows, cols = struct.unpack("<xixi", f.read(10))
+                    return rows, cols
+                elif token in (b"FV", b"DV"):
+                    (dim,) = struct.unpack("<xi", f.read(5))
+                    return (dim,)
+                elif token in (b"CM", b"CM2", b"CM3"):
+                    # <min> <range> <rows> <cols>
+                    _, _, rows, cols = struct.unpack("<ffii", f.read(16))
+                    return rows, cols
+            elif flag == b"RI":
+                f.seek(-2, 1)
+                return _read_wav_header_shape(f)
+
+    array = kaldiio.load_mat(value)
+    if isinstance(array, tuple):
+        # (rate, wave)
+        array = array[1]
+    return array.shape
+
+
+def get_sound_shape(value: str) -> Tuple[int, ...]:
+    if re.search(r"\.ark:\d+$", value) is not None:
+        # The wav file packed in the ark, see SoundScpReader
+        return get_kaldi_ark_shape(value)
+    info = soundfile.info(value)
+    if info.channels == 1:
+        return (info.frames,)
+    else:
+        return info.frames, info.channels
+
+
+def get_npy_shape(value: str) -> Tuple[int, ...]:
+    # Only the header is read with mmap_mode
+    return np.load(value, mmap_mode="r").shape
+
+
+def data_to_shape(input: str, output: str, data_type: str, nj: int):
+    """Write the shape file of the data without loading the data itself.
+
+    The shapes are derived from the file headers by the threads
+    and written in the same format as the shape file created by collect_stats.
+    """
+    if data_type == "mmap":
+        reader = MmapStoreReader(input)
+        items = [(k, reader.get_info(k)[1]) for k in reader]
+    else:
+        get_shape = {
+            "sound": get_sound_shape,
+            "npy": get_npy_shape,
+            "kaldi_ark": get_kaldi_ark_shape,
+        }[data_type]
+        data = read_2column_text(input)
+        with ThreadPoolExecutor(nj) as executor:
+            items = zip(data, executor.map(get_shape, data.values()))
+            items = list(items)
+
+    fout = sys.stdout if output == "-" else open(output, "w", encoding="utf-8")
+    try:
+        for key, shape in items:
+            fout.write(f"{key} {','.join(map(str, shape))}\n")
+    finally:
+        if fout is not sys.stdout:
+            fout.close()
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Write the shape file from the headers of the data files",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--log_level",
+        type=lambda x: x.upper(),
+        default="INFO",
+        choices=("CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG", "NOTSET"),
+        help="The verbose level of logging",
+    )
+    parser.add_argument(
+        "--data_type",
+        type=str,
+        default="sound",
+        choices=["sound", "npy", "kaldi_ark", "mmap"],
+        help="The type of the input data. "
+        'The input is the directory of the store for "mmap", otherwise scp file',
+    )
+    parser.add_argument(
+        "--nj", type=int, default=8, help="The number of threads to read the headers"
+    )
+    parser.add_argument("input", help="Input scp file or mmap store")
+    parser.add_argument("output", help='Output shape file. "-" means stdout')
+    return parser
+
+
+def main(cmd=None):
+    print(get_commandline_args(), file=sys.stderr)
+    parser = get_parser()
+    args = parser.parse_args(cmd)
+    logging.basicConfig(
+        level=args.log_level,
+        format="%(asctime)s (%(module)s:%(lineno)d) %(levelname)s: %(message)s",
+    )
+    kwargs = vars(args)
+    kwargs.pop("log_level")
+    data_to_shape(**kwargs)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ import torch
 from typeguard import check_argument_types
 
 from espnet.utils.cli_utils import get_commandline_args
+from espnet.utils.forked_imap import forked_imap
 from espnet2.fileio.sound_scp import SoundScpWriter
 from espnet2.tasks.enh import EnhancementTask
 from espnet2.torch_utils.device_funcs import to_device
@@ -36,6 +37,7 @@ def inference(
     ngpu: int,
     seed: int,
     num_workers: int,
+    num_decode_workers: int,
     log_level: Union[int, str],
     data_path_and_name_and_type: Sequence[Tuple[str, str, str]],
     key_file: Optional[str],
@@ -49,6 +51,8 @@ def inference(
         raise NotImplementedError("batch decoding is not implemented")
     if ngpu > 1:
         raise NotImplementedError("only single GPU decoding is supported")
+    if num_decode_workers > 1 and ngpu > 0:
+        raise NotImplementedError("--num_decode_workers > 1 is supported only on CPU")
 
     logging.basicConfig(
         level=log_level,
@@ -90,7 +94,8 @@ def inference(
             SoundScpWriter(f"{output_dir}/wavs/{i + 1}", f"{output_dir}/spk{i + 1}.scp")
         )
 
-    for keys, batch in loader:
+    def decode(item):
+        keys, batch = item
         assert isinstance(batch, dict), type(batch)
         assert all(isinstance(s, str) for s in keys), keys
         _bs = len(next(iter(batch.values())))
@@ -114,6 +119,9 @@ def inference(
             ]  # list[(sample,batch)]
         else:
             waves = [w.T.cpu().numpy() for w in waves]
+        return keys, waves
+
+    for keys, waves in forked_imap(decode, loader, num_decode_workers):
         for (i, w) in enumerate(waves):
             writers[i][keys[0]] = fs, w
 
@@ -160,6 +168,14 @@ def get_parser():
         default=1,
         help="The number of workers used for DataLoader",
     )
+    parser.add_argument(
+        "--num_decode_workers",
+        type=int,
+        default=1,
+        help="The number of processes for decoding. "
+        "The model is shared with the forked processes and "
+        "the threads are divided among them. (CPU only)",
+    )
 
     group = parser.add_argument_group("Input data related")
     group.add_argument(
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+import argparse
+import logging
+from pathlib import Path
+import sys
+from typing import Optional
+
+from typeguard import check_argument_types
+
+from espnet.utils.cli_utils import get_commandline_args
+from espnet2.fileio.token_corpus import TokenCorpusWriter
+from espnet2.main_funcs.pretokenize_text import get_tokenizer_hash
+from espnet2.train.preprocessor import CommonPreprocessor
+from espnet2.utils.types import str_or_none
+
+
+def build_token_corpus(
+    input: str,
+    output_dir: str,
+    token_type: str,
+    token_list: str,
+    bpemodel: Optional[str],
+    non_linguistic_symbols: Optional[str],
+    cleaner: Optional[str],
+    g2p: Optional[str],
+    log_interval: int,
+):
+    """Tokenize the "text" file and write the token-ids as a flat token corpus.
+
+    The sentences are written in the order of the input file,
+    so the consecutive sentences are packed into a block for training.
+    """
+    assert check_argument_types()
+    config = dict(
+        token_type=token_type,
+        token_list=token_list,
+        bpemodel=bpemodel,
+        non_linguistic_symbols=non_linguistic_symbols,
+        text_cleaner=cleaner,
+        g2p_type=g2p,
+    )
+    preprocessor = CommonPreprocessor(train=False, **config)
+    meta = dict(
+        source=str(Path(input).resolve()),
+        tokenizer_hash=get_tokenizer_hash(config),
+    )
+
+    linenum = 0
+    with TokenCorpusWriter(output_dir, meta=meta) as writer, open(
+        input, "r", encoding="utf-8"
+    ) as f:
+        for linenum, line in enumerate(f, 1):
+            # e.g. "uttid hello world" -> "hello world"
+            sps = line.rstrip("\n").split(maxsplit=1)
+            text = sps[1] if len(sps) == 2 else ""
+            writer.append(preprocessor.tokenize(text))
+            if linenum % log_interval == 0:
+                logging.info(f"Processed {linenum} lines")
+        logging.info(
+            f"Wrote {writer.num_tokens} tokens of {linenum} sentences to {output_dir}"
+        )
+
+
+def get_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Build a flat token corpus for LM training from the text",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--log_level",
+        type=lambda x: x.upper(),
+        default="INFO",
+        choices=("CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG", "NOTSET"),
+        help="The verbose level of logging",
+    )
+    parser.add_argument(
+        "--input", "-i", required=True, help='Input "text" file: "uttid sentence"'
+    )
+    parser.add_argument(
+        "--output_dir", "-o", required=True, help="Output directory of the corpus"
+    )
+    parser.add_argument(
+        "--token_type",
+        default="bpe",
+        choices=["bpe", "char", "word"],
+        help="Token type",
+    )
+    parser.add_argument(
+        "--token_list", required=True, help="A text mapping int-id to token"
+    )
+    parser.add_argument(
+        "--bpemodel", type=str_or_none, default=None, help="The bpemodel file path"
+    )
+    parser.add_argument(
+        "--non_linguistic_symbols",
+        type=str_or_none,
+        help="non_linguistic_symbols file path",
+    )
+    parser.add_argument(
+        "--cleaner",
+        type=str_or_none,
+        choices=[None, "tacotron", "jaconv", "vietnamese"],
+        default=None,
+        help="Apply text cleaning",
+    )
+    parser.add_argument(
+        "--g2p",
+        type=str_or_none,
+        choices=[None, "g2p_en", "pyopenjtalk", "pyopenjtalk_kana"],
+        default=None,
+        help="Specify g2p method if --token_type=phn",
+    )
+    parser.add_argument("--log_interval", type=int, default=100000)
+    return parser
+
+
+def main(cmd=None):
+    print(get_commandline_args(), file=sys.stderr)
+    parser = get_parser()
+    args = parser.parse_args(cmd)
+    logging.basicConfig(
+        level=args.log_level,
+        format="%(asctime)s (%(module)s:%(lineno)d) %(levelname)s: %(message)s",
+    )
+    kwargs = vars(args)
+    kwargs.pop("log_level")
+    build_token_corpus(**kwargs)
+
+
+if __name__ == "__main__":
+    main()
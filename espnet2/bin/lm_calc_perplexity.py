@@ -1,8 +1,13 @@
 #!/usr/bin/env python3
 import argparse
+from contextlib import ExitStack
 import logging
 from pathlib import Path
 import sys
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
+from typing import List
 from typing import Optional
 from typing import Sequence
 from typing import Tuple
@@ -25,6 +30,56 @@ from espnet2.utils.types import str2bool
 from espnet2.utils.types import str2triple_str
 from espnet2.utils.types import str_or_none
 
+# The per-utterance record of the binary output
+NLL_DTYPE = np.dtype([("nll", "<f4"), ("ntokens", "<i4")])
+
+
+def _identity_collate(data):
+    return data
+
+
+def sorted_batch_iterator(
+    chunks: Iterable[List[Tuple[str, Dict[str, np.ndarray]]]],
+    batch_bins: int,
+    collate_fn,
+) -> Iterator[Tuple[List[str], Dict[str, torch.Tensor]]]:
+    """Make token-budget mini-batches from the chunks of utterances.
+
+    The utterances in each chunk are sorted by the length
+    and packed into mini-batches until batch_size * max_length
+    reaches batch_bins, so that the padding is reduced.
+    """
+    for chunk in chunks:
+        # Sort in descending order, so the first one has the max length
+        chunk = sorted(chunk, key=lambda x: -len(next(iter(x[1].values()))))
+        batch = []
+        max_length = 0
+        for uid, data in chunk:
+            if len(batch) == 0:
+                max_length = len(next(iter(data.values())))
+            elif (len(batch) + 1) * max_length > batch_bins:
+                yield collate_fn(batch)
+                batch = []
+                max_length = len(next(iter(data.values())))
+            batch.append((uid, data))
+        if len(batch) != 0:
+            yield collate_fn(batch)
+
+
+def load_utt2nll(output_dir: Union[Path, str]) -> Tuple[List[str], np.ndarray]:
+    """Load the binary output written with --write_nll_binary.
+
+    Returns:
+        keys: The utterance ids
+        records: (Nutt,) structured array of "nll" and "ntokens"
+    """
+    output_dir = Path(output_dir)
+    with (output_dir / "utt2nll.keys").open("r", encoding="utf-8") as f:
+        keys = [line.rstrip("\n") for line in f]
+    records = np.fromfile(output_dir / "utt2nll.bin", dtype=NLL_DTYPE)
+    assert len(keys) == len(records), (len(keys), len(records))
+    return keys, records
+
 
 def calc_perplexity(
     output_dir: str,
@@ -40,6 +95,10 @@ def calc_perplexity(
     model_file: Optional[str],
     log_base: Optional[float],
     allow_variable_data_keys: bool,
+    batch_bins: int = 0,
+    sort_buffer: int = 10000,
+    write_utt2ppl: bool = True,
+    write_nll_binary: bool = False,
 ):
     assert check_argument_types()
     logging.basicConfig(
@@ -63,20 +122,46 @@ def calc_perplexity(
     logging.info(f"Model:\n{model}")
 
     # 3. Build data-iterator
-    loader = LMTask.build_streaming_iterator(
-        data_path_and_name_and_type,
-        dtype=dtype,
-        batch_size=batch_size,
-        key_file=key_file,
-        num_workers=num_workers,
-        preprocess_fn=LMTask.build_preprocess_fn(train_args, False),
-        collate_fn=LMTask.build_collate_fn(train_args, False),
-        allow_variable_data_keys=allow_variable_data_keys,
-        inference=True,
-    )
+    if batch_bins > 0:
+        # The workers load and tokenize the chunks of utterances,
+        # which are sorted by the length and split into mini-batches here.
+        loader = sorted_batch_iterator(
+            LMTask.build_streaming_iterator(
+                data_path_and_name_and_type,
+                dtype=dtype,
+                batch_size=sort_buffer,
+                key_file=key_file,
+                num_workers=num_workers,
+                preprocess_fn=LMTask.build_preprocess_fn(train_args, False),
+                collate_fn=_identity_collate,
+                allow_variable_data_keys=allow_variable_data_keys,
+                inference=True,
+            ),
+            batch_bins=batch_bins,
+            collate_fn=LMTask.build_collate_fn(train_args, False),
+        )
+    else:
+        loader = LMTask.build_streaming_iterator(
+            data_path_and_name_and_type,
+            dtype=dtype,
+            batch_size=batch_size,
+            key_file=key_file,
+            num_workers=num_workers,
+            preprocess_fn=LMTask.build_preprocess_fn(train_args, False),
+            collate_fn=LMTask.build_collate_fn(train_args, False),
+            allow_variable_data_keys=allow_variable_data_keys,
+            inference=True,
+        )
 
     # 4. Start for-loop
-    with DatadirWriter(output_dir) as writer:
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    with ExitStack() as stack:
+        writer = stack.enter_context(DatadirWriter(output_dir))
+        if write_nll_binary:
+            fkeys = stack.enter_context(
+                (Path(output_dir) / "utt2nll.keys").open("w", encoding="utf-8")
+            )
+            fnll = stack.enter_context((Path(output_dir) / "utt2nll.bin").open("wb"))
         total_nll = 0.0
         total_ntokens = 0
         for keys, batch in loader:
@@ -104,6 +189,15 @@ def calc_perplexity(
             total_nll += nll.sum()
             total_ntokens += lengths.sum()
 
+            if write_nll_binary:
+                records = np.empty(len(keys), dtype=NLL_DTYPE)
+                records["nll"] = nll
+                records["ntokens"] = lengths
+                fnll.write(records.tobytes())
+                fkeys.write("".join(f"{k}\n" for k in keys))
+
+            if not write_utt2ppl:
+                continue
             for key, _nll, ntoken in zip(keys, nll, lengths):
                 if log_base is None:
                     utt_ppl = np.exp(_nll / ntoken)
@@ -172,6 +266,33 @@ def get_parser():
         default=1,
         help="The batch size for inference",
     )
+    parser.add_argument(
+        "--batch_bins",
+        type=int,
+        default=0,
+        help="If positive, the utterances are sorted by the length and "
+        "the mini-batches are made so that batch_size * max_length <= batch_bins, "
+        "instead of using --batch_size",
+    )
+    parser.add_argument(
+        "--sort_buffer",
+        type=int,
+        default=10000,
+        help="The number of utterances sorted at once for --batch_bins",
+    )
+    parser.add_argument(
+        "--write_utt2ppl",
+        type=str2bool,
+        default=True,
+        help="Write the perplexity of each utterance as text",
+    )
+    parser.add_argument(
+        "--write_nll_binary",
+        type=str2bool,
+        default=False,
+        help="Write the negative log-likelihood and the number of tokens "
+        "of each utterance to utt2nll.bin and the keys to utt2nll.keys",
+    )
     parser.add_argument(
         "--log_base",
         type=float_or_none,
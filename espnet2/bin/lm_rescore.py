@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+import argparse
+import logging
+from pathlib import Path
+import sys
+from typing import Optional
+from typing import Union
+
+import torch
+from typeguard import check_argument_types
+
+from espnet.utils.cli_utils import get_commandline_args
+from espnet2.fileio.datadir_writer import DatadirWriter
+from espnet2.fileio.read_text import read_2column_text
+from espnet2.lm.batch_lm_score import batch_lm_score
+from espnet2.tasks.lm import LMTask
+from espnet2.torch_utils.set_all_random_seed import set_all_random_seed
+from espnet2.utils import config_argparse
+from espnet2.utils.types import str_or_none
+
+
+def lm_rescore(
+    output_dir: str,
+    nbest_dir: str,
+    nbest: int,
+    ngpu: int,
+    seed: int,
+    dtype: str,
+    log_level: Union[int, str],
+    lm_train_config: str,
+    lm_file: Optional[str],
+    lm_weight: float,
+    penalty: float,
+    batch_bins: int,
+):
+    """Rerank the N-best hypotheses of asr_inference with the LM.
+
+    The new score of each hypothesis is
+
+        score + lm_weight * log P_LM(hyp) + penalty * (len(hyp) + 1)
+
+    and the hypotheses of all utterances are scored together.
+    """
+    assert check_argument_types()
+    logging.basicConfig(
+        level=log_level,
+        format="%(asctime)s (%(module)s:%(lineno)d) %(levelname)s: %(message)s",
+    )
+
+    if ngpu >= 1:
+        device = "cuda"
+    else:
+        device = "cpu"
+
+    # 1. Set random-seed
+    set_all_random_seed(seed)
+
+    # 2. Build LM
+    model, train_args = LMTask.build_model_from_file(lm_train_config, lm_file, device)
+    model.to(dtype=getattr(torch, dtype)).eval()
+    logging.info(f"LM:\n{model.lm}")
+
+    # 3. Load N-best
+    # hyps: List of (key, n-th, token_int)
+    hyps = []
+    files = {}
+    for n in range(1, nbest + 1):
+        ndir = Path(nbest_dir) / f"{n}best_recog"
+        if not (ndir / "token_int").exists():
+            break
+        for name in ["token_int", "score", "token", "text"]:
+            if (ndir / name).exists():
+                files[(n, name)] = read_2column_text(ndir / name)
+        for key, token_int in files[(n, "token_int")].items():
+            hyps.append((key, n, [int(t) for t in token_int.split()]))
+    if len(hyps) == 0:
+        raise RuntimeError(f"No N-best found in {nbest_dir}")
+    logging.info(f"Rescoring {len(hyps)} hypotheses")
+
+    # 4. Compute the LM scores
+    lm_scores = batch_lm_score(
+        model.lm,
+        [tint for _, _, tint in hyps],
+        sos_eos=model.sos,
+        batch_bins=batch_bins,
+        device=device,
+    )
+
+    # 5. Rerank and write the results
+    utt2hyps = {}
+    for (key, n, tint), lm_score in zip(hyps, lm_scores):
+        score = (
+            float(files[(n, "score")][key])
+            + lm_weight * lm_score
+            + penalty * (len(tint) + 1)
+        )
+        utt2hyps.setdefault(key, []).append((score, lm_score, n))
+
+    with DatadirWriter(output_dir) as writer:
+        for key, results in utt2hyps.items():
+            results.sort(key=lambda x: -x[0])
+            for i, (score, lm_score, n) in enumerate(results, 1):
+                ibest_writer = writer[f"{i}best_recog"]
+                ibest_writer["score"][key] = str(score)
+                ibest_writer["lm_score"][key] = str(lm_score)
+                for name in ["token_int", "token", "text"]:
+                    if key in files.get((n, name), {}):
+                        ibest_writer[name][key] = files[(n, name)][key]
+
+
+def get_parser():
+    parser = config_argparse.ArgumentParser(
+        description="Rescore the N-best of ASR with LM",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+
+    # Note(kamo): Use '_' instead of '-' as separator.
+    # '-' is confusing if written in yaml.
+    parser.add_argument(
+        "--log_level",
+        type=lambda x: x.upper(),
+        default="INFO",
+        choices=("CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG", "NOTSET"),
+        help="The verbose level of logging",
+    )
+
+    parser.add_argument("--output_dir", type=str, required=True)
+    parser.add_argument(
+        "--nbest_dir",
+        type=str,
+        required=True,
+        help="The output directory of asr_inference including {n}best_recog",
+    )
+    parser.add_argument("--nbest", type=int, default=10, help="The number of N-best")
+    parser.add_argument(
+        "--ngpu",
+        type=int,
+        default=0,
+        help="The number of gpus. 0 indicates CPU mode",
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument(
+        "--dtype",
+        default="float32",
+        choices=["float16", "float32", "float64"],
+        help="Data type",
+    )
+    parser.add_argument(
+        "--batch_bins",
+        type=int,
+        default=10000,
+        help="The maximum number of tokens in a mini-batch of the LM",
+    )
+
+    group = parser.add_argument_group("The model configuration related")
+    group.add_argument("--lm_train_config", type=str, required=True)
+    group.add_argument("--lm_file", type=str_or_none)
+
+    group = parser.add_argument_group("Rescoring related")
+    group.add_argument("--lm_weight", type=float, default=1.0, help="RNNLM weight")
+    group.add_argument(
+        "--penalty",
+        type=float,
+        default=0.0,
+        help="Insertion penalty for each token including <eos>",
+    )
+
+    return parser
+
+
+def main(cmd=None):
+    print(get_commandline_args(), file=sys.stderr)
+    parser = get_parser()
+    args = parser.parse_args(cmd)
+    kwargs = vars(args)
+    kwargs.pop("config", None)
+    lm_rescore(**kwargs)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,24 @@
 #!/usr/bin/env python3
 import argparse
 from collections import Counter
+import functools
 import logging
+import multiprocessing
+import os
 from pathlib import Path
+import shutil
 import sys
+import tempfile
+from typing import Callable
 from typing import List
 from typing import Optional
+from typing import Tuple
+from typing import Union
 
 from typeguard import check_argument_types
 
 from espnet.utils.cli_utils import get_commandline_args
+from espnet2.text.abs_tokenizer import AbsTokenizer
 from espnet2.text.build_tokenizer import build_tokenizer
 from espnet2.text.cleaner import TextCleaner
 from espnet2.utils.types import str2bool
@@ -60,6 +69,83 @@ def field2slice(field: Optional[str]) -> slice:
     return slic
 
 
+def split_file_by_bytes(path: Union[Path, str], num: int) -> List[Tuple[int, int]]:
+    """Split a file into the byte ranges aligned to the beginning of lines.
+
+    Examples:
+        >>> split_file_by_bytes("text", 2)
+        [(0, 1034), (1034, 2051)]
+
+    """
+    size = os.path.getsize(path)
+    offsets = [0]
+    with open(path, "rb") as f:
+        for i in range(1, num):
+            pos = max(size * i // num, offsets[-1])
+            if pos > 0:
+                # Move to the beginning of the next line
+                f.seek(pos - 1)
+                f.readline()
+                pos = f.tell()
+            offsets.append(min(pos, size))
+    offsets.append(size)
+    return list(zip(offsets[:-1], offsets[1:]))
+
+
+def _tokenize_line(
+    line: str,
+    field: Optional[slice],
+    delimiter: Optional[str],
+    cleaner: Callable[[str], str],
+    tokenizer: AbsTokenizer,
+) -> List[str]:
+    line = line.rstrip()
+    if field is not None:
+        # e.g. field="2-"
+        # uttidA hello world!! -> hello world!!
+        tokens = line.split(delimiter)
+        tokens = tokens[field]
+        if delimiter is None:
+            line = " ".join(tokens)
+        else:
+            line = delimiter.join(tokens)
+
+    line = cleaner(line)
+    return tokenizer.text2tokens(line)
+
+
+def _tokenize_shard(
+    byte_range: Tuple[int, int],
+    output: Optional[str],
+    input: str,
+    **kwargs,
+) -> Counter:
+    """Tokenize the lines in the byte range of the input file.
+
+    The tokenized text is written to the output file if given,
+    otherwise the counts of the tokens are returned.
+    """
+    start, end = byte_range
+    counter = Counter()
+    fout = open(output, "w", encoding="utf-8") if output is not None else None
+    with open(input, "rb") as fin:
+        fin.seek(start)
+        pos = start
+        while pos < end:
+            line = fin.readline()
+            if len(line) == 0:
+                break
+            pos += len(line)
+            tokens = _tokenize_line(line.decode("utf-8"), **kwargs)
+            if fout is not None:
+                fout.write(" ".join(tokens) + "\n")
+            else:
+                counter.update(tokens)
+    if fout is not None:
+        fout.close()
+    return counter
+
+
 def tokenize(
     input: str,
     output: str,
@@ -77,6 +163,7 @@ def tokenize(
     add_symbol: List[str],
     cleaner: Optional[str],
     g2p: Optional[str],
+    nj: int = 1,
 ):
     assert check_argument_types()
 
@@ -84,10 +171,14 @@ def tokenize(
         level=log_level,
         format="%(asctime)s (%(module)s:%(lineno)d) %(levelname)s: %(message)s",
     )
-    if input == "-":
-        fin = sys.stdin
-    else:
-        fin = Path(input).open("r", encoding="utf-8")
+    if nj > 1 and input == "-":
+        logging.warning("--nj is ignored for the input from sys.stdin")
+        nj = 1
+    if nj <= 1:
+        if input == "-":
+            fin = sys.stdin
+        else:
+            fin = Path(input).open("r", encoding="utf-8")
     if output == "-":
         fout = sys.stdout
     else:
@@ -110,25 +201,45 @@ def tokenize(
     if field is not None:
         field = field2slice(field)
 
-    for line in fin:
-        line = line.rstrip()
-        if field is not None:
-            # e.g. field="2-"
-            # uttidA hello world!! -> hello world!!
-            tokens = line.split(delimiter)
-            tokens = tokens[field]
-            if delimiter is None:
-                line = " ".join(tokens)
+    if nj <= 1:
+        for line in fin:
+            tokens = _tokenize_line(line, field, delimiter, cleaner, tokenizer)
+            if not write_vocabulary:
+                fout.write(" ".join(tokens) + "\n")
             else:
-                line = delimiter.join(tokens)
+                for t in tokens:
+                    counter[t] += 1
+    else:
+        # Tokenize the byte ranges of the input in parallel.
+        # The outputs are written to the temporary files for each shard
+        # and concatenated in order, or the counts of tokens are merged.
+        byte_ranges = split_file_by_bytes(input, nj)
+        tmpdir = tempfile.mkdtemp(dir=Path(output).parent if output != "-" else None)
+        try:
+            if not write_vocabulary:
+                outputs = [os.path.join(tmpdir, f"output.{i}") for i in range(nj)]
+            else:
+                outputs = [None] * nj
+            func = functools.partial(
+                _tokenize_shard,
+                input=input,
+                field=field,
+                delimiter=delimiter,
+                cleaner=cleaner,
+                tokenizer=tokenizer,
+            )
+            with multiprocessing.Pool(nj) as pool:
+                counters = pool.starmap(func, zip(byte_ranges, outputs))
 
-        line = cleaner(line)
-        tokens = tokenizer.text2tokens(line)
-        if not write_vocabulary:
-            fout.write(" ".join(tokens) + "\n")
-        else:
-            for t in tokens:
-                counter[t] += 1
+            if not write_vocabulary:
+                for o in outputs:
+                    with open(o, "r", encoding="utf-8") as f:
+                        shutil.copyfileobj(f, fout)
+            else:
+                for c in counters:
+                    counter.update(c)
+        finally:
+            shutil.rmtree(tmpdir)
 
     if not write_vocabulary:
         return
@@ -239,6 +350,14 @@ def get_parser() -> argparse.ArgumentParser:
         help="Specify g2p method if --token_type=phn",
     )
 
+    parser.add_argument(
+        "--nj",
+        type=int,
+        default=1,
+        help="The number of parallel processes. "
+        "The input file is split into the byte ranges for each process",
+    )
+
     group = parser.add_argument_group("write_vocabulary mode related")
     group.add_argument(
         "--write_vocabulary",
@@ -20,6 +20,7 @@ import torch
 from typeguard import check_argument_types
 
 from espnet.utils.cli_utils import get_commandline_args
+from espnet.utils.forked_imap import forked_imap
 from espnet2.fileio.npy_scp import NpyScpWriter
 from espnet2.tasks.tts import TTSTask
 from espnet2.torch_utils.device_funcs import to_device
@@ -64,6 +65,8 @@ class Text2Speech:
         vocoder_conf: dict = None,
         dtype: str = "float32",
         device: str = "cpu",
+        g2p_cache_size: int = 100000,
+        g2p_cache_dir: Optional[Union[Path, str]] = None,
     ):
         assert check_argument_types()
 
@@ -79,6 +82,10 @@ class Text2Speech:
         self.normalize = model.normalize
         self.feats_extract = model.feats_extract
         self.duration_calculator = DurationCalculator()
+        # The in-memory g2p cache is useful in this long-lived process,
+        # and the g2p cache directory used in training may not exist here
+        train_args.g2p_cache_size = g2p_cache_size
+        train_args.g2p_cache_dir = g2p_cache_dir
         self.preprocess_fn = TTSTask.build_preprocess_fn(train_args, False)
         self.use_teacher_forcing = use_teacher_forcing
 
@@ -186,6 +193,7 @@ def inference(
     ngpu: int,
     seed: int,
     num_workers: int,
+    num_decode_workers: int,
     log_level: Union[int, str],
     data_path_and_name_and_type: Sequence[Tuple[str, str, str]],
     key_file: Optional[str],
@@ -208,6 +216,8 @@ def inference(
         raise NotImplementedError("batch decoding is not implemented")
     if ngpu > 1:
         raise NotImplementedError("only single GPU decoding is supported")
+    if num_decode_workers > 1 and ngpu > 0:
+        raise NotImplementedError("--num_decode_workers > 1 is supported only on CPU")
     logging.basicConfig(
         level=log_level,
         format="%(asctime)s (%(module)s:%(lineno)d) %(levelname)s: %(message)s",
@@ -271,6 +281,23 @@ def inference(
     import matplotlib.pyplot as plt
     from matplotlib.ticker import MaxNLocator
 
+    def decode(item):
+        keys, batch = item
+        assert isinstance(batch, dict), type(batch)
+        assert all(isinstance(s, str) for s in keys), keys
+        _bs = len(next(iter(batch.values())))
+        assert _bs == 1, _bs
+
+        # Change to single sequence and remove *_length
+        # because inference() requires 1-seq, not mini-batch.
+        batch = {k: v[0] for k, v in batch.items() if not k.endswith("_lengths")}
+
+        start_time = time.perf_counter()
+        outputs = text2speech(**batch)
+        elapsed = time.perf_counter() - start_time
+        insize = next(iter(batch.values())).size(0) + 1
+        return keys, insize, elapsed, outputs
+
     with NpyScpWriter(
         output_dir / "norm",
         output_dir / "norm/feats.scp",
@@ -283,26 +310,15 @@ def inference(
     ) as duration_writer, open(
         output_dir / "focus_rates/focus_rates", "w"
     ) as focus_rate_writer:
-        for idx, (keys, batch) in enumerate(loader, 1):
-            assert isinstance(batch, dict), type(batch)
-            assert all(isinstance(s, str) for s in keys), keys
-            _bs = len(next(iter(batch.values())))
-            assert _bs == 1, _bs
-
-            # Change to single sequence and remove *_length
-            # because inference() requires 1-seq, not mini-batch.
-            batch = {k: v[0] for k, v in batch.items() if not k.endswith("_lengths")}
-
-            start_time = time.perf_counter()
-            wav, outs, outs_denorm, probs, att_ws, duration, focus_rate = text2speech(
-                **batch
-            )
+        for idx, (keys, insize, elapsed, outputs) in enumerate(
+            forked_imap(decode, loader, num_decode_workers), 1
+        ):
+            wav, outs, outs_denorm, probs, att_ws, duration, focus_rate = outputs
 
             key = keys[0]
-            insize = next(iter(batch.values())).size(0) + 1
             logging.info(
                 "inference speed = {:.1f} frames / sec.".format(
-                    int(outs.size(0)) / (time.perf_counter() - start_time)
+                    int(outs.size(0)) / elapsed
                 )
             )
             logging.info(f"{key} (size:{insize}->{outs.size(0)})")
@@ -431,6 +447,14 @@ def get_parser():
         default=1,
         help="The number of workers used for DataLoader",
     )
+    parser.add_argument(
+        "--num_decode_workers",
+        type=int,
+        default=1,
+        help="The number of processes for decoding. "
+        "The model is shared with the forked processes and "
+        "the threads are divided among them. (CPU only)",
+    )
     parser.add_argument(
         "--batch_size",
         type=int,
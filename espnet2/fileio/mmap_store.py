@@ -0,0 +1,192 @@
+import collections.abc
+from pathlib import Path
+import shutil
+from typing import Dict
+from typing import Iterable
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+from typeguard import check_argument_types
+import yaml
+
+
+class MmapStoreWriter:
+    """Writer class for a memory-mapped array store.
+
+    All arrays are concatenated into a single binary file
+    and their locations are written in a text index file.
+
+    Examples:
+        some_dir/data.bin
+        some_dir/index
+        some_dir/meta.yaml
+
+        The index file is as follows:
+            key1 <f4 100,80 0
+            key2 <f4 123,80 32000
+            ...
+
+        >>> writer = MmapStoreWriter('some_dir', meta={'foo': 'bar'})
+        >>> writer['aa'] = numpy_array
+        >>> writer['bb'] = numpy_array
+
+    """
+
+    # Each array is aligned to this number of bytes
+    alignment = 16
+
+    def __init__(self, outdir: Union[Path, str], meta: Optional[Dict] = None):
+        assert check_argument_types()
+        self.dir = Path(outdir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.fdata = (self.dir / "data.bin").open("wb")
+        self.findex = (self.dir / "index").open("w", encoding="utf-8")
+        with (self.dir / "meta.yaml").open("w", encoding="utf-8") as f:
+            yaml.safe_dump(meta if meta is not None else {}, f)
+        self.offset = 0
+
+    def __setitem__(self, key: str, value: np.ndarray):
+        assert isinstance(value, np.ndarray), type(value)
+        if " " in key:
+            raise RuntimeError(f'The key must not include white space: "{key}"')
+        value = np.ascontiguousarray(value)
+
+        pad = -self.offset % self.alignment
+        if pad > 0:
+            self.fdata.write(b"\0" * pad)
+            self.offset += pad
+
+        shape = ",".join(map(str, value.shape))
+        self.findex.write(f"{key} {value.dtype.str} {shape} {self.offset}\n")
+        self.fdata.write(value.tobytes())
+        self.offset += value.nbytes
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.fdata.close()
+        self.findex.close()
+
+
+class MmapStoreReader(collections.abc.Mapping):
+    """Reader class for a memory-mapped array store.
+
+    The binary file is mapped lazily at the first access,
+    so that the instance can be passed to the DataLoader-workers
+    without copying the mapped region.
+
+    Examples:
+        >>> reader = MmapStoreReader('some_dir')
+        >>> array = reader['key1']
+        >>> reader.meta
+        {'foo': 'bar'}
+
+    """
+
+    def __init__(self, fname: Union[Path, str]):
+        assert check_argument_types()
+        self.dir = Path(fname)
+        self.index = {}
+        with (self.dir / "index").open("r", encoding="utf-8") as f:
+            for linenum, line in enumerate(f, 1):
+                sps = line.rstrip().split(" ")
+                if len(sps) != 4:
+                    raise RuntimeError(
+                        f"Format error: {self.dir / 'index'}:{linenum}: {line}"
+                    )
+                key, dtype, shape, offset = sps
+                if key in self.index:
+                    raise RuntimeError(f"{key} is duplicated ({self.dir}:{linenum})")
+                shape = tuple(int(s) for s in shape.split(",") if s != "")
+                self.index[key] = (np.dtype(dtype), shape, int(offset))
+
+        meta_file = self.dir / "meta.yaml"
+        if meta_file.exists():
+            with meta_file.open("r", encoding="utf-8") as f:
+                self.meta = yaml.safe_load(f) or {}
+        else:
+            self.meta = {}
+        self._mmap = None
+
+    def __getstate__(self):
+        # Don't pickle the mapped region
+        state = self.__dict__.copy()
+        state["_mmap"] = None
+        return state
+
+    def get_info(self, key) -> Tuple[np.dtype, Tuple[int, ...], int]:
+        return self.index[key]
+
+    def __getitem__(self, key) -> np.ndarray:
+        dtype, shape, offset = self.index[key]
+        if self._mmap is None:
+            data_file = self.dir / "data.bin"
+            if data_file.stat().st_size == 0:
+                # np.memmap can't map an empty file
+                self._mmap = np.zeros(0, dtype=np.uint8)
+            else:
+                self._mmap = np.memmap(data_file, dtype=np.uint8, mode="r")
+        nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+        return self._mmap[offset : offset + nbytes].view(dtype).reshape(shape)
+
+    def __contains__(self, item):
+        return item in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def keys(self):
+        return self.index.keys()
+
+
+def merge_mmap_stores(
+    input_dirs: Iterable[Union[Path, str]], output_dir: Union[Path, str]
+) -> None:
+    """Concatenate the memory-mapped array stores into a store.
+
+    The binary files are copied as they are and only the offsets
+    in the index files are shifted.
+    """
+    assert check_argument_types()
+    input_dirs = [Path(p) for p in input_dirs]
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    meta = None
+    offset = 0
+    alignment = MmapStoreWriter.alignment
+    with (output_dir / "data.bin").open("wb") as fdata, (output_dir / "index").open(
+        "w", encoding="utf-8"
+    ) as findex:
+        for idir in input_dirs:
+            reader = MmapStoreReader(idir)
+            if meta is None:
+                meta = reader.meta
+            elif meta != reader.meta:
+                raise RuntimeError(
+                    f"Meta information is mismatched: {input_dirs[0]} and {idir}"
+                )
+
+            pad = -offset % alignment
+            if pad > 0:
+                fdata.write(b"\0" * pad)
+                offset += pad
+
+            for key, (dtype, shape, _offset) in reader.index.items():
+                shape = ",".join(map(str, shape))
+                findex.write(f"{key} {dtype.str} {shape} {_offset + offset}\n")
+            with (idir / "data.bin").open("rb") as fin:
+                shutil.copyfileobj(fin, fdata)
+            offset += (idir / "data.bin").stat().st_size
+
+    with (output_dir / "meta.yaml").open("w", encoding="utf-8") as f:
+        yaml.safe_dump(meta if meta is not None else {}, f)
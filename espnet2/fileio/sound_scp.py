@@ -1,7 +1,10 @@
 import collections.abc
 from pathlib import Path
+import re
+from typing import Tuple
 from typing import Union
 
+import kaldiio
 import numpy as np
 import soundfile
 from typeguard import check_argument_types
@@ -9,6 +12,36 @@ from typeguard import check_argument_types
 from espnet2.fileio.read_text import read_2column_text
 
 
+def read_sound(wav: str, dtype=None, always_2d: bool = False) -> Tuple[int, np.ndarray]:
+    """Read the wav file or the wav packed in a Kaldi-ark.
+
+    Args:
+        wav: The file path or "ark:offset" pointing to the wav in a Kaldi-ark,
+            e.g. created by format_wav_scp.py with "--archive true".
+        dtype: If None, the data is normalized to [-1,1] as soundfile.read does.
+        always_2d: Return (Nsamples, Nchannels) even for the monaural wav.
+    Returns:
+        (rate, array)
+
+    """
+    if re.search(r"\.ark:\d+$", wav) is not None:
+        # kaldiio reads the wav in the ark as int16
+        rate, array = kaldiio.load_mat(wav)
+        if dtype is None:
+            # Same as soundfile.read without dtype
+            array = array.astype(np.float64) / (1 << 15)
+        else:
+            array = array.astype(dtype)
+        if always_2d and array.ndim == 1:
+            array = array[:, None]
+    elif dtype is None:
+        # soundfile.read normalizes data to [-1,1] if dtype is not given
+        array, rate = soundfile.read(wav, always_2d=always_2d)
+    else:
+        array, rate = soundfile.read(wav, dtype=dtype, always_2d=always_2d)
+    return rate, array
+
+
 class SoundScpReader(collections.abc.Mapping):
     """Reader class for 'wav.scp'.
 
@@ -17,8 +50,12 @@ class SoundScpReader(collections.abc.Mapping):
         key2 /some/path/b.wav
         key3 /some/path/c.wav
         key4 /some/path/d.wav
+        key5 /some/path/data_wav.ark:16
         ...
 
+        The entry with "ark:offset" refers to the wav file packed in a Kaldi-ark,
+        e.g. created by format_wav_scp.py with "--archive true".
+
         >>> reader = SoundScpReader('wav.scp')
         >>> rate, array = reader['key1']
 
@@ -39,16 +76,11 @@ class SoundScpReader(collections.abc.Mapping):
         self.data = read_2column_text(fname)
 
     def __getitem__(self, key):
-        wav = self.data[key]
-        if self.normalize:
-            # soundfile.read normalizes data to [-1,1] if dtype is not given
-            array, rate = soundfile.read(wav, always_2d=self.always_2d)
-        else:
-            array, rate = soundfile.read(
-                wav, dtype=self.dtype, always_2d=self.always_2d
-            )
-
-        return rate, array
+        return read_sound(
+            self.data[key],
+            dtype=None if self.normalize else self.dtype,
+            always_2d=self.always_2d,
+        )
 
     def get_path(self, key):
         return self.data[key]
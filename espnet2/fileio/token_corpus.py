@@ -0,0 +1,115 @@
+from pathlib import Path
+from typing import Dict
+from typing import Optional
+from typing import Union
+
+import numpy as np
+from typeguard import check_argument_types
+import yaml
+
+
+class TokenCorpusWriter:
+    """Writer class for a flat token corpus.
+
+    The token-ids of all sentences are concatenated into a single binary file
+    and the start positions of the sentences are written into another one,
+    so no Python objects are needed for each sentence to read the corpus.
+
+    Examples:
+        some_dir/tokens.bin
+        some_dir/offsets.bin
+        some_dir/meta.yaml
+
+        >>> with TokenCorpusWriter('some_dir') as writer:
+        ...     writer.append(np.array([3, 4, 5]))
+        ...     writer.append(np.array([6, 7]))
+
+    """
+
+    dtype = np.dtype("<i4")
+    offset_dtype = np.dtype("<i8")
+
+    def __init__(self, outdir: Union[Path, str], meta: Optional[Dict] = None):
+        assert check_argument_types()
+        self.dir = Path(outdir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.ftokens = (self.dir / "tokens.bin").open("wb")
+        self.foffsets = (self.dir / "offsets.bin").open("wb")
+        with (self.dir / "meta.yaml").open("w", encoding="utf-8") as f:
+            yaml.safe_dump(meta if meta is not None else {}, f)
+        self.num_tokens = 0
+        self.foffsets.write(np.array([0], dtype=self.offset_dtype).tobytes())
+
+    def append(self, tokens: np.ndarray):
+        assert isinstance(tokens, np.ndarray) and tokens.ndim == 1, tokens
+        self.ftokens.write(tokens.astype(self.dtype).tobytes())
+        self.num_tokens += len(tokens)
+        self.foffsets.write(
+            np.array([self.num_tokens], dtype=self.offset_dtype).tobytes()
+        )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        self.ftokens.close()
+        self.foffsets.close()
+
+
+class TokenCorpusReader:
+    """Reader class for a flat token corpus.
+
+    Examples:
+        >>> reader = TokenCorpusReader('some_dir')
+        >>> len(reader)
+        2
+        >>> reader[1]
+        array([6, 7], dtype=int32)
+
+    """
+
+    def __init__(self, fname: Union[Path, str]):
+        assert check_argument_types()
+        self.dir = Path(fname)
+        meta_file = self.dir / "meta.yaml"
+        if meta_file.exists():
+            with meta_file.open("r", encoding="utf-8") as f:
+                self.meta = yaml.safe_load(f) or {}
+        else:
+            self.meta = {}
+        # offsets: (Nsentences + 1,)
+        self.offsets = np.fromfile(
+            self.dir / "offsets.bin", dtype=TokenCorpusWriter.offset_dtype
+        )
+        self._tokens = None
+
+    def __getstate__(self):
+        # Don't pickle the mapped region
+        state = self.__dict__.copy()
+        state["_tokens"] = None
+        return state
+
+    @property
+    def tokens(self) -> np.ndarray:
+        if self._tokens is None:
+            if self.offsets[-1] == 0:
+                # np.memmap can't map an empty file
+                self._tokens = np.zeros(0, dtype=TokenCorpusWriter.dtype)
+            else:
+                self._tokens = np.memmap(
+                    self.dir / "tokens.bin", dtype=TokenCorpusWriter.dtype, mode="r"
+                )
+        return self._tokens
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.offsets)
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        return self.tokens[self.offsets[index] : self.offsets[index + 1]]
+
+    def __len__(self):
+        return len(self.offsets) - 1
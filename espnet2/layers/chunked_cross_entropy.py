@@ -0,0 +1,107 @@
+from typing import Optional
+
+import torch
+import torch.nn.functional as F
+
+
+def _linear(hidden, weight, bias, dtype=None):
+    if dtype is not None:
+        hidden = hidden.to(dtype)
+        weight = weight.to(dtype)
+        bias = None if bias is None else bias.to(dtype)
+    logits = F.linear(hidden, weight, bias)
+    dtype = logits.dtype
+    if logits.dtype in (torch.float16, torch.bfloat16):
+        # Compute the softmax in float32 for the half precision
+        logits = logits.float()
+    return logits, dtype
+
+
+class ChunkedCrossEntropy(torch.autograd.Function):
+    """Cross entropy of the output layer computed in chunks.
+
+    The logits are computed for each chunk of the inputs
+    and are not kept for backward, but computed again,
+    so that the memory usage for (N, Vocab) logits is reduced to (chunk_size, Vocab).
+
+    F.linear in forward may run in half precision by autocast, e.g. --use_amp,
+    but autocast is disabled in backward, so the logits are recomputed
+    with the dtype used in forward.
+    """
+
+    @staticmethod
+    def forward(ctx, hidden, weight, bias, target, chunk_size):
+        nlls = []
+        lses = []
+        dtype = None
+        for start in range(0, hidden.size(0), chunk_size):
+            end = start + chunk_size
+            logits, dtype = _linear(hidden[start:end], weight, bias)
+            lse = torch.logsumexp(logits, dim=-1)
+            lses.append(lse)
+            nlls.append(lse - logits.gather(-1, target[start:end, None]).squeeze(-1))
+        nll = torch.cat(nlls)
+        lse = torch.cat(lses)
+        ctx.save_for_backward(hidden, weight, bias, target, lse)
+        ctx.chunk_size = chunk_size
+        ctx.dtype = dtype
+        return nll
+
+    @staticmethod
+    def backward(ctx, grad_nll):
+        hidden, weight, bias, target, lse = ctx.saved_tensors
+        grad_hidden = torch.zeros_like(hidden) if ctx.needs_input_grad[0] else None
+        grad_weight = torch.zeros_like(weight) if ctx.needs_input_grad[1] else None
+        grad_bias = (
+            torch.zeros_like(bias)
+            if bias is not None and ctx.needs_input_grad[2]
+            else None
+        )
+        for start in range(0, hidden.size(0), ctx.chunk_size):
+            end = start + ctx.chunk_size
+            h = hidden[start:end]
+            logits, _ = _linear(h, weight, bias, ctx.dtype)
+            # d nll / d logits = softmax - onehot(target)
+            grad_logits = (logits - lse[start:end, None]).exp_()
+            grad_logits.scatter_add_(
+                -1,
+                target[start:end, None],
+                grad_logits.new_full((grad_logits.size(0), 1), -1.0),
+            )
+            grad_logits.mul_(grad_nll[start:end, None])
+            if grad_bias is not None:
+                grad_bias += grad_logits.sum(0).to(bias.dtype)
+            grad_logits = grad_logits.to(ctx.dtype)
+
+            if grad_hidden is not None:
+                grad_hidden[start:end] = grad_logits @ weight.to(ctx.dtype)
+            if grad_weight is not None:
+                grad_weight += (grad_logits.t() @ h.to(ctx.dtype)).to(weight.dtype)
+        return grad_hidden, grad_weight, grad_bias, None, None
+
+
+def chunked_cross_entropy(
+    hidden: torch.Tensor,
+    weight: torch.Tensor,
+    bias: Optional[torch.Tensor],
+    target: torch.Tensor,
+    chunk_size: int,
+) -> torch.Tensor:
+    """Compute the cross entropy of the linear output layer in chunks.
+
+    Equivalent to F.cross_entropy(F.linear(hidden, weight, bias), target,
+    reduction="none"), but the peak memory for the logits is
+    (chunk_size, Vocab) instead of (N, Vocab).
+
+    Args:
+        hidden: (N, D)
+        weight: (Vocab, D)
+        bias: (Vocab,)
+        target: (N,)
+        chunk_size: The number of rows computed at once
+    Returns:
+        nll: (N,)
+    """
+    if hidden.size(0) == 0:
+        return hidden.new_zeros(0)
+    return ChunkedCrossEntropy.apply(hidden, weight, bias, target, chunk_size)
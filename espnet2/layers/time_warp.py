@@ -4,7 +4,6 @@ import torch
 
 from espnet.nets.pytorch_backend.nets_utils import pad_list
 
-
 if LooseVersion(torch.__version__) >= LooseVersion("1.1"):
     DEFAULT_TIME_WARP_MODE = "bicubic"
 else:
@@ -52,6 +51,116 @@ def time_warp(x: torch.Tensor, window: int = 80, mode: str = DEFAULT_TIME_WARP_M
     return x.view(*org_size)
 
 
+def _cubic_weights(t: torch.Tensor, a: float = -0.75) -> torch.Tensor:
+    # The same coefficients as the bicubic kernel of torch.interpolate
+    def conv1(x):
+        return ((a + 2) * x - (a + 3)) * x * x + 1
+
+    def conv2(x):
+        return ((a * x - 5 * a) * x + 8 * a) * x - 4 * a
+
+    return torch.stack([conv2(t + 1), conv1(t), conv1(1 - t), conv2(2 - t)], dim=-1)
+
+
+def _batch_time_warp(
+    x: torch.Tensor,
+    x_lengths: torch.Tensor,
+    center: torch.Tensor,
+    warped: torch.Tensor,
+    mode: str = DEFAULT_TIME_WARP_MODE,
+) -> torch.Tensor:
+    """Warp each sample with the given center and warped position at once.
+
+    This is equivalent to time_warp() applied to each sample
+    x[i, :x_lengths[i]] with center[i] and warped[i]:
+    the frames [0, center) are interpolated into [0, warped)
+    and [center, length) into [warped, length).
+
+    Args:
+        x: (Batch, Time, Freq)
+        x_lengths: (Batch,)
+        center: (Batch,)
+        warped: (Batch,)
+        mode: "bicubic" or "bilinear"
+    """
+    B, T = x.shape[:2]
+    j = torch.arange(T, device=x.device)[None].expand(B, T)
+    x_lengths = x_lengths.to(x.device)[:, None]
+    center = center.to(x.device)[:, None]
+    warped = warped.to(x.device)[:, None]
+
+    # The source segment and the scale for each output frame
+    is_left = j < warped
+    src_start = torch.where(is_left, torch.zeros_like(center), center)
+    src_end = torch.where(is_left, center, x_lengths)
+    dst_start = torch.where(is_left, torch.zeros_like(warped), warped)
+    dst_end = torch.where(is_left, warped, x_lengths)
+    scale = (src_end - src_start).to(x.dtype) / (dst_end - dst_start).clamp(min=1).to(
+        x.dtype
+    )
+
+    # The source coordinate relative to the segment (align_corners=False)
+    src = scale * ((j - dst_start).to(x.dtype) + 0.5) - 0.5
+    if mode == "bicubic":
+        index = src.floor()
+        weights = _cubic_weights(src - index)
+        offsets = torch.arange(-1, 3, device=x.device)
+    elif mode == "bilinear":
+        src = src.clamp(min=0)
+        index = src.floor()
+        t = (src - index)[..., None]
+        weights = torch.cat([1 - t, t], dim=-1)
+        offsets = torch.arange(0, 2, device=x.device)
+    else:
+        raise ValueError(f"Not supported: {mode}")
+
+    # taps: (Batch, Time, Ntap), clipped in the segment
+    taps = index.long()[..., None] + offsets
+    taps = torch.min(taps, (src_end - src_start - 1)[..., None]).clamp(min=0)
+    taps = taps + src_start[..., None]
+    # Flatten to select the rows of (Batch * Time, Freq)
+    taps = taps + (torch.arange(B, device=x.device) * T)[:, None, None]
+    taps = taps.view(B * T, -1)
+    weights = weights.to(x.dtype).view(B * T, -1)
+
+    flat_x = x.reshape(B * T, -1)
+    y = flat_x.index_select(0, taps[:, 0]) * weights[:, :1]
+    for k in range(1, taps.size(1)):
+        y = y + flat_x.index_select(0, taps[:, k]) * weights[:, k : k + 1]
+    y = y.view(B, T, -1)
+    return y.masked_fill((j >= x_lengths)[..., None], 0.0)
+
+
+def batch_time_warp(
+    x: torch.Tensor,
+    x_lengths: torch.Tensor,
+    window: int = 80,
+    mode: str = DEFAULT_TIME_WARP_MODE,
+):
+    """Time warping with the different random warping for each sample.
+
+    Args:
+        x: (Batch, Time, Freq)
+        x_lengths: (Batch,)
+        window: time warp parameter
+        mode: Interpolate mode
+    """
+    x_lengths = x_lengths.to(x.device)
+    # The samples shorter than 2 * window + 1 are not warped
+    do_warp = x_lengths - window > window
+    width = (x_lengths - 2 * window).clamp(min=1)
+    center = window + (torch.rand(x.size(0), device=x.device) * width).long()
+    warped = (
+        center
+        - window
+        + (torch.rand(x.size(0), device=x.device) * 2 * window).long()
+        + 1
+    )
+    center = torch.where(do_warp, center, x_lengths)
+    warped = torch.where(do_warp, warped, x_lengths)
+    return _batch_time_warp(x, x_lengths, center, warped, mode=mode)
+
+
 class TimeWarp(torch.nn.Module):
     """Time warping using torch.interpolate.
 
@@ -79,8 +188,11 @@ class TimeWarp(torch.nn.Module):
         if x_lengths is None or all(le == x_lengths[0] for le in x_lengths):
             # Note that applying same warping for each sample
             y = time_warp(x, window=self.window, mode=self.mode)
+        elif self.mode in ("bicubic", "bilinear"):
+            # Warping each sample respectively in a batch
+            y = batch_time_warp(x, x_lengths, window=self.window, mode=self.mode)
+            y = y[:, : int(x_lengths.max())]
         else:
-            # FIXME(kamo): I have no idea to batchify Timewarp
             ys = []
             for i in range(x.size(0)):
                 _y = time_warp(
@@ -1,5 +1,6 @@
 from abc import ABC
 from abc import abstractmethod
+from typing import Any
 from typing import Tuple
 
 import torch
@@ -27,3 +28,14 @@ class AbsLM(torch.nn.Module, BatchScorerInterface, ABC):
         self, input: torch.Tensor, hidden: torch.Tensor
     ) -> Tuple[torch.Tensor, torch.Tensor]:
         raise NotImplementedError
+
+    def encode(self, input: torch.Tensor, hidden: Any) -> Tuple[torch.Tensor, Any]:
+        """Return the hidden states before the output layer.
+
+        forward() is equivalent to applying output_layer() to the hidden states.
+        This is used to compute the loss without the logits of the whole sequence.
+        """
+        raise NotImplementedError
+
+    def output_layer(self) -> torch.nn.Linear:
+        raise NotImplementedError
@@ -0,0 +1,101 @@
+from typing import List
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+from espnet2.lm.abs_model import AbsLM
+
+
+def find_prefix_carriers(seqs: Sequence[Tuple[int, ...]]) -> List[int]:
+    """Find the longest sequence having each sequence as a prefix.
+
+    If a sequence is a prefix of another one, e.g. "a b" and "a b c",
+    the LM scores of the shorter one are obtained from the longer one,
+    so only the returned carriers need to be forwarded.
+
+    Returns:
+        The index of the carrier for each sequence
+
+    Examples:
+        >>> find_prefix_carriers([(1, 2), (1, 2, 3), (4,), (1, 2)])
+        [1, 1, 2, 1]
+    """
+    # If A is a prefix of some sequence,
+    # A is also a prefix of its successor in the lexicographic order.
+    order = sorted(range(len(seqs)), key=lambda i: seqs[i])
+    carriers = [0] * len(seqs)
+    next_index = None
+    for i in reversed(order):
+        if next_index is not None and seqs[next_index][: len(seqs[i])] == seqs[i]:
+            carriers[i] = carriers[next_index]
+        else:
+            carriers[i] = i
+        next_index = i
+    return carriers
+
+
+@torch.no_grad()
+def batch_lm_score(
+    lm: AbsLM,
+    seqs: Sequence[Sequence[int]],
+    sos_eos: int,
+    batch_bins: int,
+    device: str = "cpu",
+) -> np.ndarray:
+    """Compute the log-probabilities of the token sequences with the LM.
+
+    The sequences which are the same or prefixes of another sequence
+    share the LM forward, and the others are sorted by the length
+    and forwarded as padded mini-batches of batch_bins tokens at most.
+
+    Args:
+        lm: The LM, which returns (Batch, Length, NVocab) logits
+        seqs: The token-ids not including <sos> and <eos>
+        sos_eos: The id of <sos/eos>
+        batch_bins: The maximum number of tokens in a mini-batch
+    Returns:
+        (Nseqs,) log P(seq <eos>)
+    """
+    seqs = [tuple(s) for s in seqs]
+    carriers = find_prefix_carriers(seqs)
+    unique = sorted(set(carriers), key=lambda i: -len(seqs[i]))
+
+    # cum_logps[i]: (Length + 1,) log P(seq[:k]) for each k
+    # eos_logps[i]: (Length + 1,) log P(<eos> | seq[:k]) for each k
+    cum_logps = {}
+    eos_logps = {}
+    start = 0
+    while start < len(unique):
+        # Sorted in descending order, so the first one has the max length
+        max_length = len(seqs[unique[start]]) + 1
+        bs = max(batch_bins // max_length, 1)
+        indices = unique[start : start + bs]
+        start += bs
+
+        x = torch.zeros((len(indices), max_length), dtype=torch.long)
+        x[:, 0] = sos_eos
+        for b, i in enumerate(indices):
+            x[b, 1 : len(seqs[i]) + 1] = torch.tensor(seqs[i], dtype=torch.long)
+        x = x.to(device)
+
+        # logits: (B, Length + 1, NVocab)
+        logits, _ = lm(x, None)
+        logits = logits.float()
+        lse = torch.logsumexp(logits, dim=-1)
+        # The token at the next position is the target: (B, Length)
+        token_logps = logits[:, :-1].gather(-1, x[:, 1:, None]).squeeze(-1)
+        token_logps = token_logps - lse[:, :-1]
+        # cum: (B, Length + 1), starting from log P(empty) = 0
+        cum = torch.cumsum(F.pad(token_logps, [1, 0]), dim=1).cpu().numpy()
+        eos = (logits[..., sos_eos] - lse).cpu().numpy()
+        for b, i in enumerate(indices):
+            cum_logps[i] = cum[b]
+            eos_logps[i] = eos[b]
+
+    return np.array(
+        [cum_logps[c][len(s)] + eos_logps[c][len(s)] for s, c in zip(seqs, carriers)],
+        dtype=np.float64,
+    )
@@ -6,13 +6,28 @@ import torch.nn.functional as F
 from typeguard import check_argument_types
 
 from espnet.nets.pytorch_backend.nets_utils import make_pad_mask
+from espnet2.layers.chunked_cross_entropy import chunked_cross_entropy
 from espnet2.lm.abs_model import AbsLM
 from espnet2.torch_utils.device_funcs import force_gatherable
 from espnet2.train.abs_espnet_model import AbsESPnetModel
 
 
 class ESPnetLanguageModel(AbsESPnetModel):
-    def __init__(self, lm: AbsLM, vocab_size: int, ignore_id: int = 0):
+    def __init__(
+        self,
+        lm: AbsLM,
+        vocab_size: int,
+        ignore_id: int = 0,
+        nll_chunk_size: int = 0,
+    ):
+        """Initialize ESPnetLanguageModel.
+
+        Args:
+            nll_chunk_size: If positive, the output layer and the cross entropy
+                are computed for this number of tokens at once,
+                and recomputed in backward instead of keeping the logits.
+                This reduces the peak memory for large vocabularies.
+        """
         assert check_argument_types()
         super().__init__()
         self.lm = lm
@@ -21,6 +36,7 @@ class ESPnetLanguageModel(AbsESPnetModel):
 
         # ignore_id may be assumed as 0, shared with CTC-blank symbol for ASR.
         self.ignore_id = ignore_id
+        self.nll_chunk_size = nll_chunk_size
 
     def nll(
         self, text: torch.Tensor, text_lengths: torch.Tensor
@@ -33,10 +49,12 @@ class ESPnetLanguageModel(AbsESPnetModel):
         # text: (Batch, Length) -> x, y: (Batch, Length + 1)
         x = F.pad(text, [1, 0], "constant", self.eos)
         t = F.pad(text, [0, 1], "constant", self.ignore_id)
-        for i, l in enumerate(text_lengths):
-            t[i, l] = self.sos
+        t[torch.arange(batch_size, device=t.device), text_lengths] = self.sos
         x_lengths = text_lengths + 1
 
+        if self.nll_chunk_size > 0:
+            return self._chunked_nll(x, t, x_lengths), x_lengths
+
         # 2. Forward Language model
         # x: (Batch, Length) -> y: (Batch, Length, NVocab)
         y, _ = self.lm(x, None)
@@ -50,6 +68,25 @@ class ESPnetLanguageModel(AbsESPnetModel):
         nll = nll.view(batch_size, -1)
         return nll, x_lengths
 
+    def _chunked_nll(
+        self, x: torch.Tensor, t: torch.Tensor, x_lengths: torch.Tensor
+    ) -> torch.Tensor:
+        # h: (Batch, Length, Dim)
+        h, _ = self.lm.encode(x, None)
+        # Drop the padded positions before the output layer
+        mask = ~make_pad_mask(x_lengths).to(h.device)
+        output_layer = self.lm.output_layer()
+        # nll: (Ntokens,)
+        nll = chunked_cross_entropy(
+            h[mask],
+            output_layer.weight,
+            output_layer.bias,
+            t[mask],
+            self.nll_chunk_size,
+        )
+        # nll: (Ntokens,) -> (B, L)
+        return nll.new_zeros(t.shape).masked_scatter(mask, nll)
+
     def forward(
         self, text: torch.Tensor, text_lengths: torch.Tensor
     ) -> Tuple[torch.Tensor, Dict[str, torch.Tensor], torch.Tensor]:
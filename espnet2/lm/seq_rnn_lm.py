@@ -82,9 +82,7 @@ class SequentialRNNLM(AbsLM):
     def forward(
         self, input: torch.Tensor, hidden: torch.Tensor
     ) -> Tuple[torch.Tensor, torch.Tensor]:
-        emb = self.drop(self.encoder(input))
-        output, hidden = self.rnn(emb, hidden)
-        output = self.drop(output)
+        output, hidden = self.encode(input, hidden)
         decoded = self.decoder(
             output.contiguous().view(output.size(0) * output.size(1), output.size(2))
         )
@@ -93,6 +91,17 @@ class SequentialRNNLM(AbsLM):
             hidden,
         )
 
+    def encode(
+        self, input: torch.Tensor, hidden: torch.Tensor
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        emb = self.drop(self.encoder(input))
+        output, hidden = self.rnn(emb, hidden)
+        output = self.drop(output)
+        return output, hidden
+
+    def output_layer(self) -> nn.Linear:
+        return self.decoder
+
     def score(
         self,
         y: torch.Tensor,
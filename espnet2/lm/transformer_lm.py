@@ -60,11 +60,48 @@ class TransformerLM(AbsLM):
             hidden (torch.Tensor): Target ids. (batch, len)
 
         """
+        h, _ = self.encode(input, hidden)
+        y = self.decoder(h)
+        return y, None
+
+    def encode(self, input: torch.Tensor, hidden: None) -> Tuple[torch.Tensor, None]:
         x = self.embed(input)
         mask = self._target_mask(input)
         h, _ = self.encoder(x, mask)
-        y = self.decoder(h)
-        return y, None
+        return h, None
+
+    def output_layer(self) -> nn.Linear:
+        return self.decoder
+
+    def _embed_step(self, ys: torch.Tensor, offset: int) -> torch.Tensor:
+        """Embed the tokens placed from the position "offset"."""
+        x = self.embed(ys)
+        for m in self.encoder.embed:
+            if isinstance(m, PositionalEncoding):
+                m.extend_pe(x.new_empty(1, offset + x.size(1)))
+                x = m.dropout(x * m.xscale + m.pe[:, offset : offset + x.size(1)])
+            else:
+                x = m(x)
+        return x
+
+    def _merge_states(
+        self, states: List[Tuple[List[Tuple[torch.Tensor, torch.Tensor]], int]]
+    ) -> List[Tuple[torch.Tensor, torch.Tensor]]:
+        """Merge the states of the hypotheses into a batched key-value cache."""
+        cache, _ = states[0]
+        if all(c is cache for c, _ in states):
+            # The hypotheses in a beam share the same batched cache,
+            # so the beam is reordered by an index_select for each layer
+            index = torch.tensor([i for _, i in states], device=cache[0][0].device)
+            return [
+                (k.index_select(0, index), v.index_select(0, index)) for k, v in cache
+            ]
+        return [
+            tuple(
+                torch.cat([c[layer][j][i : i + 1] for c, i in states]) for j in range(2)
+            )
+            for layer in range(len(cache))
+        ]
 
     def score(
         self, y: torch.Tensor, state: Any, x: torch.Tensor
@@ -82,19 +119,17 @@ class TransformerLM(AbsLM):
                 and next state for ys
 
         """
-        y = y.unsqueeze(0)
-        h, _, cache = self.encoder.forward_one_step(
-            self.embed(y), self._target_mask(y), cache=state
-        )
-        h = self.decoder(h[:, -1])
-        logp = h.log_softmax(dim=-1).squeeze(0)
-        return logp, cache
+        logp, states = self.batch_score(y.unsqueeze(0), [state], x)
+        return logp.squeeze(0), states[0]
 
     def batch_score(
         self, ys: torch.Tensor, states: List[Any], xs: torch.Tensor
     ) -> Tuple[torch.Tensor, List[Any]]:
         """Score new token batch.
 
+        The state of each hypothesis is a pair of the key-value cache
+        of all layers for the batch and the index of the hypothesis in it.
+
         Args:
             ys (torch.Tensor): torch.int64 prefix tokens (n_batch, ylen).
             states (List[Any]): Scorer states for prefix tokens.
@@ -107,25 +142,22 @@ class TransformerLM(AbsLM):
                 and next state list for ys.
 
         """
-        # merge states
-        n_batch = len(ys)
-        n_layers = len(self.encoder.encoders)
         if states[0] is None:
-            batch_state = None
+            cache = [None] * len(self.encoder.encoders)
+            offset = 0
         else:
-            # transpose state of [batch, layer] into [layer, batch]
-            batch_state = [
-                torch.stack([states[b][i] for b in range(n_batch)])
-                for i in range(n_layers)
-            ]
-
-        # batch decoding
-        h, _, states = self.encoder.forward_one_step(
-            self.embed(ys), self._target_mask(ys), cache=batch_state
-        )
+            cache = self._merge_states(states)
+            offset = cache[0][0].size(2)
+
+        # Compute the new tokens only
+        h = self._embed_step(ys[:, offset:], offset)
+        mask = self._target_mask(ys)[:, offset:]
+        new_cache = []
+        for layer, c in zip(self.encoder.encoders, cache):
+            h, _, c = layer.forward_kv_cache(h, mask, c)
+            new_cache.append(c)
+        if self.encoder.normalize_before:
+            h = self.encoder.after_norm(h)
         h = self.decoder(h[:, -1])
         logp = h.log_softmax(dim=-1)
-
-        # transpose state of [layer, batch] into [batch, layer]
-        state_list = [[states[i][b] for i in range(n_layers)] for b in range(n_batch)]
-        return logp, state_list
+        return logp, [(new_cache, b) for b in range(len(ys))]
@@ -1,5 +1,11 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import inspect
 import logging
 from pathlib import Path
+from typing import Dict
+from typing import Iterable
+from typing import Iterator
 from typing import Sequence
 from typing import Union
 import warnings
@@ -11,6 +17,79 @@ from typing import Collection
 from espnet2.train.reporter import Reporter
 
 
+def _load_state_dict(path: Union[Path, str]) -> Dict[str, torch.Tensor]:
+    """Load the state dict with memory-mapping the checkpoint file if possible.
+
+    The tensors are paged in from the file when they are accessed,
+    so a checkpoint is never fully read into memory at once.
+    """
+    if "mmap" in inspect.signature(torch.load).parameters:
+        try:
+            return torch.load(path, map_location="cpu", mmap=True)
+        except RuntimeError:
+            # The legacy (non-zipfile) format can't be memory-mapped
+            pass
+    return torch.load(path, map_location="cpu")
+
+
+def _iter_state_dicts(
+    paths: Iterable[Union[Path, str]], num_workers: int = 2
+) -> Iterator[Dict[str, torch.Tensor]]:
+    """Load the state dicts in background threads in the given order.
+
+    At most "num_workers" state dicts are loaded ahead.
+    """
+    paths = iter(paths)
+    with ThreadPoolExecutor(max(num_workers, 1)) as executor:
+        futures = deque(
+            executor.submit(_load_state_dict, p)
+            for _, p in zip(range(max(num_workers, 1)), paths)
+        )
+        while len(futures) > 0:
+            states = futures.popleft().result()
+            p = next(paths, None)
+            if p is not None:
+                futures.append(executor.submit(_load_state_dict, p))
+            yield states
+
+
+def _accumulate_state_dict(
+    total: Dict[str, torch.Tensor], states: Dict[str, torch.Tensor]
+) -> Dict[str, torch.Tensor]:
+    """Add the state dict to the total in-place.
+
+    Floating point values are accumulated in float64.
+    """
+    if total is None:
+        return {
+            k: v.to(torch.float64 if v.is_floating_point() else v.dtype, copy=True)
+            for k, v in states.items()
+        }
+    for k in total:
+        total[k] += states[k]
+    return total
+
+
+def _divide_state_dict(
+    total: Dict[str, torch.Tensor],
+    n: int,
+    dtypes: Dict[str, torch.dtype],
+) -> Dict[str, torch.Tensor]:
+    """Derive the averaged state dict from the accumulated one."""
+    avg = {}
+    for k, v in total.items():
+        if v.is_floating_point():
+            avg[k] = (v / n).to(dtypes[k])
+        else:
+            # For int type, not averaged, but only accumulated.
+            # e.g. BatchNorm.num_batches_tracked
+            # (If there are any cases that requires averaging
+            #  or the other reducing method, e.g. max/min, for integer type,
+            #  please report.)
+            avg[k] = v.clone()
+    return avg
+
+
 @torch.no_grad()
 def average_nbest_models(
     output_dir: Path,
@@ -42,13 +121,15 @@ def average_nbest_models(
         if reporter.has(ph, k)
     ]
 
-    _loaded = {}
+    # The averaged models which are already saved: {epochs: path}
+    _saved = {}
     for ph, cr, epoch_and_values in nbest_epochs:
         _nbests = [i for i in nbests if i <= len(epoch_and_values)]
         if len(_nbests) == 0:
             _nbests = [1]
 
-        for n in _nbests:
+        _averaging = []
+        for n in sorted(set(_nbests)):
             if n == 0:
                 continue
             elif n == 1:
@@ -59,41 +140,45 @@ def average_nbest_models(
                 if sym_op.is_symlink() or sym_op.exists():
                     sym_op.unlink()
                 sym_op.symlink_to(op.name)
+                continue
+
+            op = output_dir / f"{ph}.{cr}.ave_{n}best.pth"
+            if op.is_symlink():
+                op.unlink()
+            epochs = frozenset(e for e, _ in epoch_and_values[:n])
+            if epochs in _saved:
+                # The same set of models was averaged for another criterion
+                if _saved[epochs] != op:
+                    logging.info(f"Reusing {_saved[epochs]} for {op}")
+                    if op.exists():
+                        op.unlink()
+                    op.symlink_to(_saved[epochs].name)
             else:
-                op = output_dir / f"{ph}.{cr}.ave_{n}best.pth"
-                logging.info(
-                    f"Averaging {n}best models: " f'criterion="{ph}.{cr}": {op}'
-                )
-
-                avg = None
-                # 2.a. Averaging model
-                for e, _ in epoch_and_values[:n]:
-                    if e not in _loaded:
-                        _loaded[e] = torch.load(
-                            output_dir / f"{e}epoch.pth",
-                            map_location="cpu",
-                        )
-                    states = _loaded[e]
-
-                    if avg is None:
-                        avg = states
-                    else:
-                        # Accumulated
-                        for k in avg:
-                            avg[k] += states[k]
-                for k in avg:
-                    if str(avg[k].dtype).startswith("torch.int"):
-                        # For int type, not averaged, but only accumulated.
-                        # e.g. BatchNorm.num_batches_tracked
-                        # (If there are any cases that requires averaging
-                        #  or the other reducing method, e.g. max/min, for integer type,
-                        #  please report.)
-                        pass
-                    else:
-                        avg[k] /= n
-
-                # 2.b. Save the ave model and create a symlink
-                torch.save(avg, op)
+                _averaging.append((n, op))
+                _saved[epochs] = op
+
+        if len(_averaging) > 0:
+            # 2.a. Averaging model
+            # Each n-best set is a prefix of the sorted epochs,
+            # so the sum is shared among the n-best sets.
+            total = None
+            dtypes = None
+            paths = [
+                output_dir / f"{e}epoch.pth"
+                for e, _ in epoch_and_values[: _averaging[-1][0]]
+            ]
+            for i, states in enumerate(_iter_state_dicts(paths), 1):
+                if dtypes is None:
+                    dtypes = {k: v.dtype for k, v in states.items()}
+                total = _accumulate_state_dict(total, states)
+                del states
+                if len(_averaging) > 0 and i == _averaging[0][0]:
+                    n, op = _averaging.pop(0)
+                    logging.info(
+                        f"Averaging {n}best models: " f'criterion="{ph}.{cr}": {op}'
+                    )
+                    # 2.b. Save the ave model
+                    torch.save(_divide_state_dict(total, n, dtypes), op)
 
         # 3. *.*.ave.pth is a symlink to the max ave model
         op = output_dir / f"{ph}.{cr}.ave_{max(_nbests)}best.pth"
@@ -1,6 +1,7 @@
 from collections import defaultdict
 import logging
 from pathlib import Path
+from typing import Any
 from typing import Dict
 from typing import Iterable
 from typing import List
@@ -14,6 +15,7 @@ from torch.utils.data import DataLoader
 from typeguard import check_argument_types
 
 from espnet2.fileio.datadir_writer import DatadirWriter
+from espnet2.fileio.mmap_store import MmapStoreWriter
 from espnet2.fileio.npy_scp import NpyScpWriter
 from espnet2.torch_utils.device_funcs import to_device
 from espnet2.torch_utils.forward_adaptor import ForwardAdaptor
@@ -29,6 +31,8 @@ def collect_stats(
     ngpu: Optional[int],
     log_interval: Optional[int],
     write_collected_feats: bool,
+    collected_feats_format: str = "npy",
+    collected_feats_meta: Dict[str, Any] = None,
 ) -> None:
     """Perform on collect_stats mode.
 
@@ -38,8 +42,10 @@ def collect_stats(
 
     """
     assert check_argument_types()
+    if collected_feats_format not in ("npy", "mmap"):
+        raise ValueError(f"Not supported: {collected_feats_format}")
 
-    npy_scp_writers = {}
+    feats_writers = {}
     for itr, mode in zip([train_iter, valid_iter], ["train", "valid"]):
         if log_interval is None:
             try:
@@ -97,14 +103,19 @@ def collect_stats(
 
                         # 4. [Option] Write derived features as npy format file.
                         if write_collected_feats:
-                            # Instantiate NpyScpWriter for the first iteration
-                            if (key, mode) not in npy_scp_writers:
+                            # Instantiate the writer for the first iteration
+                            if (key, mode) not in feats_writers:
                                 p = output_dir / mode / "collect_feats"
-                                npy_scp_writers[(key, mode)] = NpyScpWriter(
-                                    p / f"data_{key}", p / f"{key}.scp"
-                                )
-                            # Save array as npy file
-                            npy_scp_writers[(key, mode)][uttid] = seq
+                                if collected_feats_format == "mmap":
+                                    feats_writers[(key, mode)] = MmapStoreWriter(
+                                        p / key, meta=collected_feats_meta
+                                    )
+                                else:
+                                    feats_writers[(key, mode)] = NpyScpWriter(
+                                        p / f"data_{key}", p / f"{key}.scp"
+                                    )
+                            # Save array as npy file or into the mmap store
+                            feats_writers[(key, mode)][uttid] = seq
 
                 if iiter % log_interval == 0:
                     logging.info(f"Niter: {iiter}")
@@ -124,3 +135,6 @@ def collect_stats(
             )
         with (output_dir / mode / "stats_keys").open("w", encoding="utf-8") as f:
             f.write("\n".join(sum_dict) + "\n")
+
+    for writer in feats_writers.values():
+        writer.close()
@@ -0,0 +1,112 @@
+import hashlib
+import logging
+from pathlib import Path
+import shutil
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Sequence
+from typing import Tuple
+
+import numpy as np
+from typeguard import check_argument_types
+import yaml
+
+from espnet.utils.forked_imap import forked_imap
+from espnet2.fileio.mmap_store import MmapStoreReader
+from espnet2.fileio.mmap_store import MmapStoreWriter
+from espnet2.fileio.read_text import read_2column_text
+
+
+def get_file_hash(path: str) -> str:
+    md5 = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def get_tokenizer_hash(config: Dict[str, Any]) -> str:
+    """Return the hash value of the tokenization configuration.
+
+    The file paths in the values, e.g. token_list and bpemodel,
+    are replaced with the hash values of their contents.
+    """
+    conf = {}
+    for k, v in config.items():
+        if isinstance(v, (str, Path)) and Path(v).is_file():
+            v = get_file_hash(str(v))
+        elif isinstance(v, Path):
+            v = str(v)
+        elif isinstance(v, tuple):
+            v = list(v)
+        conf[k] = v
+    s = yaml.safe_dump(conf, sort_keys=True)
+    return hashlib.md5(s.encode("utf-8")).hexdigest()
+
+
+def pretokenize_text(
+    tokenize: Callable[[str], np.ndarray],
+    path_name_type_list: Sequence[Tuple[str, str, str]],
+    text_names: Sequence[str],
+    output_dir: Path,
+    tokenizer_hash: str,
+    nj: int = 1,
+    chunk_size: int = 1000,
+) -> List[Tuple[str, str, str]]:
+    """Tokenize the "text" type data once and write the ids as "mmap" stores.
+
+    The token ids are stored as int32 arrays and the data is replaced
+    with the "mmap" type, so the preprocessor doesn't need to clean and tokenize
+    the text in every epoch. The existing store is reused only if
+    the source file and the tokenizer_hash are not changed.
+
+    Returns:
+        The new list of (path, name, type).
+
+    """
+    assert check_argument_types()
+    retval = []
+    for path, name, _type in path_name_type_list:
+        if _type != "text" or name not in text_names:
+            retval.append((path, name, _type))
+            continue
+
+        stat = Path(path).stat()
+        meta = dict(
+            source=str(Path(path).resolve()),
+            source_size=stat.st_size,
+            source_mtime=stat.st_mtime_ns,
+            tokenizer_hash=tokenizer_hash,
+        )
+        store_dir = Path(output_dir) / name
+        if (store_dir / "index").exists() and MmapStoreReader(store_dir).meta == meta:
+            logging.info(f"Reuse the pretokenized text: {store_dir}")
+            retval.append((str(store_dir), name, "mmap"))
+            continue
+
+        logging.info(f"Pretokenizing {path} into {store_dir} with {nj} jobs")
+        text = read_2column_text(path)
+        items = list(text.items())
+        chunks = [items[i : i + chunk_size] for i in range(0, len(items), chunk_size)]
+
+        def tokenize_chunk(chunk):
+            return [(k, tokenize(v)) for k, v in chunk]
+
+        # Write to the temporary directory and rename it at the end
+        # not to leave the broken store if interrupted.
+        tmp_dir = store_dir.parent / f".{name}.tmp"
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        with MmapStoreWriter(tmp_dir, meta=meta) as writer:
+            # The tokenizer is inherited by the forked workers,
+            # so it isn't pickled for each chunk.
+            for outputs in forked_imap(tokenize_chunk, chunks, nj):
+                for k, v in outputs:
+                    writer[k] = v.astype(np.int32)
+        if store_dir.exists():
+            shutil.rmtree(store_dir)
+        tmp_dir.rename(store_dir)
+        retval.append((str(store_dir), name, "mmap"))
+    return retval
@@ -7,6 +7,7 @@ from typeguard import check_argument_types
 from typeguard import check_return_type
 
 from espnet2.samplers.abs_sampler import AbsSampler
+from espnet2.samplers.cost_batch_sampler import CostBatchSampler
 from espnet2.samplers.folded_batch_sampler import FoldedBatchSampler
 from espnet2.samplers.length_batch_sampler import LengthBatchSampler
 from espnet2.samplers.num_elements_batch_sampler import NumElementsBatchSampler
@@ -71,6 +72,17 @@ BATCH_TYPES = dict(
     "    utterance_id_a 1000,80\n"
     "    utterance_id_b 1453,80\n"
     "    utterance_id_c 1241,80\n",
+    cost="CostBatchSampler supports variable batch_size. "
+    "Just like LengthBatchSampler, this sampler makes mini-batches"
+    " of the samples having close lengths, but the 'bins' are counted "
+    "by a cost model having the quadratic term of the padded length L: "
+    "batch_size x (L + cost_quadratic x L^2), "
+    "so that each mini-batch takes close step time and memory "
+    "even if the cost of the model grows quadratically with the length, "
+    "e.g. Transformer. "
+    "cost_quadratic can be calibrated by fit_quadratic_cost() "
+    "in espnet2/samplers/cost_batch_sampler.py with the measured costs. "
+    "This samples requires length information as same as LengthBatchSampler\n",
 )
 
 
@@ -85,13 +97,15 @@ def build_batch_sampler(
     min_batch_size: int = 1,
     fold_lengths: Sequence[int] = (),
     padding: bool = True,
+    cost_quadratic: float = 0.0,
 ) -> AbsSampler:
     """Helper function to instantiate BatchSampler.
 
     Args:
-        type: mini-batch type. "unsorted", "sorted", "folded", "numel", or, "length"
+        type: mini-batch type. "unsorted", "sorted", "folded", "numel", "length",
+            or "cost"
         batch_size: The mini-batch size. Used for "unsorted", "sorted", "folded" mode
-        batch_bins: Used for "numel" model
+        batch_bins: Used for "numel", "length", or "cost" mode
         shape_files: Text files describing the length and dimension
             of each features. e.g. uttA 1330,80
         sort_in_batch:
@@ -101,6 +115,8 @@ def build_batch_sampler(
         fold_lengths: Used for "folded" mode
         padding: Whether sequences are input as a padded tensor or not.
             used for "numel" mode
+        cost_quadratic: The coefficient of the quadratic term in the cost model.
+            Used for "cost" mode
     """
     assert check_argument_types()
     if len(shape_files) == 0:
@@ -159,6 +175,17 @@ def build_batch_sampler(
             min_batch_size=min_batch_size,
         )
 
+    elif type == "cost":
+        retval = CostBatchSampler(
+            batch_bins=batch_bins,
+            shape_files=shape_files,
+            cost_quadratic=cost_quadratic,
+            sort_in_batch=sort_in_batch,
+            sort_batch=sort_batch,
+            drop_last=drop_last,
+            min_batch_size=min_batch_size,
+        )
+
     else:
         raise ValueError(f"Not supported: {type}")
     assert check_return_type(retval)
@@ -0,0 +1,171 @@
+from typing import Iterator
+from typing import List
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+import numpy as np
+from typeguard import check_argument_types
+
+from espnet2.fileio.read_text import load_num_sequence_text
+from espnet2.samplers.abs_sampler import AbsSampler
+
+
+def fit_quadratic_cost(
+    batch_sizes: Sequence[int],
+    lengths: Sequence[int],
+    costs: Sequence[float],
+) -> float:
+    """Fit the cost model to the measured costs and return "cost_quadratic".
+
+    The cost of a padded mini-batch is modeled as
+
+        cost = c0 + c1 * batch_size * L + c2 * batch_size * L^2
+
+    and the ratio c2 / c1 is returned. The costs are e.g. the step time
+    or the peak memory measured by a short profiling run
+    with several batch sizes and lengths.
+
+    Examples:
+        >>> fit_quadratic_cost([32, 16, 8], [100, 200, 400], [0.11, 0.13, 0.17])
+    """
+    assert check_argument_types()
+    bs = np.asarray(batch_sizes, dtype=np.float64)
+    lg = np.asarray(lengths, dtype=np.float64)
+    x = np.stack([np.ones_like(bs), bs * lg, bs * lg**2], axis=1)
+    (_, c1, c2), *_ = np.linalg.lstsq(
+        x, np.asarray(costs, dtype=np.float64), rcond=None
+    )
+    if c1 <= 0:
+        raise RuntimeError(f"The linear term must be positive: {c1}")
+    return max(float(c2 / c1), 0.0)
+
+
+class CostBatchSampler(AbsSampler):
+    """BatchSampler to make the mini-batches having the same cost.
+
+    The samples are sorted by the length, so that each mini-batch is
+    a bucket of the samples having close lengths,
+    and the mini-batch is filled until the cost reaches batch_bins.
+    The cost is computed with the padded length L of each feature as
+
+        cost = batch_size * sum_{features} (L + cost_quadratic * L^2)
+
+    considering that the cost of self-attention grows quadratically with L.
+    If cost_quadratic is 0, the cost is the same as "length" type with padding.
+    cost_quadratic can be derived by fit_quadratic_cost().
+    """
+
+    def __init__(
+        self,
+        batch_bins: int,
+        shape_files: Union[Tuple[str, ...], List[str]],
+        cost_quadratic: float = 0.0,
+        min_batch_size: int = 1,
+        sort_in_batch: str = "descending",
+        sort_batch: str = "ascending",
+        drop_last: bool = False,
+    ):
+        assert check_argument_types()
+        assert batch_bins > 0
+        assert cost_quadratic >= 0
+        if sort_batch != "ascending" and sort_batch != "descending":
+            raise ValueError(
+                f"sort_batch must be ascending or descending: {sort_batch}"
+            )
+        if sort_in_batch != "descending" and sort_in_batch != "ascending":
+            raise ValueError(
+                f"sort_in_batch must be ascending or descending: {sort_in_batch}"
+            )
+
+        self.batch_bins = batch_bins
+        self.shape_files = shape_files
+        self.cost_quadratic = cost_quadratic
+        self.sort_in_batch = sort_in_batch
+        self.sort_batch = sort_batch
+        self.drop_last = drop_last
+
+        # utt2shape: (Length, ...)
+        #    uttA 100,...
+        #    uttB 201,...
+        utt2shapes = [
+            load_num_sequence_text(s, loader_type="csv_int") for s in shape_files
+        ]
+
+        first_utt2shape = utt2shapes[0]
+        for s, d in zip(shape_files, utt2shapes):
+            if set(d) != set(first_utt2shape):
+                raise RuntimeError(
+                    f"keys are mismatched between {s} != {shape_files[0]}"
+                )
+
+        # Sort samples in ascending order
+        # (shape order should be like (Length, Dim))
+        keys = sorted(first_utt2shape, key=lambda k: first_utt2shape[k][0])
+        if len(keys) == 0:
+            raise RuntimeError(f"0 lines found: {shape_files[0]}")
+
+        # lengths: (N, Nfeats)
+        lengths = np.array(
+            [[d[k][0] for d in utt2shapes] for k in keys], dtype=np.float64
+        )
+
+        # Decide batch-sizes
+        batch_sizes = []
+        bs = 0
+        max_lengths = np.zeros(len(utt2shapes))
+        for lg in lengths:
+            new_max_lengths = np.maximum(max_lengths, lg)
+            cost = (bs + 1) * self._cost(new_max_lengths)
+            if cost > batch_bins and bs >= min_batch_size:
+                batch_sizes.append(bs)
+                bs = 1
+                max_lengths = lg
+            else:
+                bs += 1
+                max_lengths = new_max_lengths
+        if not self.drop_last or len(batch_sizes) == 0:
+            batch_sizes.append(bs)
+
+        # If the last batch-size is smaller than minimum batch_size,
+        # the samples are redistributed to the other mini-batches
+        if len(batch_sizes) > 1 and batch_sizes[-1] < min_batch_size:
+            for i in range(batch_sizes.pop(-1)):
+                batch_sizes[-(i % len(batch_sizes)) - 1] += 1
+
+        if not self.drop_last:
+            # Bug check
+            assert sum(batch_sizes) == len(keys), f"{sum(batch_sizes)} != {len(keys)}"
+
+        # Set mini-batch
+        self.batch_list = []
+        start = 0
+        for bs in batch_sizes:
+            assert len(keys) >= start + bs, "Bug"
+            minibatch_keys = keys[start : start + bs]
+            start += bs
+            if sort_in_batch == "descending":
+                minibatch_keys.reverse()
+            self.batch_list.append(tuple(minibatch_keys))
+
+        if sort_batch == "descending":
+            self.batch_list.reverse()
+
+    def _cost(self, max_lengths: np.ndarray) -> float:
+        return float((max_lengths + self.cost_quadratic * max_lengths**2).sum())
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}("
+            f"N-batch={len(self)}, "
+            f"batch_bins={self.batch_bins}, "
+            f"cost_quadratic={self.cost_quadratic}, "
+            f"sort_in_batch={self.sort_in_batch}, "
+            f"sort_batch={self.sort_batch})"
+        )
+
+    def __len__(self):
+        return len(self.batch_list)
+
+    def __iter__(self) -> Iterator[Tuple[str, ...]]:
+        return iter(self.batch_list)
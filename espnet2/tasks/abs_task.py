@@ -36,6 +36,8 @@ from espnet2.iterators.multiple_iter_factory import MultipleIterFactory
 from espnet2.iterators.sequence_iter_factory import SequenceIterFactory
 from espnet2.main_funcs.average_nbest_models import average_nbest_models
 from espnet2.main_funcs.collect_stats import collect_stats
+from espnet2.main_funcs.pretokenize_text import get_tokenizer_hash
+from espnet2.main_funcs.pretokenize_text import pretokenize_text
 from espnet2.optimizers.sgd import SGD
 from espnet2.samplers.build_batch_sampler import BATCH_TYPES
 from espnet2.samplers.build_batch_sampler import build_batch_sampler
@@ -58,6 +60,8 @@ from espnet2.train.distributed_utils import get_master_port
 from espnet2.train.distributed_utils import get_node_rank
 from espnet2.train.distributed_utils import get_num_nodes
 from espnet2.train.distributed_utils import resolve_distributed_mode
+from espnet2.train.preprocessor import CommonPreprocessor
+from espnet2.train.preprocessor import CommonPreprocessor_multi
 from espnet2.train.iterable_dataset import IterableESPnetDataset
 from espnet2.train.reporter import Reporter
 from espnet2.train.trainer import Trainer
@@ -262,6 +266,61 @@ class AbsTask(ABC):
     def build_model(cls, args: argparse.Namespace) -> AbsESPnetModel:
         raise NotImplementedError
 
+    @classmethod
+    def collected_feats_meta(cls, args: argparse.Namespace) -> Dict[str, Any]:
+        """Return the meta information stored with the collected feats.
+
+        The information is written in "meta.yaml" of the "mmap" store
+        created by "collect stats" mode, and can be used to check
+        whether the stored feats are consistent with the current configuration.
+        """
+        return {}
+
+    @classmethod
+    def pretokenize_text(cls, args: argparse.Namespace) -> None:
+        """Replace the "text" type data with the "mmap" stores of token ids."""
+        if args.output_dir is None:
+            raise RuntimeError("--pretokenize_text true requires --output_dir")
+        preprocess_fn = cls.build_preprocess_fn(args, train=False)
+        if not isinstance(
+            preprocess_fn, (CommonPreprocessor, CommonPreprocessor_multi)
+        ) or (preprocess_fn.tokenizer is None):
+            raise RuntimeError(
+                "--pretokenize_text true requires the preprocessor with a tokenizer"
+            )
+        if isinstance(preprocess_fn.text_name, str):
+            text_names = [preprocess_fn.text_name]
+        else:
+            text_names = list(preprocess_fn.text_name)
+
+        tokenizer_hash = get_tokenizer_hash(
+            {
+                k: getattr(args, k, None)
+                for k in [
+                    "token_type",
+                    "token_list",
+                    "bpemodel",
+                    "non_linguistic_symbols",
+                    "cleaner",
+                    "g2p",
+                ]
+            }
+        )
+        for mode in ["train", "valid"]:
+            key = f"{mode}_data_path_and_name_and_type"
+            setattr(
+                args,
+                key,
+                pretokenize_text(
+                    tokenize=preprocess_fn.tokenize,
+                    path_name_type_list=getattr(args, key),
+                    text_names=text_names,
+                    output_dir=Path(args.output_dir) / "pretokenized" / mode,
+                    tokenizer_hash=tokenizer_hash,
+                    nj=max(args.num_workers, 1),
+                ),
+            )
+
     @classmethod
     def get_parser(cls) -> config_argparse.ArgumentParser:
         assert check_argument_types()
@@ -432,6 +491,15 @@ class AbsTask(ABC):
             default=False,
             help='Write the output features from the model when "collect stats" mode',
         )
+        group.add_argument(
+            "--collected_feats_format",
+            type=str,
+            default="npy",
+            choices=["npy", "mmap"],
+            help='The file format of the features written by "collect stats" mode. '
+            '"mmap" writes a single memory-mapped store for each feature, '
+            'which can be given to the data loader as "mmap" type',
+        )
 
         group = parser.add_argument_group("Trainer related")
         group.add_argument(
@@ -574,7 +642,8 @@ class AbsTask(ABC):
             "--batch_bins",
             type=int,
             default=1000000,
-            help="The number of batch bins. Used if batch_type='length' or 'numel'",
+            help="The number of batch bins. "
+            "Used if batch_type='length', 'numel', or 'cost'",
         )
         group.add_argument(
             "--valid_batch_bins",
@@ -605,6 +674,13 @@ class AbsTask(ABC):
             help="If not given, the value of --batch_type is used",
         )
         group.add_argument("--fold_length", type=int, action="append", default=[])
+        group.add_argument(
+            "--batch_cost_quadratic",
+            type=float,
+            default=0.0,
+            help="The coefficient of the quadratic term of the length "
+            "in the cost model. Used if batch_type='cost'",
+        )
         group.add_argument(
             "--sort_in_batch",
             type=str,
@@ -688,6 +764,15 @@ class AbsTask(ABC):
             help="Allow the arbitrary keys for mini-batch with ignoring "
             "the task requirements",
         )
+        group.add_argument(
+            "--pretokenize_text",
+            type=str2bool,
+            default=False,
+            help='Tokenize the "text" type data once before training '
+            'and give the token ids to the data loader as "mmap" type. '
+            "The stores are written in the output directory and "
+            "reused while the text and the tokenizer configuration are not changed",
+        )
         group.add_argument(
             "--max_cache_size",
             type=humanfriendly.parse_size,
@@ -1018,6 +1103,16 @@ class AbsTask(ABC):
                 f" %(asctime)s (%(module)s:%(lineno)d) %(levelname)s: %(message)s",
             )
 
+        if args.pretokenize_text:
+            # Only the rank 0 process writes the stores to the shared output_dir,
+            # and the others reuse them after the barrier.
+            if not distributed_option.distributed or distributed_option.dist_rank == 0:
+                cls.pretokenize_text(args)
+            if distributed_option.distributed:
+                torch.distributed.barrier()
+                if distributed_option.dist_rank != 0:
+                    cls.pretokenize_text(args)
+
         # 1. Set random-seed
         set_all_random_seed(args.seed)
         torch.backends.cudnn.enabled = args.cudnn_enabled
@@ -1160,6 +1255,8 @@ class AbsTask(ABC):
                 ngpu=args.ngpu,
                 log_interval=args.log_interval,
                 write_collected_feats=args.write_collected_feats,
+                collected_feats_format=args.collected_feats_format,
+                collected_feats_meta=cls.collected_feats_meta(args),
             )
         else:
 
@@ -1401,6 +1498,7 @@ class AbsTask(ABC):
             sort_in_batch=args.sort_in_batch,
             sort_batch=args.sort_batch,
             drop_last=False,
+            cost_quadratic=getattr(args, "batch_cost_quadratic", 0.0),
             min_batch_size=torch.distributed.get_world_size()
             if iter_options.distributed
             else 1,
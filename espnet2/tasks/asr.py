@@ -1,5 +1,8 @@
 import argparse
+import hashlib
 import logging
+from pathlib import Path
+from typing import Any
 from typing import Callable
 from typing import Collection
 from typing import Dict
@@ -11,6 +14,7 @@ import numpy as np
 import torch
 from typeguard import check_argument_types
 from typeguard import check_return_type
+import yaml
 
 from espnet2.asr.ctc import CTC
 from espnet2.asr.decoder.abs_decoder import AbsDecoder
@@ -36,6 +40,7 @@ from espnet2.asr.frontend.abs_frontend import AbsFrontend
 from espnet2.asr.frontend.default import DefaultFrontend
 from espnet2.asr.specaug.abs_specaug import AbsSpecAug
 from espnet2.asr.specaug.specaug import SpecAug
+from espnet2.fileio.mmap_store import MmapStoreReader
 from espnet2.layers.abs_normalize import AbsNormalize
 from espnet2.layers.global_mvn import GlobalMVN
 from espnet2.layers.utterance_mvn import UtteranceMVN
@@ -262,10 +267,75 @@ class ASRTask(AbsTask):
     def optional_data_names(
         cls, train: bool = True, inference: bool = False
     ) -> Tuple[str, ...]:
-        retval = ()
+        if not inference:
+            # "feats" is the cached output of the frontend
+            retval = ("feats",)
+        else:
+            retval = ()
         assert check_return_type(retval)
         return retval
 
+    @classmethod
+    def get_frontend_hash(cls, args: argparse.Namespace) -> str:
+        """Return the hash value of the frontend configuration.
+
+        The default values of the frontend class are merged
+        so that the value doesn't depend on the way to write the config.
+        """
+        frontend = getattr(args, "frontend", None)
+        if frontend is None or getattr(args, "input_size", None) is not None:
+            frontend, frontend_conf = None, {}
+        else:
+            frontend_class = frontend_choices.get_class(frontend)
+            frontend_conf = get_default_kwargs(frontend_class)
+            frontend_conf.update(args.frontend_conf)
+        s = yaml.safe_dump(
+            dict(frontend=frontend, frontend_conf=frontend_conf), sort_keys=True
+        )
+        return hashlib.md5(s.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def collected_feats_meta(cls, args: argparse.Namespace) -> Dict[str, Any]:
+        return dict(frontend_hash=cls.get_frontend_hash(args))
+
+    @classmethod
+    def check_feats_cache(
+        cls, args: argparse.Namespace, frontend: Optional[AbsFrontend]
+    ) -> None:
+        """Check the "feats" given from the data loader instead of the frontend.
+
+        The feats store must be created with the same frontend configuration
+        and the frontend must be deterministic, i.e. it has no parameters.
+        """
+        path_name_type_list = list(
+            getattr(args, "train_data_path_and_name_and_type", None) or []
+        ) + list(getattr(args, "valid_data_path_and_name_and_type", None) or [])
+        frontend_hash = None
+        for path, name, _type in path_name_type_list:
+            if name != "feats":
+                continue
+            if frontend is None:
+                raise RuntimeError(
+                    '"feats" can be given only if the model has a frontend. '
+                    "Use --input_size to give the features without frontend"
+                )
+            if any(p.requires_grad for p in frontend.parameters()):
+                raise RuntimeError(
+                    "The feats cache can't be used for a frontend "
+                    "having trainable parameters"
+                )
+            if _type != "mmap" or not Path(path).exists():
+                continue
+            if frontend_hash is None:
+                frontend_hash = cls.get_frontend_hash(args)
+            meta = MmapStoreReader(path).meta
+            if meta.get("frontend_hash") != frontend_hash:
+                raise RuntimeError(
+                    f"The feats cache {path} was created with the different "
+                    f"frontend configuration: {meta.get('frontend_hash')} != "
+                    f"{frontend_hash}"
+                )
+
     @classmethod
     def build_model(cls, args: argparse.Namespace) -> ESPnetASRModel:
         assert check_argument_types()
@@ -294,6 +364,7 @@ class ASRTask(AbsTask):
             args.frontend_conf = {}
             frontend = None
             input_size = args.input_size
+        cls.check_feats_cache(args, frontend)
 
         # 2. Data augmentation for spectrogram
         if args.specaug is not None:
@@ -12,14 +12,18 @@ import torch
 from typeguard import check_argument_types
 from typeguard import check_return_type
 
+from espnet2.iterators.abs_iter_factory import AbsIterFactory
+from espnet2.iterators.sequence_iter_factory import SequenceIterFactory
 from espnet2.lm.abs_model import AbsLM
 from espnet2.lm.espnet_model import ESPnetLanguageModel
 from espnet2.lm.seq_rnn_lm import SequentialRNNLM
 from espnet2.lm.transformer_lm import TransformerLM
 from espnet2.tasks.abs_task import AbsTask
+from espnet2.tasks.abs_task import IteratorOptions
 from espnet2.torch_utils.initialize import initialize
 from espnet2.train.class_choices import ClassChoices
 from espnet2.train.collate_fn import CommonCollateFn
+from espnet2.train.dataset import PackedTokenDataset
 from espnet2.train.preprocessor import CommonPreprocessor
 from espnet2.train.trainer import Trainer
 from espnet2.utils.get_default_kwargs import get_default_kwargs
@@ -86,6 +90,14 @@ class LMTask(AbsTask):
             default=get_default_kwargs(ESPnetLanguageModel),
             help="The keyword arguments for model class.",
         )
+        group.add_argument(
+            "--pack_block_size",
+            type=int,
+            default=512,
+            help='The maximum number of tokens in a block with "--iterator_type task". '
+            "The consecutive sentences of the token corpus "
+            "given as 'token_corpus' type are packed into the blocks",
+        )
 
         group = parser.add_argument_group(description="Preprocess related")
         group.add_argument(
@@ -165,6 +177,81 @@ class LMTask(AbsTask):
         assert check_return_type(retval)
         return retval
 
+    @classmethod
+    def build_task_iter_factory(
+        cls,
+        args: argparse.Namespace,
+        iter_options: IteratorOptions,
+        mode: str,
+    ) -> AbsIterFactory:
+        """Build the iterator of the blocks packing the sentences of a token corpus.
+
+        The token corpus is created by espnet2.bin.lm_build_token_corpus and given as
+        e.g. --train_data_path_and_name_and_type dump/train_corpus,text,token_corpus
+        """
+        assert check_argument_types()
+        paths = [
+            path
+            for path, name, _type in iter_options.data_path_and_name_and_type
+            if name == "text" and _type == "token_corpus"
+        ]
+        if len(paths) != 1:
+            raise RuntimeError(
+                '"--iterator_type task" requires "text" of "token_corpus" type: '
+                f"{iter_options.data_path_and_name_and_type}"
+            )
+
+        if isinstance(args.token_list, str):
+            with open(args.token_list, encoding="utf-8") as f:
+                vocab_size = sum(1 for _ in f)
+        else:
+            vocab_size = len(args.token_list)
+        # The sentences are separated by <sos/eos>, which is the last id
+        dataset = PackedTokenDataset(
+            paths[0], block_size=args.pack_block_size, eos=vocab_size - 1
+        )
+
+        # The blocks are fixed into mini-batches with shuffling once and
+        # the order of the mini-batches is shuffled for each epoch
+        if iter_options.train:
+            indices = np.random.RandomState(args.seed).permutation(len(dataset))
+        else:
+            indices = np.arange(len(dataset))
+        bs = iter_options.batch_size
+        batches = [
+            tuple(int(i) for i in indices[start : start + bs])
+            for start in range(0, len(indices), bs)
+        ]
+        if iter_options.num_batches is not None:
+            batches = batches[: iter_options.num_batches]
+
+        logging.info(f"[{mode}] dataset:\n{dataset}")
+        logging.info(f"[{mode}] N-batch={len(batches)}, batch_size={bs}")
+
+        if iter_options.distributed:
+            world_size = torch.distributed.get_world_size()
+            rank = torch.distributed.get_rank()
+            if len(batches) > 1 and len(batches[-1]) < world_size:
+                batches[-2] = batches[-2] + batches.pop(-1)
+            for batch in batches:
+                if len(batch) < world_size:
+                    raise RuntimeError(
+                        f"The batch-size must be equal or more than world_size: "
+                        f"{len(batch)} < {world_size}"
+                    )
+            batches = [batch[rank::world_size] for batch in batches]
+
+        return SequenceIterFactory(
+            dataset=dataset,
+            batches=batches,
+            seed=args.seed,
+            num_iters_per_epoch=iter_options.num_iters_per_epoch,
+            shuffle=iter_options.train,
+            num_workers=args.num_workers,
+            collate_fn=iter_options.collate_fn,
+            pin_memory=args.ngpu > 0,
+        )
+
     @classmethod
     def required_data_names(
         cls, train: bool = True, inference: bool = False
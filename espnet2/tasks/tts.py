@@ -1,5 +1,8 @@
 import argparse
+import hashlib
 import logging
+from pathlib import Path
+from typing import Any
 from typing import Callable
 from typing import Collection
 from typing import Dict
@@ -11,7 +14,9 @@ import numpy as np
 import torch
 from typeguard import check_argument_types
 from typeguard import check_return_type
+import yaml
 
+from espnet2.fileio.mmap_store import MmapStoreReader
 from espnet2.layers.abs_normalize import AbsNormalize
 from espnet2.layers.global_mvn import GlobalMVN
 from espnet2.tasks.abs_task import AbsTask
@@ -28,6 +33,7 @@ from espnet2.tts.feats_extract.dio import Dio
 from espnet2.tts.feats_extract.energy import Energy
 from espnet2.tts.feats_extract.log_mel_fbank import LogMelFbank
 from espnet2.tts.feats_extract.log_spectrogram import LogSpectrogram
+from espnet2.tts.feats_extract.yin import Yin
 from espnet2.tts.tacotron2 import Tacotron2
 from espnet2.tts.transformer import Transformer
 from espnet2.utils.get_default_kwargs import get_default_kwargs
@@ -44,7 +50,7 @@ feats_extractor_choices = ClassChoices(
 )
 pitch_extractor_choices = ClassChoices(
     "pitch_extract",
-    classes=dict(dio=Dio),
+    classes=dict(dio=Dio, yin=Yin),
     type_check=AbsFeatsExtract,
     default=None,
     optional=True,
@@ -192,6 +198,23 @@ class TTSTask(AbsTask):
             default=None,
             help="Specify g2p method if --token_type=phn",
         )
+        parser.add_argument(
+            "--g2p_cache_size",
+            type=int,
+            default=0,
+            help="The number of sentences to keep the g2p outputs in memory. "
+            "0 disables the in-memory cache. Note that in training, "
+            "each data loader worker has its own cache, which is rebuilt every epoch, "
+            "so it rarely hits unless --num_workers 0",
+        )
+        parser.add_argument(
+            "--g2p_cache_dir",
+            type=str_or_none,
+            default=None,
+            help="The directory to store the g2p outputs on disk, "
+            "which is shared by the data loader workers and the other runs. "
+            "Give it to reuse the g2p outputs across the epochs in training",
+        )
 
         for class_choices in cls.class_choices_list:
             # Append --<name> and --<name>_conf.
@@ -224,6 +247,9 @@ class TTSTask(AbsTask):
                 non_linguistic_symbols=args.non_linguistic_symbols,
                 text_cleaner=args.cleaner,
                 g2p_type=args.g2p,
+                # NOTE: The old config doesn't have these options
+                g2p_cache_size=getattr(args, "g2p_cache_size", 0),
+                g2p_cache_dir=getattr(args, "g2p_cache_dir", None),
             )
         else:
             retval = None
@@ -252,6 +278,63 @@ class TTSTask(AbsTask):
             retval = ("spembs", "speech", "durations")
         return retval
 
+    @classmethod
+    def get_extract_hash(cls, args: argparse.Namespace) -> str:
+        """Return the hash value of the feature extractors configuration.
+
+        The default values of the extractor classes are merged
+        so that the value doesn't depend on the way to write the config.
+        """
+        config = {}
+        for class_choices in [
+            feats_extractor_choices,
+            pitch_extractor_choices,
+            energy_extractor_choices,
+        ]:
+            name = getattr(args, class_choices.name, None)
+            if name is None or (
+                class_choices is feats_extractor_choices
+                and getattr(args, "odim", None) is not None
+            ):
+                config[class_choices.name] = None
+                continue
+            conf = get_default_kwargs(class_choices.get_class(name))
+            conf.update(getattr(args, f"{class_choices.name}_conf", None) or {})
+            config[class_choices.name] = dict(type=name, conf=conf)
+        s = yaml.safe_dump(config, sort_keys=True)
+        return hashlib.md5(s.encode("utf-8")).hexdigest()
+
+    @classmethod
+    def collected_feats_meta(cls, args: argparse.Namespace) -> Dict[str, Any]:
+        return dict(extract_hash=cls.get_extract_hash(args))
+
+    @classmethod
+    def check_collected_feats(cls, args: argparse.Namespace) -> None:
+        """Check "pitch" and "energy" given from the data loader.
+
+        The stores written by "collect stats" mode must be created
+        with the same configuration of the feature extractors.
+        """
+        path_name_type_list = list(
+            getattr(args, "train_data_path_and_name_and_type", None) or []
+        ) + list(getattr(args, "valid_data_path_and_name_and_type", None) or [])
+        extract_hash = None
+        for path, name, _type in path_name_type_list:
+            if name not in ("pitch", "energy"):
+                continue
+            if _type != "mmap" or not Path(path).exists():
+                continue
+            if extract_hash is None:
+                extract_hash = cls.get_extract_hash(args)
+            meta = MmapStoreReader(path).meta
+            if meta.get("extract_hash") != extract_hash:
+                raise RuntimeError(
+                    f"The {name} store {path} was created with the different "
+                    f"configuration of the feature extractors: "
+                    f"{meta.get('extract_hash')} != {extract_hash}. "
+                    "Please run the stats collection again."
+                )
+
     @classmethod
     def build_model(cls, args: argparse.Namespace) -> ESPnetTTSModel:
         assert check_argument_types()
@@ -318,6 +401,8 @@ class TTSTask(AbsTask):
             )
             energy_normalize = energy_normalize_class(**args.energy_normalize_conf)
 
+        cls.check_collected_feats(args)
+
         # 5. Build model
         model = ESPnetTTSModel(
             feats_extract=feats_extract,
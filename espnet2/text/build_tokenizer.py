@@ -19,6 +19,8 @@ def build_tokenizer(
     space_symbol: str = "<space>",
     delimiter: str = None,
     g2p_type: str = None,
+    g2p_cache_size: int = 0,
+    g2p_cache_dir: Union[Path, str] = None,
 ) -> AbsTokenizer:
     """A helper function to instantiate Tokenizer"""
     assert check_argument_types()
@@ -57,6 +59,8 @@ def build_tokenizer(
             non_linguistic_symbols=non_linguistic_symbols,
             space_symbol=space_symbol,
             remove_non_linguistic_symbols=remove_non_linguistic_symbols,
+            g2p_cache_size=g2p_cache_size,
+            g2p_cache_dir=g2p_cache_dir,
         )
     else:
         raise ValueError(
@@ -6,6 +6,7 @@ from typing import Union
 from typeguard import check_argument_types
 
 from espnet2.text.abs_tokenizer import AbsTokenizer
+from espnet2.text.symbol_scanner import SymbolScanner
 
 
 class CharTokenizer(AbsTokenizer):
@@ -26,6 +27,7 @@ class CharTokenizer(AbsTokenizer):
         else:
             self.non_linguistic_symbols = set(non_linguistic_symbols)
         self.remove_non_linguistic_symbols = remove_non_linguistic_symbols
+        self.symbol_scanner = SymbolScanner(self.non_linguistic_symbols)
 
     def __repr__(self):
         return (
@@ -36,21 +38,10 @@ class CharTokenizer(AbsTokenizer):
         )
 
     def text2tokens(self, line: str) -> List[str]:
-        tokens = []
-        while len(line) != 0:
-            for w in self.non_linguistic_symbols:
-                if line.startswith(w):
-                    if not self.remove_non_linguistic_symbols:
-                        tokens.append(line[: len(w)])
-                    line = line[len(w) :]
-                    break
-            else:
-                t = line[0]
-                if t == " ":
-                    t = "<space>"
-                tokens.append(t)
-                line = line[1:]
-        return tokens
+        tokens = self.symbol_scanner(
+            line, remove_symbols=self.remove_non_linguistic_symbols
+        )
+        return [t if t != " " else "<space>" for t in tokens]
 
     def tokens2text(self, tokens: Iterable[str]) -> str:
         tokens = [t if t != self.space_symbol else " " for t in tokens]
@@ -1,12 +1,19 @@
+from collections import OrderedDict
+import json
+import os
 from pathlib import Path
+import sqlite3
+from typing import Callable
 from typing import Iterable
 from typing import List
+from typing import Optional
 from typing import Union
 
 import g2p_en
 from typeguard import check_argument_types
 
 from espnet2.text.abs_tokenizer import AbsTokenizer
+from espnet2.text.symbol_scanner import SymbolScanner
 
 
 def pyopenjtalk_g2p(text) -> List[str]:
@@ -75,6 +82,116 @@ class G2p_en:
         return phones
 
 
+def get_g2p_version(g2p_type: str) -> str:
+    """Return the version of the package used for the g2p_type."""
+    if g2p_type.startswith("g2p_en"):
+        name = "g2p_en"
+    elif g2p_type.startswith("pyopenjtalk"):
+        name = "pyopenjtalk"
+    elif g2p_type.startswith("pypinyin"):
+        name = "pypinyin"
+    else:
+        raise NotImplementedError(f"Not supported: g2p_type={g2p_type}")
+    try:
+        # Python>=3.8
+        from importlib import metadata
+
+        try:
+            return metadata.version(name)
+        except metadata.PackageNotFoundError:
+            return "unknown"
+    except ImportError:
+        import pkg_resources
+
+        try:
+            return pkg_resources.get_distribution(name).version
+        except pkg_resources.DistributionNotFound:
+            return "unknown"
+
+
+class G2pCache:
+    """Memoize the outputs of a g2p function for each sentence.
+
+    The outputs are kept in a bounded LRU dict in memory and,
+    if cache_dir is given, also in a sqlite database in the directory,
+    which is shared by the DataLoader workers and the later runs.
+    The database file is separated for each g2p_type and the version
+    of the package, so the outputs of the other g2p are never used.
+
+    Note that the sentence is the unit of caching because
+    the g2p functions depend on the context, e.g. homographs in g2p_en.
+    """
+
+    def __init__(
+        self,
+        g2p: Callable[[str], List[str]],
+        g2p_type: str,
+        cache_size: int = 100000,
+        cache_dir: Union[Path, str] = None,
+    ):
+        self.g2p = g2p
+        self.cache_size = cache_size
+        self.memory = OrderedDict()
+        if cache_dir is None:
+            self.db_file = None
+        else:
+            version = get_g2p_version(g2p_type)
+            self.db_file = Path(cache_dir) / f"{g2p_type}-{version}.db"
+        self.conn = None
+        self.pid = None
+
+    def __getstate__(self):
+        # sqlite3.Connection can't be pickled and shouldn't be shared
+        state = self.__dict__.copy()
+        state["conn"] = None
+        state["pid"] = None
+        return state
+
+    def _connect(self) -> sqlite3.Connection:
+        # Reconnect in the forked processes
+        if self.conn is None or self.pid != os.getpid():
+            self.db_file.parent.mkdir(parents=True, exist_ok=True)
+            self.conn = sqlite3.connect(str(self.db_file), timeout=60.0)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            with self.conn:
+                self.conn.execute(
+                    "CREATE TABLE IF NOT EXISTS g2p "
+                    "(text TEXT PRIMARY KEY, phones TEXT NOT NULL)"
+                )
+            self.pid = os.getpid()
+        return self.conn
+
+    def __call__(self, text: str) -> List[str]:
+        phones = self.memory.get(text)
+        if phones is not None:
+            self.memory.move_to_end(text)
+            return list(phones)
+
+        if self.db_file is not None:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT phones FROM g2p WHERE text = ?", (text,)
+            ).fetchone()
+            if row is not None:
+                phones = json.loads(row[0])
+
+        if phones is None:
+            phones = self.g2p(text)
+            if self.db_file is not None:
+                with conn:
+                    conn.execute(
+                        "INSERT OR IGNORE INTO g2p VALUES (?, ?)",
+                        (text, json.dumps(phones, ensure_ascii=False)),
+                    )
+
+        if self.cache_size > 0:
+            self.memory[text] = tuple(phones)
+            if len(self.memory) > self.cache_size:
+                self.memory.popitem(last=False)
+        return list(phones)
+
+
 class PhonemeTokenizer(AbsTokenizer):
     def __init__(
         self,
@@ -82,6 +199,8 @@ class PhonemeTokenizer(AbsTokenizer):
         non_linguistic_symbols: Union[Path, str, Iterable[str]] = None,
         space_symbol: str = "<space>",
         remove_non_linguistic_symbols: bool = False,
+        g2p_cache_size: int = 0,
+        g2p_cache_dir: Optional[Union[Path, str]] = None,
     ):
         assert check_argument_types()
         if g2p_type == "g2p_en":
@@ -98,6 +217,13 @@ class PhonemeTokenizer(AbsTokenizer):
             self.g2p = pypinyin_g2p_phone
         else:
             raise NotImplementedError(f"Not supported: g2p_type={g2p_type}")
+        if g2p_cache_size > 0 or g2p_cache_dir is not None:
+            self.g2p = G2pCache(
+                self.g2p,
+                g2p_type=g2p_type,
+                cache_size=g2p_cache_size,
+                cache_dir=g2p_cache_dir,
+            )
 
         self.g2p_type = g2p_type
         self.space_symbol = space_symbol
@@ -110,6 +236,7 @@ class PhonemeTokenizer(AbsTokenizer):
         else:
             self.non_linguistic_symbols = set(non_linguistic_symbols)
         self.remove_non_linguistic_symbols = remove_non_linguistic_symbols
+        self.symbol_scanner = SymbolScanner(self.non_linguistic_symbols)
 
     def __repr__(self):
         return (
@@ -121,20 +248,8 @@ class PhonemeTokenizer(AbsTokenizer):
         )
 
     def text2tokens(self, line: str) -> List[str]:
-        tokens = []
-        while len(line) != 0:
-            for w in self.non_linguistic_symbols:
-                if line.startswith(w):
-                    if not self.remove_non_linguistic_symbols:
-                        tokens.append(line[: len(w)])
-                    line = line[len(w) :]
-                    break
-            else:
-                t = line[0]
-                tokens.append(t)
-                line = line[1:]
-
-        line = "".join(tokens)
+        if self.remove_non_linguistic_symbols:
+            line = "".join(self.symbol_scanner(line, remove_symbols=True))
         tokens = self.g2p(line)
         return tokens
 
@@ -0,0 +1,62 @@
+import re
+from typing import Dict
+from typing import Iterable
+from typing import List
+
+
+def _trie_to_regex(node: Dict[str, dict]) -> str:
+    # The key "" indicates that a symbol ends at this node
+    alternatives = [
+        re.escape(c) + _trie_to_regex(child)
+        for c, child in sorted(node.items())
+        if c != ""
+    ]
+    if len(alternatives) == 0:
+        return ""
+    elif len(alternatives) == 1:
+        regex = alternatives[0]
+    else:
+        regex = "(?:" + "|".join(alternatives) + ")"
+
+    if "" in node:
+        # Greedy: Try the longer symbols first and fall back to this node
+        regex = "(?:" + regex + ")?"
+    return regex
+
+
+class SymbolScanner:
+    """Split a text into the given symbols and the other characters.
+
+    The symbols are compiled into a single regular expression along their trie,
+    so that the text is scanned once instead of trying every symbol
+    at every character. If the symbols share a prefix, the longest one is used.
+
+    Examples:
+        >>> scanner = SymbolScanner(["<noise>", "<unk>"])
+        >>> scanner("a<noise>b")
+        ['a', '<noise>', 'b']
+        >>> scanner("a<noise>b", remove_symbols=True)
+        ['a', 'b']
+    """
+
+    def __init__(self, symbols: Iterable[str]):
+        self.symbols = frozenset(s for s in symbols if len(s) != 0)
+
+        trie = {}
+        for s in self.symbols:
+            node = trie
+            for c in s:
+                node = node.setdefault(c, {})
+            node[""] = {}
+        regex = _trie_to_regex(trie)
+        if len(regex) != 0:
+            regex += "|."
+        else:
+            regex = "."
+        self.pattern = re.compile(regex, re.DOTALL)
+
+    def __call__(self, line: str, remove_symbols: bool = False) -> List[str]:
+        tokens = self.pattern.findall(line)
+        if remove_symbols:
+            tokens = [t for t in tokens if t not in self.symbols]
+        return tokens
@@ -5,6 +5,7 @@ import copy
 import functools
 import logging
 import numbers
+from pathlib import Path
 import re
 from typing import Any
 from typing import Callable
@@ -23,12 +24,14 @@ from torch.utils.data.dataset import Dataset
 from typeguard import check_argument_types
 from typeguard import check_return_type
 
+from espnet2.fileio.mmap_store import MmapStoreReader
 from espnet2.fileio.npy_scp import NpyScpReader
 from espnet2.fileio.rand_gen_dataset import FloatRandomGenerateDataset
 from espnet2.fileio.rand_gen_dataset import IntRandomGenerateDataset
 from espnet2.fileio.read_text import load_num_sequence_text
 from espnet2.fileio.read_text import read_2column_text
 from espnet2.fileio.sound_scp import SoundScpReader
+from espnet2.fileio.token_corpus import TokenCorpusReader
 from espnet2.utils.sized_dict import SizedDict
 
 
@@ -154,6 +157,16 @@ DATA_TYPES = {
         "   utterance_id_B /some/where/b.npy\n"
         "   ...",
     ),
+    "mmap": dict(
+        func=MmapStoreReader,
+        kwargs=[],
+        help="A directory of the memory-mapped array store "
+        "created by MmapStoreWriter."
+        "\n\n"
+        "   some_dir/data.bin\n"
+        "   some_dir/index\n"
+        "   some_dir/meta.yaml",
+    ),
     "text_int": dict(
         func=functools.partial(load_num_sequence_text, loader_type="text_int"),
         kwargs=[],
@@ -428,3 +441,87 @@ class ESPnetDataset(AbsDataset):
         retval = uid, data
         assert check_return_type(retval)
         return retval
+
+
+def pack_sentences(lengths: np.ndarray, block_size: int) -> np.ndarray:
+    """Pack the consecutive sentences into blocks not exceeding block_size.
+
+    The length of a block is counted including a separator between sentences.
+    A sentence longer than block_size makes a block by itself.
+
+    Returns:
+        The boundaries of the blocks (Nblock + 1,): The i-th block consists of
+        the sentences from boundaries[i] to boundaries[i + 1] - 1.
+
+    Examples:
+        >>> pack_sentences(np.array([3, 2, 4, 9, 1]), block_size=6)
+        array([0, 2, 3, 4, 5])
+    """
+    # The end position of each sentence, including the following separator
+    cumsum = np.cumsum(np.asarray(lengths, dtype=np.int64) + 1)
+    boundaries = [0]
+    base = 0
+    while boundaries[-1] < len(cumsum):
+        end = int(np.searchsorted(cumsum, base + block_size + 1, side="right"))
+        end = max(end, boundaries[-1] + 1)
+        boundaries.append(end)
+        base = cumsum[end - 1]
+    return np.array(boundaries, dtype=np.int64)
+
+
+class PackedTokenDataset(AbsDataset):
+    """Dataset packing the consecutive sentences of a token corpus into blocks.
+
+    The sentences are concatenated with the separator, e.g. <sos/eos>,
+    so that each block has close to block_size tokens without padding
+    instead of a sentence per sample.
+    The uid of the sample is the index of the block.
+
+    Examples:
+        >>> dataset = PackedTokenDataset('token_corpus_dir', block_size=512, eos=99)
+        >>> uid, data = dataset[0]
+        {'text': array([3, 4, 99, 5, 6, 7, ...])}
+    """
+
+    def __init__(
+        self,
+        path: Union[Path, str],
+        block_size: int,
+        eos: int,
+        name: str = "text",
+        int_dtype: str = "long",
+    ):
+        assert check_argument_types()
+        self.path = path
+        self.corpus = TokenCorpusReader(path)
+        self.block_size = block_size
+        self.eos = eos
+        self.name = name
+        self.int_dtype = int_dtype
+        self.boundaries = pack_sentences(self.corpus.lengths, block_size)
+
+    def has_name(self, name) -> bool:
+        return name == self.name
+
+    def names(self) -> Tuple[str, ...]:
+        return (self.name,)
+
+    def __repr__(self):
+        return (
+            f"{self.__class__.__name__}(\n"
+            f'  {self.name}: {{"path": "{self.path}", "type": "token_corpus"}}\n'
+            f"  N-sentence={len(self.corpus)}, N-block={len(self)}, "
+            f"block_size={self.block_size})"
+        )
+
+    def __len__(self):
+        return len(self.boundaries) - 1
+
+    def __getitem__(self, uid: Union[str, int]) -> Tuple[str, Dict[str, np.ndarray]]:
+        index = int(uid)
+        start, end = self.boundaries[index], self.boundaries[index + 1]
+        offsets = self.corpus.offsets[start : end + 1]
+        tokens = self.corpus.tokens[offsets[0] : offsets[-1]]
+        # Insert the separator at the beginning of the each sentence except the first
+        tokens = np.insert(tokens, offsets[1:-1] - offsets[0], self.eos)
+        return str(index), {self.name: tokens.astype(self.int_dtype)}
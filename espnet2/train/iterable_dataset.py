@@ -10,10 +10,10 @@ from typing import Union
 
 import kaldiio
 import numpy as np
-import soundfile
 import torch
 from typeguard import check_argument_types
 
+from espnet2.fileio.sound_scp import read_sound
 from espnet2.train.dataset import ESPnetDataset
 
 if LooseVersion(torch.__version__) >= LooseVersion("1.2"):
@@ -22,7 +22,8 @@ else:
     from torch.utils.data.dataset import Dataset as IterableDataset
 
 DATA_TYPES = {
-    "sound": lambda x: soundfile.read(x)[0],
+    # NOTE: read_sound can also load the wav packed in a Kaldi-ark
+    "sound": lambda x: read_sound(x)[1],
     # NOTE(kamo): load_ark can load wav file.
     "pipe_wav": lambda x: kaldiio.load_mat(x)[1].astype(np.float32),
     "kaldi_ark": lambda x: kaldiio.load_mat(x),
@@ -42,6 +42,8 @@ class CommonPreprocessor(AbsPreprocessor):
         delimiter: str = None,
         speech_name: str = "speech",
         text_name: str = "text",
+        g2p_cache_size: int = 0,
+        g2p_cache_dir: Union[Path, str] = None,
     ):
         super().__init__(train)
         self.train = train
@@ -60,6 +62,8 @@ class CommonPreprocessor(AbsPreprocessor):
                 space_symbol=space_symbol,
                 non_linguistic_symbols=non_linguistic_symbols,
                 g2p_type=g2p_type,
+                g2p_cache_size=g2p_cache_size,
+                g2p_cache_dir=g2p_cache_dir,
             )
             self.token_id_converter = TokenIDConverter(
                 token_list=token_list,
@@ -70,6 +74,13 @@ class CommonPreprocessor(AbsPreprocessor):
             self.tokenizer = None
             self.token_id_converter = None
 
+    def tokenize(self, text: str) -> np.ndarray:
+        """Clean the text and convert it to the token ids."""
+        text = self.text_cleaner(text)
+        tokens = self.tokenizer.text2tokens(text)
+        text_ints = self.token_id_converter.tokens2ids(tokens)
+        return np.array(text_ints, dtype=np.int64)
+
     def __call__(
         self, uid: str, data: Dict[str, Union[str, np.ndarray]]
     ) -> Dict[str, np.ndarray]:
@@ -85,10 +96,11 @@ class CommonPreprocessor(AbsPreprocessor):
 
         if self.text_name in data and self.tokenizer is not None:
             text = data[self.text_name]
-            text = self.text_cleaner(text)
-            tokens = self.tokenizer.text2tokens(text)
-            text_ints = self.token_id_converter.tokens2ids(tokens)
-            data[self.text_name] = np.array(text_ints, dtype=np.int64)
+            if isinstance(text, np.ndarray):
+                # Already tokenized: e.g. by --pretokenize_text
+                data[self.text_name] = text.astype(np.int64)
+            else:
+                data[self.text_name] = self.tokenize(text)
         assert check_return_type(data)
         return data
 
@@ -136,6 +148,13 @@ class CommonPreprocessor_multi(AbsPreprocessor):
             self.tokenizer = None
             self.token_id_converter = None
 
+    def tokenize(self, text: str) -> np.ndarray:
+        """Clean the text and convert it to the token ids."""
+        text = self.text_cleaner(text)
+        tokens = self.tokenizer.text2tokens(text)
+        text_ints = self.token_id_converter.tokens2ids(tokens)
+        return np.array(text_ints, dtype=np.int64)
+
     def __call__(
         self, uid: str, data: Dict[str, Union[str, np.ndarray]]
     ) -> Dict[str, np.ndarray]:
@@ -152,9 +171,10 @@ class CommonPreprocessor_multi(AbsPreprocessor):
         for text_n in self.text_name:
             if text_n in data and self.tokenizer is not None:
                 text = data[text_n]
-                text = self.text_cleaner(text)
-                tokens = self.tokenizer.text2tokens(text)
-                text_ints = self.token_id_converter.tokens2ids(tokens)
-                data[text_n] = np.array(text_ints, dtype=np.int64)
+                if isinstance(text, np.ndarray):
+                    # Already tokenized: e.g. by --pretokenize_text
+                    data[text_n] = text.astype(np.int64)
+                else:
+                    data[text_n] = self.tokenize(text)
         assert check_return_type(data)
         return data
@@ -0,0 +1,37 @@
+import torch
+
+
+def average_by_duration(
+    x: torch.Tensor,
+    x_lengths: torch.Tensor,
+    d: torch.Tensor,
+    voiced_only: bool = False,
+) -> torch.Tensor:
+    """Average the frames of each token over the padded batch.
+
+    Args:
+        x: Padded frame-wise features, e.g. f0 or energy (B, T_feats).
+        x_lengths: Number of frames of each utterance (B,).
+        d: Padded durations of the tokens (B, T_text).
+        voiced_only: If True, average only the frames with positive values,
+            i.e. the voiced frames of f0.
+
+    Returns:
+        Token-wise features (B, T_text). 0 for the tokens without frames.
+
+    """
+    assert (d.sum(dim=1) == x_lengths).all()
+    B, T_text = d.shape
+    # Give the token index to each frame as the segment id.
+    # The frames after the last token, i.e. the padded frames, have T_text.
+    boundaries = d.new_zeros(B, x.size(1) + 1)
+    boundaries.scatter_add_(1, d.cumsum(dim=1), torch.ones_like(d))
+    segment_ids = boundaries.cumsum(dim=1)[:, :-1]
+
+    if voiced_only:
+        weight = x.gt(0.0).to(x.dtype)
+    else:
+        weight = torch.ones_like(x)
+    x_sum = x.new_zeros(B, T_text + 1).scatter_add_(1, segment_ids, x * weight)
+    x_count = x.new_zeros(B, T_text + 1).scatter_add_(1, segment_ids, weight)
+    return (x_sum / x_count.clamp(min=1.0))[:, :T_text]
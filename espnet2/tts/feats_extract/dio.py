@@ -22,6 +22,7 @@ from typeguard import check_argument_types
 
 from espnet.nets.pytorch_backend.nets_utils import pad_list
 from espnet2.tts.feats_extract.abs_feats_extract import AbsFeatsExtract
+from espnet2.tts.feats_extract.average_by_duration import average_by_duration
 
 
 class Dio(AbsFeatsExtract):
@@ -106,18 +107,16 @@ class Dio(AbsFeatsExtract):
                 for p, fl in zip(pitch, feats_lengths)
             ]
 
+        # Padding
+        pitch_lengths = input.new_tensor([len(p) for p in pitch], dtype=torch.long)
+        pitch = pad_list(pitch, 0.0)
+
         # (Optional): Average by duration to calculate token-wise f0
         if self.use_token_averaged_f0:
-            pitch = [
-                self._average_by_duration(p, d).view(-1)
-                for p, d in zip(pitch, durations)
-            ]
+            pitch = average_by_duration(
+                pitch, pitch_lengths, durations, voiced_only=True
+            )
             pitch_lengths = durations_lengths
-        else:
-            pitch_lengths = input.new_tensor([len(p) for p in pitch], dtype=torch.long)
-
-        # Padding
-        pitch = pad_list(pitch, 0.0)
 
         # Return with the shape (B, T, 1)
         return pitch.unsqueeze(-1), pitch_lengths
@@ -169,15 +168,3 @@ class Dio(AbsFeatsExtract):
         f0 = interp_fn(np.arange(0, f0.shape[0]))
 
         return f0
-
-    @staticmethod
-    def _average_by_duration(x: torch.Tensor, d: torch.Tensor) -> torch.Tensor:
-        assert d.sum() == len(x)
-        d_cumsum = F.pad(d.cumsum(dim=0), (1, 0))
-        x_avg = [
-            x[start:end].masked_select(x[start:end].gt(0.0)).mean(dim=0)
-            if len(x[start:end].masked_select(x[start:end].gt(0.0))) != 0
-            else x.new_tensor(0.0)
-            for start, end in zip(d_cumsum[:-1], d_cumsum[1:])
-        ]
-        return torch.stack(x_avg)
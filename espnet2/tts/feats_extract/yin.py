@@ -0,0 +1,220 @@
+"""F0 extractor using YIN algorithm."""
+
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Tuple
+from typing import Union
+
+import humanfriendly
+import torch
+import torch.nn.functional as F
+
+from typeguard import check_argument_types
+
+from espnet2.tts.feats_extract.abs_feats_extract import AbsFeatsExtract
+from espnet2.tts.feats_extract.average_by_duration import average_by_duration
+
+
+class Yin(AbsFeatsExtract):
+    """F0 estimation with YIN algorithm.
+
+    This is f0 extractor based on YIN algorithm introduced in `YIN, a fundamental
+    frequency estimator for speech and music`_. Unlike Dio, the padded batch is
+    processed at once with PyTorch operations, so it runs on multiple CPU threads
+    or GPU without the loop over the utterances.
+
+    .. _`YIN, a fundamental frequency estimator for speech and music`:
+        https://doi.org/10.1121/1.1458024
+
+    Note:
+        The computational graph is not connected because of the argmin over lags.
+
+    """
+
+    def __init__(
+        self,
+        fs: Union[int, str] = 22050,
+        n_fft: int = 1024,
+        hop_length: int = 256,
+        f0min: Optional[int] = 80,
+        f0max: Optional[int] = 400,
+        threshold: float = 0.1,
+        use_token_averaged_f0: bool = True,
+        use_continuous_f0: bool = True,
+        use_log_f0: bool = True,
+    ):
+        assert check_argument_types()
+        super().__init__()
+        if isinstance(fs, str):
+            fs = humanfriendly.parse_size(fs)
+        self.fs = fs
+        self.n_fft = n_fft
+        self.hop_length = hop_length
+        self.f0min = f0min
+        self.f0max = f0max
+        self.threshold = threshold
+        self.use_token_averaged_f0 = use_token_averaged_f0
+        self.use_continuous_f0 = use_continuous_f0
+        self.use_log_f0 = use_log_f0
+
+        self.tau_min = max(int(fs / f0max), 2)
+        self.tau_max = int(fs / f0min) + 1
+        if self.tau_max >= n_fft // 2:
+            raise ValueError(
+                f"n_fft must be more than 2 * fs / f0min: "
+                f"n_fft={n_fft}, fs={fs}, f0min={f0min}"
+            )
+
+    def output_size(self) -> int:
+        return 1
+
+    def get_parameters(self) -> Dict[str, Any]:
+        return dict(
+            fs=self.fs,
+            n_fft=self.n_fft,
+            hop_length=self.hop_length,
+            f0min=self.f0min,
+            f0max=self.f0max,
+            threshold=self.threshold,
+            use_token_averaged_f0=self.use_token_averaged_f0,
+            use_continuous_f0=self.use_continuous_f0,
+            use_log_f0=self.use_log_f0,
+        )
+
+    def forward(
+        self,
+        input: torch.Tensor,
+        input_lengths: torch.Tensor = None,
+        feats_lengths: torch.Tensor = None,
+        durations: torch.Tensor = None,
+        durations_lengths: torch.Tensor = None,
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        # If not provide, we assume that the inputs have the same length
+        if input_lengths is None:
+            input_lengths = (
+                input.new_ones(input.shape[0], dtype=torch.long) * input.shape[1]
+            )
+
+        # F0 extraction: (B, T) -> (B, N)
+        pitch = self._calculate_f0(input.float())
+        # The same number of frames as Dio
+        pitch_lengths = input_lengths // self.hop_length + 1
+        mask = self._make_mask(pitch, pitch_lengths)
+        pitch = pitch.masked_fill(~mask, 0.0)
+
+        if self.use_continuous_f0:
+            pitch = self._convert_to_continuous_f0(pitch, mask)
+        if self.use_log_f0:
+            pitch = torch.where(
+                pitch != 0.0, pitch.clamp(min=1.0e-10).log(), pitch.new_zeros(1)
+            )
+
+        # (Optional): Adjust length to match with the mel-spectrogram
+        if feats_lengths is not None:
+            max_len = int(feats_lengths.max())
+            if max_len > pitch.size(1):
+                pitch = F.pad(pitch, (0, max_len - pitch.size(1)))
+            else:
+                pitch = pitch[:, :max_len]
+            pitch_lengths = feats_lengths.to(pitch_lengths.device)
+            pitch = pitch.masked_fill(~self._make_mask(pitch, pitch_lengths), 0.0)
+
+        # (Optional): Average by duration to calculate token-wise f0
+        if self.use_token_averaged_f0:
+            pitch = average_by_duration(
+                pitch, pitch_lengths, durations, voiced_only=True
+            )
+            pitch_lengths = durations_lengths
+        else:
+            pitch = pitch[:, : int(pitch_lengths.max())]
+
+        # Return with the shape (B, T, 1)
+        return pitch.unsqueeze(-1), pitch_lengths
+
+    def _calculate_f0(self, input: torch.Tensor) -> torch.Tensor:
+        # Centered frames: (B, T) -> (B, N, n_fft)
+        x = F.pad(input, (self.n_fft // 2, self.n_fft // 2))
+        frames = x.unfold(1, self.n_fft, self.hop_length)
+        win_length = self.n_fft - self.tau_max
+
+        # Auto-correlation of the window and the lagged windows via FFT
+        # acf[tau] = sum_{j < W} x[j] * x[j + tau]
+        n = 2 * self.n_fft
+        spec = torch.fft.rfft(frames, n=n)
+        spec_win = torch.fft.rfft(frames[..., :win_length], n=n)
+        acf = torch.fft.irfft(spec * spec_win.conj(), n=n)[..., : self.tau_max + 1]
+
+        # Energy of the lagged windows: energy[tau] = sum_{j < W} x[j + tau]^2
+        cumsum = F.pad((frames**2).cumsum(dim=-1), (1, 0))
+        energy = (
+            cumsum[..., win_length : win_length + self.tau_max + 1]
+            - cumsum[..., : self.tau_max + 1]
+        )
+
+        # Difference function and its cumulative mean normalized version
+        diff = (energy[..., :1] + energy - 2 * acf).clamp(min=0.0)
+        taus = torch.arange(1, self.tau_max + 1, device=input.device)
+        cmnd = diff[..., 1:] * taus / diff[..., 1:].cumsum(dim=-1).clamp(min=1.0e-10)
+        # (B, N, tau_max + 1), tau = 0 is 1
+        cmnd = F.pad(cmnd, (1, 0), value=1.0)
+
+        # The first local minimum under the threshold in [tau_min, tau_max)
+        center = cmnd[..., 1:-1]
+        trough = (center < cmnd[..., :-2]) & (center <= cmnd[..., 2:])
+        trough = F.pad(trough, (1, 1), value=False)
+        trough[..., : self.tau_min] = False
+        candidates = trough & (cmnd < self.threshold)
+        voiced = candidates.any(dim=-1) & (energy[..., 0] > 1.0e-10)
+        tau = candidates.long().argmax(dim=-1).clamp(min=1, max=self.tau_max - 1)
+
+        # Parabolic interpolation around the minimum
+        prev = cmnd.gather(-1, (tau - 1).unsqueeze(-1)).squeeze(-1)
+        cur = cmnd.gather(-1, tau.unsqueeze(-1)).squeeze(-1)
+        nxt = cmnd.gather(-1, (tau + 1).unsqueeze(-1)).squeeze(-1)
+        denom = prev - 2 * cur + nxt
+        shift = torch.where(
+            denom.abs() > 1.0e-10,
+            0.5 * (prev - nxt) / denom.clamp(min=1.0e-10),
+            denom.new_zeros(1),
+        )
+        tau = tau.float() + shift.clamp(min=-1.0, max=1.0)
+
+        return torch.where(voiced, self.fs / tau, tau.new_zeros(1))
+
+    @staticmethod
+    def _make_mask(x: torch.Tensor, lengths: torch.Tensor) -> torch.Tensor:
+        return torch.arange(x.size(1), device=x.device)[None] < lengths[:, None]
+
+    @staticmethod
+    def _convert_to_continuous_f0(f0: torch.Tensor, mask: torch.Tensor) -> torch.Tensor:
+        """Linearly interpolate the unvoiced frames with the voiced frames.
+
+        The frames before the first voiced frame and after the last voiced frame
+        are filled with the nearest voiced f0. If all frames are unvoiced,
+        they are kept as 0.
+        """
+        B, N = f0.shape
+        voiced = f0 != 0.0
+        idx = torch.arange(N, device=f0.device).expand(B, N)
+        # The indices of the previous and the next voiced frames
+        prev_idx = torch.where(voiced, idx, idx.new_full((1,), -1)).cummax(dim=1)[0]
+        next_idx = (
+            N
+            - 1
+            - torch.where(voiced, N - 1 - idx, idx.new_full((1,), -1))
+            .flip(1)
+            .cummax(dim=1)[0]
+            .flip(1)
+        )
+        has_prev = prev_idx >= 0
+        has_next = next_idx < N
+        prev_idx = torch.where(has_prev, prev_idx, next_idx).clamp(0, N - 1)
+        next_idx = torch.where(has_next, next_idx, prev_idx).clamp(0, N - 1)
+        prev_f0 = f0.gather(1, prev_idx)
+        next_f0 = f0.gather(1, next_idx)
+        span = (next_idx - prev_idx).clamp(min=1).to(f0.dtype)
+        weight = (idx - prev_idx).to(f0.dtype) / span
+        continuous = prev_f0 + (next_f0 - prev_f0) * weight
+        continuous = torch.where(voiced, f0, continuous)
+        return continuous.masked_fill(~mask, 0.0)
@@ -0,0 +1,83 @@
+import itertools
+
+import numpy as np
+import pytest
+import torch
+
+from espnet2.asr.ctc_search import ctc_greedy_search
+from espnet2.asr.ctc_search import ctc_prefix_beam_search
+from espnet2.lm.batch_lm_score import batch_lm_score
+from espnet2.lm.seq_rnn_lm import SequentialRNNLM
+from espnet2.lm.transformer_lm import TransformerLM
+
+
+def _brute_force(logp):
+    """Compute log P(labels) by enumerating all alignments."""
+    T, V = logp.shape
+    probs = {}
+    for path in itertools.product(range(V), repeat=T):
+        labels = tuple(k for k, _ in itertools.groupby(path) if k != 0)
+        p = float(sum(logp[t, path[t]] for t in range(T)))
+        probs[labels] = np.logaddexp(probs.get(labels, -np.inf), p)
+    return probs
+
+
+def test_ctc_greedy_search():
+    logp = torch.randn(2, 6, 4).log_softmax(dim=-1)
+    lengths = torch.tensor([6, 4])
+    results = ctc_greedy_search(logp, lengths)
+    for b, (tokens, score) in enumerate(results):
+        ids = logp[b, : lengths[b]].argmax(-1).tolist()
+        assert tokens == [k for k, _ in itertools.groupby(ids) if k != 0]
+        np.testing.assert_allclose(
+            score, logp[b, : lengths[b]].max(-1)[0].sum().item(), rtol=1e-5
+        )
+
+
+def test_ctc_prefix_beam_search():
+    torch.manual_seed(0)
+    logp = (torch.randn(5, 4) * 2).log_softmax(dim=-1).double()
+    expected = _brute_force(logp.numpy())
+    # The beam is wide enough not to prune any prefixes
+    results = ctc_prefix_beam_search(logp, beam_size=1000)
+    assert len(results) == len(expected)
+    for tokens, score in results:
+        np.testing.assert_allclose(score, expected[tuple(tokens)], rtol=1e-6)
+
+    best = max(expected, key=expected.get)
+    assert tuple(ctc_prefix_beam_search(logp, beam_size=3)[0][0]) == best
+
+
+def test_ctc_prefix_beam_search_blank_skip():
+    torch.manual_seed(0)
+    logp = (torch.randn(8, 4) * 2).log_softmax(dim=-1)
+    results = ctc_prefix_beam_search(logp, beam_size=5, blank_skip_threshold=0.5)
+    assert len(results) > 0
+
+
+@pytest.mark.parametrize("lm_class", [SequentialRNNLM, TransformerLM])
+def test_ctc_prefix_beam_search_lm(lm_class):
+    torch.manual_seed(0)
+    vocab_size = 4
+    lm = lm_class(vocab_size).eval()
+    logp = (torch.randn(4, vocab_size) * 2).log_softmax(dim=-1)
+    expected = _brute_force(logp.double().numpy())
+    with torch.no_grad():
+        results = ctc_prefix_beam_search(
+            logp,
+            beam_size=1000,
+            lm=lm,
+            lm_weight=0.5,
+            sos_eos=vocab_size - 1,
+            penalty=0.1,
+        )
+        lm_scores = batch_lm_score(
+            lm, [r[0] for r in results], vocab_size - 1, batch_bins=100
+        )
+    assert len(results) == len(expected)
+    for (tokens, score), lm_score in zip(results, lm_scores):
+        np.testing.assert_allclose(
+            score,
+            expected[tuple(tokens)] + 0.5 * lm_score + 0.1 * len(tokens),
+            rtol=1e-4,
+        )
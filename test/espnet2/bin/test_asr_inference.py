@@ -4,6 +4,7 @@ import string
 
 import numpy as np
 import pytest
+import torch
 
 from espnet.nets.beam_search import Hypothesis
 from espnet2.bin.asr_inference import get_parser
@@ -80,3 +81,94 @@ def test_Speech2Text(asr_config_file, lm_config_file):
         assert isinstance(token[0], str)
         assert isinstance(token_int[0], int)
         assert isinstance(hyp, Hypothesis)
+
+
+@pytest.fixture()
+def asr_config_file_no_frontend(tmp_path: Path, token_list):
+    # Write default configuration file
+    ASRTask.main(
+        cmd=[
+            "--dry_run",
+            "true",
+            "--output_dir",
+            str(tmp_path / "asr_no_frontend"),
+            "--token_list",
+            str(token_list),
+            "--token_type",
+            "char",
+            "--input_size",
+            "20",
+            "--encoder",
+            "transformer",
+            "--encoder_conf",
+            "input_layer=linear",
+            "--decoder",
+            "transformer",
+        ]
+    )
+    return tmp_path / "asr_no_frontend" / "config.yaml"
+
+
+@pytest.mark.parametrize("ctc_search", ["greedy", "prefix_beam", "attention_rescoring"])
+@pytest.mark.parametrize("use_lm", [False, True])
+def test_Speech2Text_ctc_search(
+    asr_config_file_no_frontend, lm_config_file, ctc_search, use_lm
+):
+    speech2text = Speech2Text(
+        asr_train_config=asr_config_file_no_frontend,
+        lm_train_config=lm_config_file if use_lm else None,
+        beam_size=3,
+        nbest=2,
+        ctc_search=ctc_search,
+    )
+    speech = torch.randn(2, 50, 20)
+    lengths = torch.tensor([50, 30])
+    results = speech2text.batch_decode(speech, lengths)
+    assert len(results) == 2
+    for b, nbest in enumerate(results):
+        assert 1 <= len(nbest) <= 2
+        for text, token, token_int, hyp in nbest:
+            assert isinstance(token, list)
+            assert isinstance(hyp, Hypothesis)
+            assert hyp.yseq[1:-1].tolist() == token_int
+        # The same result as decoding the utterance alone
+        single = speech2text(speech[b, : lengths[b]])
+        assert single[0][2] == nbest[0][2]
+
+
+@pytest.mark.parametrize("use_lm", [False, True])
+def test_Speech2Text_attention_rescoring(
+    asr_config_file_no_frontend, lm_config_file, use_lm
+):
+    speech2text = Speech2Text(
+        asr_train_config=asr_config_file_no_frontend,
+        lm_train_config=lm_config_file if use_lm else None,
+        beam_size=4,
+        nbest=4,
+        ctc_weight=0.3,
+        lm_weight=0.5,
+        penalty=0.1,
+        ctc_search="attention_rescoring",
+    )
+    speech = torch.randn(40, 20)
+    results = speech2text(speech)
+    enc, _ = speech2text.asr_model.encode(speech[None], torch.tensor([40]))
+    decoder = speech2text.asr_model.decoder
+    scores = [hyp.score for _, _, _, hyp in results]
+    assert scores == sorted(scores, reverse=True)
+    for _, _, _, hyp in results:
+        # The same score as the incremental decoding
+        att = 0.0
+        state = None
+        for i in range(1, len(hyp.yseq)):
+            logp, state = decoder.score(hyp.yseq[:i], state, enc[0])
+            att += float(logp[hyp.yseq[i]])
+        assert abs(hyp.scores["decoder"] - att) < 1e-4
+        assert ("lm" in hyp.scores) == use_lm
+        expected = (
+            0.7 * hyp.scores["decoder"]
+            + 0.3 * hyp.scores["ctc"]
+            + 0.5 * hyp.scores.get("lm", 0.0)
+            + 0.1 * (len(hyp.yseq) - 1)
+        )
+        assert abs(hyp.score - expected) < 1e-4
@@ -0,0 +1,116 @@
+from argparse import ArgumentParser
+from io import BytesIO
+
+import kaldiio
+import numpy as np
+import pytest
+import soundfile
+
+from espnet2.bin.data_to_shape import get_parser
+from espnet2.bin.data_to_shape import main
+from espnet2.fileio.mmap_store import MmapStoreWriter
+from espnet2.fileio.npy_scp import NpyScpWriter
+
+
+def test_get_parser():
+    assert isinstance(get_parser(), ArgumentParser)
+
+
+def test_main():
+    with pytest.raises(SystemExit):
+        main()
+
+
+def _read_shape(p):
+    with open(p) as f:
+        return dict(line.rstrip().split(" ") for line in f)
+
+
+def test_data_to_shape_sound(tmp_path):
+    soundfile.write(tmp_path / "a.wav", np.zeros(100, dtype=np.int16), 16000)
+    soundfile.write(tmp_path / "b.flac", np.zeros((50, 2), dtype=np.int16), 16000)
+    # The wav packed in the ark
+    ark = tmp_path / "data.ark"
+    with ark.open("wb") as f, BytesIO() as g:
+        soundfile.write(g, np.zeros(30, dtype=np.int16), 16000, format="wav")
+        f.write(b"c ")
+        f.write(g.getvalue())
+    with (tmp_path / "wav.scp").open("w") as f:
+        f.write(f"a {tmp_path / 'a.wav'}\n")
+        f.write(f"b {tmp_path / 'b.flac'}\n")
+        f.write(f"c {ark}:2\n")
+
+    main(
+        [
+            "--data_type",
+            "sound",
+            "--nj",
+            "2",
+            str(tmp_path / "wav.scp"),
+            str(tmp_path / "shape"),
+        ]
+    )
+    assert _read_shape(tmp_path / "shape") == {"a": "100", "b": "50,2", "c": "30"}
+
+
+def test_data_to_shape_npy(tmp_path):
+    writer = NpyScpWriter(tmp_path / "data", tmp_path / "feats.scp")
+    writer["a"] = np.zeros((10, 3), dtype=np.float32)
+    writer["b"] = np.zeros((5,), dtype=np.float32)
+    writer.close()
+
+    main(
+        [
+            "--data_type",
+            "npy",
+            str(tmp_path / "feats.scp"),
+            str(tmp_path / "shape"),
+        ]
+    )
+    assert _read_shape(tmp_path / "shape") == {"a": "10,3", "b": "5"}
+
+
+# 1: "CM2" for <= 8 rows, "CM" otherwise, 2: "CM", 3: "CM2", 5: "CM3"
+@pytest.mark.parametrize("compression_method", [None, 1, 2, 3, 5])
+def test_data_to_shape_kaldi_ark(tmp_path, compression_method):
+    arrays = {
+        "a": np.random.randn(10, 3).astype(np.float32),
+        "b": np.random.randn(4, 7).astype(np.float64),
+        "c": np.random.randn(6).astype(np.float32),
+        "d": np.random.randn(37, 5).astype(np.float32),
+    }
+    if compression_method is not None:
+        del arrays["c"]
+    kaldiio.save_ark(
+        str(tmp_path / "feats.ark"),
+        arrays,
+        scp=str(tmp_path / "feats.scp"),
+        compression_method=compression_method,
+    )
+
+    main(
+        [
+            "--data_type",
+            "kaldi_ark",
+            str(tmp_path / "feats.scp"),
+            str(tmp_path / "shape"),
+        ]
+    )
+    desired = {k: ",".join(map(str, v.shape)) for k, v in arrays.items()}
+    assert _read_shape(tmp_path / "shape") == desired
+
+
+def test_data_to_shape_mmap(tmp_path):
+    with MmapStoreWriter(tmp_path / "store") as writer:
+        writer["a"] = np.zeros((10, 3), dtype=np.float32)
+        writer["b"] = np.zeros((4,), dtype=np.int32)
+
+    main(
+        [
+            "--data_type",
+            "mmap",
+            str(tmp_path / "store"),
+            str(tmp_path / "shape"),
+        ]
+    )
+    assert _read_shape(tmp_path / "shape") == {"a": "10,3", "b": "4"}
@@ -0,0 +1,45 @@
+from argparse import ArgumentParser
+
+import numpy as np
+import pytest
+
+from espnet2.bin.lm_build_token_corpus import get_parser
+from espnet2.bin.lm_build_token_corpus import main
+from espnet2.fileio.token_corpus import TokenCorpusReader
+
+
+def test_get_parser():
+    assert isinstance(get_parser(), ArgumentParser)
+
+
+def test_main():
+    with pytest.raises(SystemExit):
+        main()
+
+
+def test_build_token_corpus(tmp_path):
+    with (tmp_path / "text").open("w") as f:
+        f.write("utt1 abc\n")
+        f.write("utt2\n")
+        f.write("utt3 ca\n")
+    with (tmp_path / "tokens.txt").open("w") as f:
+        f.write("<blank>\n<unk>\na\nb\nc\n<sos/eos>\n")
+
+    main(
+        [
+            "--input",
+            str(tmp_path / "text"),
+            "--output_dir",
+            str(tmp_path / "corpus"),
+            "--token_type",
+            "char",
+            "--token_list",
+            str(tmp_path / "tokens.txt"),
+        ]
+    )
+    reader = TokenCorpusReader(tmp_path / "corpus")
+    assert len(reader) == 3
+    np.testing.assert_array_equal(reader[0], [2, 3, 4])
+    np.testing.assert_array_equal(reader[1], [])
+    np.testing.assert_array_equal(reader[2], [4, 2])
+    assert "tokenizer_hash" in reader.meta
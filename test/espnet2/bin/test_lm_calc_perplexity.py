@@ -1,9 +1,15 @@
 from argparse import ArgumentParser
+from pathlib import Path
+import string
 
+import numpy as np
 import pytest
 
+from espnet2.bin.lm_calc_perplexity import calc_perplexity
 from espnet2.bin.lm_calc_perplexity import get_parser
+from espnet2.bin.lm_calc_perplexity import load_utt2nll
 from espnet2.bin.lm_calc_perplexity import main
+from espnet2.tasks.lm import LMTask
 
 
 def test_get_parser():
@@ -13,3 +19,82 @@ def test_get_parser():
 def test_main():
     with pytest.raises(SystemExit):
         main()
+
+
+@pytest.fixture()
+def token_list(tmp_path: Path):
+    with (tmp_path / "tokens.txt").open("w") as f:
+        f.write("<blank>\n")
+        for c in string.ascii_letters:
+            f.write(f"{c}\n")
+        f.write("<unk>\n")
+        f.write("<sos/eos>\n")
+    return tmp_path / "tokens.txt"
+
+
+@pytest.fixture()
+def lm_config_file(tmp_path: Path, token_list):
+    # Write default configuration file
+    LMTask.main(
+        cmd=[
+            "--dry_run",
+            "true",
+            "--output_dir",
+            str(tmp_path / "lm"),
+            "--token_list",
+            str(token_list),
+            "--token_type",
+            "char",
+        ]
+    )
+    return tmp_path / "lm" / "config.yaml"
+
+
+@pytest.fixture()
+def text_file(tmp_path: Path):
+    rng = np.random.RandomState(0)
+    with (tmp_path / "text").open("w") as f:
+        for i in range(20):
+            n = rng.randint(1, 15)
+            f.write(f"utt{i} {''.join(rng.choice(list('abcdef'), n))}\n")
+    return tmp_path / "text"
+
+
+def _read_utt2ppl(p: Path):
+    with p.open() as f:
+        return {k: float(v) for k, v in (line.split() for line in f)}
+
+
+def test_calc_perplexity_batch_bins(tmp_path: Path, lm_config_file, text_file):
+    kwargs = dict(
+        dtype="float32",
+        ngpu=0,
+        seed=0,
+        num_workers=0,
+        log_level="INFO",
+        data_path_and_name_and_type=[(str(text_file), "text", "text")],
+        key_file=None,
+        train_config=str(lm_config_file),
+        model_file=None,
+        log_base=None,
+        allow_variable_data_keys=False,
+    )
+    calc_perplexity(output_dir=str(tmp_path / "out1"), batch_size=1, **kwargs)
+    calc_perplexity(
+        output_dir=str(tmp_path / "out2"),
+        batch_size=1,
+        batch_bins=40,
+        sort_buffer=7,
+        write_nll_binary=True,
+        **kwargs,
+    )
+    ppl1 = _read_utt2ppl(tmp_path / "out1" / "utt2ppl")
+    ppl2 = _read_utt2ppl(tmp_path / "out2" / "utt2ppl")
+    assert ppl1.keys() == ppl2.keys()
+    for k in ppl1:
+        np.testing.assert_allclose(ppl1[k], ppl2[k], rtol=1e-4)
+
+    keys, records = load_utt2nll(tmp_path / "out2")
+    assert sorted(keys) == sorted(ppl1)
+    for k, r in zip(keys, records):
+        np.testing.assert_allclose(np.exp(r["nll"] / r["ntokens"]), ppl1[k], rtol=1e-4)
@@ -0,0 +1,89 @@
+from argparse import ArgumentParser
+from pathlib import Path
+import string
+
+import pytest
+
+from espnet2.bin.lm_rescore import get_parser
+from espnet2.bin.lm_rescore import lm_rescore
+from espnet2.bin.lm_rescore import main
+from espnet2.fileio.datadir_writer import DatadirWriter
+from espnet2.fileio.read_text import read_2column_text
+from espnet2.tasks.lm import LMTask
+
+
+def test_get_parser():
+    assert isinstance(get_parser(), ArgumentParser)
+
+
+def test_main():
+    with pytest.raises(SystemExit):
+        main()
+
+
+@pytest.fixture()
+def token_list(tmp_path: Path):
+    with (tmp_path / "tokens.txt").open("w") as f:
+        f.write("<blank>\n")
+        for c in string.ascii_letters:
+            f.write(f"{c}\n")
+        f.write("<unk>\n")
+        f.write("<sos/eos>\n")
+    return tmp_path / "tokens.txt"
+
+
+@pytest.fixture()
+def lm_config_file(tmp_path: Path, token_list):
+    # Write default configuration file
+    LMTask.main(
+        cmd=[
+            "--dry_run",
+            "true",
+            "--output_dir",
+            str(tmp_path / "lm"),
+            "--token_list",
+            str(token_list),
+            "--token_type",
+            "char",
+        ]
+    )
+    return tmp_path / "lm" / "config.yaml"
+
+
+def test_lm_rescore(tmp_path: Path, lm_config_file):
+    with DatadirWriter(tmp_path / "decode") as writer:
+        for n, (tint, score) in enumerate(
+            [("1 2 3", -1.0), ("1 2", -1.5), ("4", -2.0)], 1
+        ):
+            writer[f"{n}best_recog"]["token_int"]["utt1"] = tint
+            writer[f"{n}best_recog"]["score"]["utt1"] = str(score)
+        writer["1best_recog"]["token_int"]["utt2"] = "5 6"
+        writer["1best_recog"]["score"]["utt2"] = "-3.0"
+
+    lm_rescore(
+        output_dir=str(tmp_path / "rescore"),
+        nbest_dir=str(tmp_path / "decode"),
+        nbest=10,
+        ngpu=0,
+        seed=0,
+        dtype="float32",
+        log_level="INFO",
+        lm_train_config=str(lm_config_file),
+        lm_file=None,
+        lm_weight=0.5,
+        penalty=0.0,
+        batch_bins=100,
+    )
+
+    out = tmp_path / "rescore"
+    scores = []
+    for n in [1, 2, 3]:
+        lm_score = float(read_2column_text(out / f"{n}best_recog/lm_score")["utt1"])
+        score = float(read_2column_text(out / f"{n}best_recog/score")["utt1"])
+        scores.append(score)
+        assert lm_score < 0
+    assert scores == sorted(scores, reverse=True)
+    assert read_2column_text(out / "1best_recog/token_int")["utt2"] == "5 6"
+    assert not (out / "2best_recog/token_int").exists() or "utt2" not in (
+        read_2column_text(out / "2best_recog/token_int")
+    )
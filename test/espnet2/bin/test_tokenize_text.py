@@ -4,6 +4,7 @@ import pytest
 
 from espnet2.bin.tokenize_text import get_parser
 from espnet2.bin.tokenize_text import main
+from espnet2.bin.tokenize_text import split_file_by_bytes
 
 
 def test_get_parser():
@@ -13,3 +14,44 @@ def test_get_parser():
 def test_main():
     with pytest.raises(SystemExit):
         main()
+
+
+def test_split_file_by_bytes(tmp_path):
+    p = tmp_path / "text"
+    with p.open("w") as f:
+        for i in range(100):
+            f.write(f"utt{i} abc\n")
+    byte_ranges = split_file_by_bytes(p, 3)
+    assert len(byte_ranges) == 3
+    assert byte_ranges[0][0] == 0
+    assert byte_ranges[-1][1] == p.stat().st_size
+    data = p.read_bytes()
+    for start, end in byte_ranges:
+        assert start == 0 or data[start - 1 : start] == b"\n"
+
+
+@pytest.mark.parametrize("write_vocabulary", [False, True])
+def test_tokenize_nj(tmp_path, write_vocabulary):
+    p = tmp_path / "text"
+    with p.open("w") as f:
+        for i in range(100):
+            f.write(f"utt{i} abc {i}\n")
+    outputs = []
+    for nj in [1, 3]:
+        output = tmp_path / f"output.{nj}"
+        main(
+            [
+                "--input",
+                str(p),
+                "--output",
+                str(output),
+                "--field",
+                "2-",
+                "--write_vocabulary",
+                str(write_vocabulary),
+                "--nj",
+                str(nj),
+            ]
+        )
+        outputs.append(output.read_text())
+    assert outputs[0] == outputs[1]
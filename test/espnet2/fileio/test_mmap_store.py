@@ -0,0 +1,88 @@
+from pathlib import Path
+import pickle
+
+import numpy as np
+import pytest
+
+from espnet2.fileio.mmap_store import MmapStoreReader
+from espnet2.fileio.mmap_store import MmapStoreWriter
+from espnet2.fileio.mmap_store import merge_mmap_stores
+
+
+def test_MmapStoreWriter(tmp_path: Path):
+    array1 = np.random.randn(1)
+    array2 = np.random.randn(3, 1, 10).astype(np.float32)
+    array3 = np.random.randint(0, 10, 7, dtype=np.int32)
+    with MmapStoreWriter(tmp_path, meta={"foo": "bar"}) as writer:
+        writer["abc"] = array1
+        writer["def"] = array2
+        writer["ghi"] = array3
+    target = MmapStoreReader(tmp_path)
+    desired = {"abc": array1, "def": array2, "ghi": array3}
+
+    for k in desired:
+        t = target[k]
+        d = desired[k]
+        assert t.dtype == d.dtype
+        np.testing.assert_array_equal(t, d)
+
+    assert len(target) == len(desired)
+    assert "abc" in target
+    assert "xyz" not in target
+    assert tuple(target.keys()) == tuple(desired)
+    assert tuple(target) == tuple(desired)
+    assert target.meta == {"foo": "bar"}
+    assert target.get_info("abc")[2] == 0
+    assert target.get_info("def")[2] % MmapStoreWriter.alignment == 0
+
+
+def test_MmapStoreWriter_white_space(tmp_path: Path):
+    with MmapStoreWriter(tmp_path) as writer:
+        with pytest.raises(RuntimeError):
+            writer["a b"] = np.random.randn(1)
+
+
+def test_MmapStoreReader_pickle(tmp_path: Path):
+    array1 = np.random.randn(4, 2)
+    with MmapStoreWriter(tmp_path) as writer:
+        writer["abc"] = array1
+    target = MmapStoreReader(tmp_path)
+    np.testing.assert_array_equal(target["abc"], array1)
+    target2 = pickle.loads(pickle.dumps(target))
+    np.testing.assert_array_equal(target2["abc"], array1)
+    assert target2.meta == {}
+
+
+def test_MmapStoreReader_empty(tmp_path: Path):
+    with MmapStoreWriter(tmp_path) as writer:
+        writer["abc"] = np.zeros((0, 3))
+    target = MmapStoreReader(tmp_path)
+    assert target["abc"].shape == (0, 3)
+
+
+def test_merge_mmap_stores(tmp_path: Path):
+    array1 = np.random.randn(3)
+    array2 = np.random.randint(0, 10, (5, 3), dtype=np.int16)
+    array3 = np.random.randn(2, 2).astype(np.float32)
+    with MmapStoreWriter(tmp_path / "a", meta={"foo": "bar"}) as writer:
+        writer["abc"] = array1
+        writer["def"] = array2
+    with MmapStoreWriter(tmp_path / "b", meta={"foo": "bar"}) as writer:
+        writer["ghi"] = array3
+    merge_mmap_stores([tmp_path / "a", tmp_path / "b"], tmp_path / "c")
+
+    target = MmapStoreReader(tmp_path / "c")
+    desired = {"abc": array1, "def": array2, "ghi": array3}
+    assert tuple(target) == tuple(desired)
+    for k in desired:
+        np.testing.assert_array_equal(target[k], desired[k])
+    assert target.meta == {"foo": "bar"}
+
+
+def test_merge_mmap_stores_mismatch(tmp_path: Path):
+    with MmapStoreWriter(tmp_path / "a", meta={"foo": "bar"}) as writer:
+        writer["abc"] = np.random.randn(3)
+    with MmapStoreWriter(tmp_path / "b", meta={"foo": "baz"}) as writer:
+        writer["def"] = np.random.randn(3)
+    with pytest.raises(RuntimeError):
+        merge_mmap_stores([tmp_path / "a", tmp_path / "b"], tmp_path / "c")
@@ -1,3 +1,4 @@
+from io import BytesIO
 from pathlib import Path
 
 import numpy as np
@@ -63,3 +64,30 @@ def test_SoundScpReader_normalize(tmp_path: Path):
         rate2, d = desired[k]
         assert rate1 == rate2
         np.testing.assert_array_equal(t, d)
+
+
+def test_SoundScpReader_ark(tmp_path: Path):
+    audio1 = np.random.randint(-100, 100, 16, dtype=np.int16)
+    audio2 = np.random.randint(-100, 100, (16, 2), dtype=np.int16)
+
+    # Kaldi-ark holding wav files: "<key> <RIFF...>"
+    ark = tmp_path / "data.ark"
+    p = tmp_path / "dummy.scp"
+    with ark.open("wb") as fark, p.open("w") as f:
+        for k, audio in [("abc", audio1), ("def", audio2)]:
+            fark.write(f"{k} ".encode())
+            f.write(f"{k} {ark}:{fark.tell()}\n")
+            with BytesIO() as g:
+                soundfile.write(g, audio, 16, format="wav", subtype="PCM_16")
+                fark.write(g.getvalue())
+
+    target = SoundScpReader(p, normalize=False, dtype=np.int16)
+    rate, t = target["abc"]
+    assert rate == 16
+    np.testing.assert_array_equal(t, audio1)
+    rate, t = target["def"]
+    np.testing.assert_array_equal(t, audio2)
+
+    target = SoundScpReader(p, normalize=True, always_2d=True)
+    rate, t = target["abc"]
+    np.testing.assert_array_equal(t, audio1[:, None].astype(np.float64) / (1 << 15))
@@ -0,0 +1,39 @@
+from pathlib import Path
+import pickle
+
+import numpy as np
+
+from espnet2.fileio.token_corpus import TokenCorpusReader
+from espnet2.fileio.token_corpus import TokenCorpusWriter
+
+
+def test_TokenCorpus(tmp_path: Path):
+    sentences = [np.array([3, 4, 5]), np.array([], dtype=np.int64), np.array([6, 7])]
+    with TokenCorpusWriter(tmp_path, meta={"foo": "bar"}) as writer:
+        for s in sentences:
+            writer.append(s)
+    reader = TokenCorpusReader(tmp_path)
+    assert len(reader) == 3
+    assert reader.meta == {"foo": "bar"}
+    np.testing.assert_array_equal(reader.lengths, [3, 0, 2])
+    for t, d in zip([reader[i] for i in range(3)], sentences):
+        assert t.dtype == np.int32
+        np.testing.assert_array_equal(t, d)
+
+
+def test_TokenCorpusReader_pickle(tmp_path: Path):
+    with TokenCorpusWriter(tmp_path) as writer:
+        writer.append(np.array([1, 2]))
+    reader = TokenCorpusReader(tmp_path)
+    reader[0]
+    reader2 = pickle.loads(pickle.dumps(reader))
+    assert reader2._tokens is None
+    np.testing.assert_array_equal(reader2[0], [1, 2])
+
+
+def test_TokenCorpusReader_empty(tmp_path: Path):
+    with TokenCorpusWriter(tmp_path):
+        pass
+    reader = TokenCorpusReader(tmp_path)
+    assert len(reader) == 0
+    assert len(reader.tokens) == 0
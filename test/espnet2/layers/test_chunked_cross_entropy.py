@@ -0,0 +1,71 @@
+import pytest
+import torch
+import torch.nn.functional as F
+
+from espnet2.layers.chunked_cross_entropy import chunked_cross_entropy
+
+
+@pytest.mark.parametrize("use_bias", [True, False])
+@pytest.mark.parametrize("chunk_size", [1, 10, 100])
+def test_chunked_cross_entropy(use_bias, chunk_size):
+    hidden = torch.randn(37, 8, requires_grad=True)
+    weight = torch.randn(50, 8, requires_grad=True)
+    bias = torch.randn(50, requires_grad=True) if use_bias else None
+    target = torch.randint(0, 50, (37,))
+
+    nll = chunked_cross_entropy(hidden, weight, bias, target, chunk_size)
+    nll.sum().backward()
+    grads = [hidden.grad, weight.grad] + ([bias.grad] if use_bias else [])
+    hidden.grad = weight.grad = None
+    if use_bias:
+        bias.grad = None
+
+    desired = F.cross_entropy(F.linear(hidden, weight, bias), target, reduction="none")
+    desired.sum().backward()
+    desired_grads = [hidden.grad, weight.grad] + ([bias.grad] if use_bias else [])
+
+    torch.testing.assert_allclose(nll, desired)
+    for g, d in zip(grads, desired_grads):
+        torch.testing.assert_allclose(g, d)
+
+
+def test_chunked_cross_entropy_gradcheck():
+    hidden = torch.randn(7, 3, dtype=torch.double, requires_grad=True)
+    weight = torch.randn(5, 3, dtype=torch.double, requires_grad=True)
+    bias = torch.randn(5, dtype=torch.double, requires_grad=True)
+    target = torch.randint(0, 5, (7,))
+    torch.autograd.gradcheck(
+        lambda h, w, b: chunked_cross_entropy(h, w, b, target, 3),
+        (hidden, weight, bias),
+    )
+
+
+def test_chunked_cross_entropy_empty():
+    nll = chunked_cross_entropy(
+        torch.randn(0, 3), torch.randn(5, 3), None, torch.zeros(0).long(), 3
+    )
+    assert nll.shape == (0,)
+
+
+@pytest.mark.parametrize("hidden_dtype", [torch.float32, torch.bfloat16])
+def test_chunked_cross_entropy_autocast(hidden_dtype):
+    hidden = torch.randn(37, 8, requires_grad=True)
+    weight = torch.randn(50, 8, requires_grad=True)
+    bias = torch.randn(50, requires_grad=True)
+    target = torch.randint(0, 50, (37,))
+
+    def grads(fn):
+        with torch.autocast("cpu", dtype=torch.bfloat16):
+            nll = fn(hidden.to(hidden_dtype))
+        nll.sum().backward()
+        retval = [nll.detach(), hidden.grad, weight.grad, bias.grad]
+        hidden.grad = weight.grad = bias.grad = None
+        return retval
+
+    results = grads(lambda h: chunked_cross_entropy(h, weight, bias, target, 10))
+    desired = grads(
+        lambda h: F.cross_entropy(F.linear(h, weight, bias), target, reduction="none")
+    )
+    for r, d in zip(results, desired):
+        assert r.dtype == d.dtype
+        torch.testing.assert_close(r, d, rtol=1e-2, atol=1e-2)
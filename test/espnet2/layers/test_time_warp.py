@@ -1,6 +1,8 @@
 import pytest
 import torch
 
+from espnet2.layers.time_warp import _batch_time_warp
+from espnet2.layers.time_warp import batch_time_warp
 from espnet2.layers.time_warp import TimeWarp
 
 
@@ -19,3 +21,33 @@ def test_TimeWarp(x_lens, requires_grad):
 def test_TimeWarp_repr():
     time_warp = TimeWarp(window=10)
     print(time_warp)
+
+
+@pytest.mark.parametrize("mode", ["bicubic", "bilinear"])
+def test_batch_time_warp_equal_to_interpolate(mode):
+    x = torch.randn(3, 100, 20)
+    x_lens = torch.tensor([100, 71, 40])
+    center = torch.tensor([50, 30, 10])
+    warped = torch.tensor([61, 22, 10])
+    y = _batch_time_warp(x, x_lens, center, warped, mode=mode)
+    for i in range(3):
+        _x = x[i : i + 1, None, : x_lens[i]]
+        left = torch.nn.functional.interpolate(
+            _x[:, :, : center[i]], (warped[i], 20), mode=mode, align_corners=False
+        )
+        right = torch.nn.functional.interpolate(
+            _x[:, :, center[i] :],
+            (x_lens[i] - warped[i], 20),
+            mode=mode,
+            align_corners=False,
+        )
+        desired = torch.cat([left, right], dim=2)[0, 0]
+        torch.testing.assert_allclose(y[i, : x_lens[i]], desired)
+        assert (y[i, x_lens[i] :] == 0).all()
+
+
+def test_batch_time_warp_short_input():
+    x = torch.randn(2, 30, 20)
+    y = batch_time_warp(x, torch.tensor([30, 15]), window=10)
+    torch.testing.assert_allclose(y[1, :15], x[1, :15])
+    assert (y[1, 15:] == 0).all()
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+import torch
+
+from espnet2.lm.batch_lm_score import batch_lm_score
+from espnet2.lm.batch_lm_score import find_prefix_carriers
+from espnet2.lm.espnet_model import ESPnetLanguageModel
+from espnet2.lm.seq_rnn_lm import SequentialRNNLM
+from espnet2.lm.transformer_lm import TransformerLM
+
+
+def test_find_prefix_carriers():
+    seqs = [(1, 2), (1, 2, 3), (4,), (1, 2), (), (1, 3)]
+    carriers = find_prefix_carriers(seqs)
+    for s, c in zip(seqs, carriers):
+        assert seqs[c][: len(s)] == s
+    assert carriers[0] == carriers[3] == 1
+    assert carriers[2] == 2
+    assert carriers[5] == 5
+
+
+@pytest.mark.parametrize("lm_class", [SequentialRNNLM, TransformerLM])
+@pytest.mark.parametrize("batch_bins", [1, 20, 1000])
+def test_batch_lm_score(lm_class, batch_bins):
+    vocab_size = 10
+    model = ESPnetLanguageModel(lm_class(vocab_size), vocab_size).eval()
+    seqs = [[1, 2, 3], [1, 2], [4, 5, 6, 7, 8], [1, 2, 3], [], [2]]
+    scores = batch_lm_score(model.lm, seqs, model.sos, batch_bins)
+
+    for seq, score in zip(seqs, scores):
+        with torch.no_grad():
+            nll, _ = model.nll(
+                torch.tensor([seq], dtype=torch.long).view(1, -1),
+                torch.tensor([len(seq)]),
+            )
+        np.testing.assert_allclose(score, -nll.sum().item(), rtol=1e-4, atol=1e-5)
@@ -0,0 +1,33 @@
+import pytest
+import torch
+
+from espnet2.lm.espnet_model import ESPnetLanguageModel
+from espnet2.lm.seq_rnn_lm import SequentialRNNLM
+from espnet2.lm.transformer_lm import TransformerLM
+
+
+@pytest.mark.parametrize("lm_class", [SequentialRNNLM, TransformerLM])
+def test_ESPnetLanguageModel_chunked_nll(lm_class):
+    if lm_class is SequentialRNNLM:
+        lm = lm_class(10, unit=8, nlayers=1, dropout_rate=0.0)
+    else:
+        lm = lm_class(10, att_unit=8, head=2, unit=8, layer=1, dropout_rate=0.0)
+    model = ESPnetLanguageModel(lm, vocab_size=10)
+    chunked = ESPnetLanguageModel(lm, vocab_size=10, nll_chunk_size=3)
+
+    text = torch.randint(1, 9, (3, 6))
+    text_lengths = torch.tensor([6, 2, 4])
+    nll, lengths = model.nll(text, text_lengths)
+    nll2, lengths2 = chunked.nll(text, text_lengths)
+    torch.testing.assert_allclose(nll, nll2)
+    assert (lengths == lengths2).all()
+    assert (nll[1, 3:] == 0).all()
+
+    loss, *_ = model(text, text_lengths)
+    loss.backward()
+    desired = [p.grad.clone() for p in lm.parameters()]
+    lm.zero_grad()
+    loss2, *_ = chunked(text, text_lengths)
+    loss2.backward()
+    for p, d in zip(lm.parameters(), desired):
+        torch.testing.assert_allclose(p.grad, d)
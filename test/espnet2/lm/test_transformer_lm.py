@@ -83,3 +83,43 @@ def test_TransformerLM_batch_beam_search(pos_enc, dtype):
             maxlenratio=0.0,
             minlenratio=0.0,
         )
+
+
+@pytest.mark.parametrize("pos_enc", ["sinusoidal", None])
+def test_TransformerLM_batch_score_kv_cache(pos_enc):
+    model = TransformerLM(10, pos_enc=pos_enc, unit=10).eval()
+    ys = torch.randint(1, 10, (3, 6))
+    states = [None] * 3
+    with torch.no_grad():
+        for i in range(1, ys.size(1) + 1):
+            # Reorder the beam as the beam search does
+            order = torch.tensor([2, 0, 1]) if i % 2 == 0 else torch.arange(3)
+            ys = ys[order]
+            states = [states[j] for j in order]
+            logp, states = model.batch_score(ys[:, :i], states, None)
+
+            expected = model(ys[:, :i], None)[0][:, -1].log_softmax(dim=-1)
+            torch.testing.assert_close(logp, expected)
+
+        # The states from different batches are merged
+        ys2 = torch.randint(1, 10, (1, ys.size(1)))
+        state2 = None
+        for i in range(1, ys2.size(1) + 1):
+            _, state2 = model.score(ys2[0, :i], state2, None)
+        ys = torch.cat([torch.cat([ys, ys2]), torch.randint(1, 10, (4, 1))], dim=1)
+        ys = ys[[1, 3]]
+        logp, _ = model.batch_score(ys, [states[1], state2], None)
+        expected = model(ys, None)[0][:, -1].log_softmax(dim=-1)
+        torch.testing.assert_close(logp, expected)
+
+
+@pytest.mark.parametrize("pos_enc", ["sinusoidal", None])
+def test_TransformerLM_score_kv_cache(pos_enc):
+    model = TransformerLM(10, pos_enc=pos_enc, unit=10).eval()
+    y = torch.randint(1, 10, (5,))
+    state = None
+    with torch.no_grad():
+        for i in range(1, len(y) + 1):
+            logp, state = model.score(y[:i], state, None)
+            expected = model(y[None, :i], None)[0][0, -1].log_softmax(dim=-1)
+            torch.testing.assert_close(logp, expected)
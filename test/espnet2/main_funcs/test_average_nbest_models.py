@@ -65,3 +65,33 @@ def test_average_nbest_models_0epoch_reporter(output_dir, nbest):
             best_model_criterion=[("valid", "acc", "max")],
             nbest=nbest,
         )
+
+
+def test_average_nbest_models_value(tmp_path):
+    reporter = Reporter()
+    for e, (acc, loss) in enumerate([(0.4, 3.0), (0.6, 1.0), (0.5, 2.0)], 1):
+        reporter.set_epoch(e)
+        with reporter.observe("valid") as sub:
+            sub.register({"acc": acc, "loss": loss})
+            sub.next()
+        torch.save(
+            {"w": torch.full((2,), float(e)), "n": torch.tensor(e)},
+            tmp_path / f"{e}epoch.pth",
+        )
+
+    average_nbest_models(
+        reporter=reporter,
+        output_dir=tmp_path,
+        best_model_criterion=[("valid", "acc", "max"), ("valid", "loss", "min")],
+        nbest=[1, 2, 3],
+    )
+    avg = torch.load(tmp_path / "valid.acc.ave_2best.pth")
+    assert torch.equal(avg["w"], torch.full((2,), 2.5))
+    assert avg["w"].dtype == torch.float32
+    assert avg["n"] == 5
+    avg = torch.load(tmp_path / "valid.acc.ave.pth")
+    assert torch.equal(avg["w"], torch.full((2,), 2.0))
+    assert avg["n"] == 6
+    # The same epochs are selected by both criteria
+    assert (tmp_path / "valid.loss.ave_2best.pth").is_symlink()
+    assert (tmp_path / "valid.loss.ave_3best.pth").is_symlink()
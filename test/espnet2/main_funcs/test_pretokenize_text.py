@@ -0,0 +1,72 @@
+import numpy as np
+
+from espnet2.fileio.mmap_store import MmapStoreReader
+from espnet2.main_funcs.pretokenize_text import get_tokenizer_hash
+from espnet2.main_funcs.pretokenize_text import pretokenize_text
+
+
+def tokenize(text):
+    return np.array([ord(c) for c in text], dtype=np.int64)
+
+
+def test_get_tokenizer_hash(tmp_path):
+    token_list = tmp_path / "tokens.txt"
+    token_list.write_text("a\nb\n")
+    hash1 = get_tokenizer_hash(dict(token_type="char", token_list=str(token_list)))
+    assert hash1 == get_tokenizer_hash(
+        dict(token_type="char", token_list=str(token_list))
+    )
+    token_list.write_text("a\nb\nc\n")
+    assert hash1 != get_tokenizer_hash(
+        dict(token_type="char", token_list=str(token_list))
+    )
+
+
+def test_pretokenize_text(tmp_path):
+    text = tmp_path / "text"
+    with text.open("w") as f:
+        for i in range(10):
+            f.write(f"utt{i} abc {i}\n")
+    output_dir = tmp_path / "pretokenized"
+    path_name_type_list = [("wav.scp", "speech", "sound"), (str(text), "text", "text")]
+
+    for nj in [1, 2]:
+        retval = pretokenize_text(
+            tokenize=tokenize,
+            path_name_type_list=path_name_type_list,
+            text_names=["text"],
+            output_dir=output_dir,
+            tokenizer_hash="dummy",
+            nj=nj,
+            chunk_size=3,
+        )
+        assert retval == [
+            ("wav.scp", "speech", "sound"),
+            (str(output_dir / "text"), "text", "mmap"),
+        ]
+        reader = MmapStoreReader(output_dir / "text")
+        assert len(reader) == 10
+        for i in range(10):
+            np.testing.assert_array_equal(reader[f"utt{i}"], tokenize(f"abc {i}"))
+            assert reader[f"utt{i}"].dtype == np.int32
+
+
+def test_pretokenize_text_invalidate(tmp_path):
+    text = tmp_path / "text"
+    text.write_text("utt1 abc\n")
+    kwargs = dict(
+        tokenize=tokenize,
+        path_name_type_list=[(str(text), "text", "text")],
+        text_names=["text"],
+        output_dir=tmp_path / "pretokenized",
+    )
+    pretokenize_text(tokenizer_hash="a", **kwargs)
+    assert (
+        MmapStoreReader(tmp_path / "pretokenized" / "text").meta["tokenizer_hash"]
+        == "a"
+    )
+    pretokenize_text(tokenizer_hash="b", **kwargs)
+    assert (
+        MmapStoreReader(tmp_path / "pretokenized" / "text").meta["tokenizer_hash"]
+        == "b"
+    )
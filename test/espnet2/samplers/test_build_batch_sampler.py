@@ -27,7 +27,7 @@ def shape_files(tmp_path):
 
 
 @pytest.mark.parametrize(
-    "type", ["unsorted", "sorted", "folded", "length", "numel", "foo"]
+    "type", ["unsorted", "sorted", "folded", "length", "numel", "cost", "foo"]
 )
 def test_build_batch_sampler(shape_files, type):
     if type == "foo":
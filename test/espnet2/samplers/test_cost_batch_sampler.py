@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from espnet2.samplers.cost_batch_sampler import CostBatchSampler
+from espnet2.samplers.cost_batch_sampler import fit_quadratic_cost
+from espnet2.samplers.length_batch_sampler import LengthBatchSampler
+
+
+@pytest.fixture()
+def shape_files(tmp_path):
+    p1 = tmp_path / "shape1.txt"
+    with p1.open("w") as f:
+        f.write("a 1000,80\n")
+        f.write("b 400,80\n")
+        f.write("c 800,80\n")
+        f.write("d 789,80\n")
+        f.write("e 1023,80\n")
+        f.write("f 999,80\n")
+
+    p2 = tmp_path / "shape2.txt"
+    with p2.open("w") as f:
+        f.write("a 30,30\n")
+        f.write("b 50,30\n")
+        f.write("c 39,30\n")
+        f.write("d 49,30\n")
+        f.write("e 44,30\n")
+        f.write("f 99,30\n")
+
+    return str(p1), str(p2)
+
+
+@pytest.mark.parametrize("sort_in_batch", ["descending", "ascending"])
+@pytest.mark.parametrize("sort_batch", ["descending", "ascending"])
+@pytest.mark.parametrize("drop_last", [True, False])
+@pytest.mark.parametrize("cost_quadratic", [0.0, 0.01])
+def test_CostBatchSampler(
+    shape_files, sort_in_batch, sort_batch, drop_last, cost_quadratic
+):
+    sampler = CostBatchSampler(
+        6000,
+        shape_files=shape_files,
+        cost_quadratic=cost_quadratic,
+        sort_in_batch=sort_in_batch,
+        sort_batch=sort_batch,
+        drop_last=drop_last,
+    )
+    batches = list(sampler)
+    if not drop_last:
+        assert sorted(k for b in batches for k in b) == list("abcdef")
+
+
+def test_CostBatchSampler_repr(shape_files):
+    sampler = CostBatchSampler(6000, shape_files=shape_files)
+    print(sampler)
+
+
+def test_CostBatchSampler_cost(tmp_path):
+    p = tmp_path / "shape.txt"
+    with p.open("w") as f:
+        for i, lg in enumerate([10] * 8 + [100] * 8):
+            f.write(f"utt{i:02d} {lg}\n")
+    batches = list(
+        CostBatchSampler(
+            2400, shape_files=[str(p)], cost_quadratic=0.1, sort_batch="ascending"
+        )
+    )
+    # 10 + 0.1 * 10^2 = 20 and 100 + 0.1 * 100^2 = 1100 per sample
+    assert [len(b) for b in batches] == [8, 2, 2, 2, 2]
+
+    # Equivalent to "length" if no quadratic term
+    batches = list(CostBatchSampler(400, shape_files=[str(p)], sort_batch="ascending"))
+    assert [len(b) for b in batches] == [8, 4, 4]
+
+
+def test_CostBatchSampler_min_batch_size(shape_files):
+    sampler = CostBatchSampler(1, shape_files=shape_files, min_batch_size=2)
+    for batch in sampler:
+        assert len(batch) >= 2
+
+
+def test_CostBatchSampler_same_as_length_without_quadratic(tmp_path):
+    p = tmp_path / "shape.txt"
+    rng = np.random.RandomState(0)
+    utt2length = {f"utt{i:03d}": lg for i, lg in enumerate(rng.randint(10, 1000, 100))}
+    with p.open("w") as f:
+        for k, lg in utt2length.items():
+            f.write(f"{k} {lg}\n")
+    cost = CostBatchSampler(5000, shape_files=[str(p)])
+    for batch in cost:
+        # The cost doesn't exceed batch_bins
+        assert len(batch) * max(utt2length[k] for k in batch) <= 5000
+    assert len(cost) >= len(LengthBatchSampler(5000, shape_files=[str(p)]))
+
+
+def test_fit_quadratic_cost():
+    batch_sizes = [32, 16, 8, 4, 16]
+    lengths = [100, 200, 400, 800, 400]
+    costs = [
+        0.5 + 1e-4 * b * lg + 2e-7 * b * lg**2 for b, lg in zip(batch_sizes, lengths)
+    ]
+    assert fit_quadratic_cost(batch_sizes, lengths, costs) == pytest.approx(2e-3)
@@ -1,5 +1,8 @@
+import numpy as np
 import pytest
 
+from espnet2.asr.frontend.default import DefaultFrontend
+from espnet2.fileio.mmap_store import MmapStoreWriter
 from espnet2.tasks.asr import ASRTask
 
 
@@ -34,3 +37,32 @@ def test_print_config_and_load_it(tmp_path):
         ASRTask.print_config(f)
     parser = ASRTask.get_parser()
     parser.parse_args(["--config", str(config_file)])
+
+
+def test_get_frontend_hash():
+    args = ASRTask.get_parser().parse_args(["--token_list", "dummy"])
+    hash1 = ASRTask.get_frontend_hash(args)
+    args.frontend_conf = {"n_fft": 512}
+    assert ASRTask.get_frontend_hash(args) == hash1
+    args.frontend_conf = {"n_fft": 256}
+    assert ASRTask.get_frontend_hash(args) != hash1
+
+
+def test_check_feats_cache(tmp_path):
+    args = ASRTask.get_parser().parse_args(["--token_list", "dummy"])
+    frontend = DefaultFrontend()
+    with MmapStoreWriter(
+        tmp_path / "feats", meta=ASRTask.collected_feats_meta(args)
+    ) as writer:
+        writer["a"] = np.random.randn(10, 80).astype(np.float32)
+    args.train_data_path_and_name_and_type = [
+        (str(tmp_path / "feats"), "feats", "mmap")
+    ]
+    ASRTask.check_feats_cache(args, frontend)
+
+    args.frontend_conf = {"n_mels": 40}
+    with pytest.raises(RuntimeError):
+        ASRTask.check_feats_cache(args, DefaultFrontend(n_mels=40))
+
+    with pytest.raises(RuntimeError):
+        ASRTask.check_feats_cache(args, None)
@@ -1,5 +1,6 @@
 import pytest
 
+from espnet2.bin.lm_build_token_corpus import build_token_corpus
 from espnet2.tasks.lm import LMTask
 
 
@@ -34,3 +35,50 @@ def test_print_config_and_load_it(tmp_path):
         LMTask.print_config(f)
     parser = LMTask.get_parser()
     parser.parse_args(["--config", str(config_file)])
+
+
+def test_main_with_packed_token_corpus(tmp_path):
+    with (tmp_path / "text").open("w") as f:
+        for i in range(20):
+            f.write(f"utt{i} {'abc'[: i % 3 + 1]}\n")
+    with (tmp_path / "tokens.txt").open("w") as f:
+        f.write("<blank>\n<unk>\na\nb\nc\n<sos/eos>\n")
+    build_token_corpus(
+        input=str(tmp_path / "text"),
+        output_dir=str(tmp_path / "corpus"),
+        token_type="char",
+        token_list=str(tmp_path / "tokens.txt"),
+        bpemodel=None,
+        non_linguistic_symbols=None,
+        cleaner=None,
+        g2p=None,
+        log_interval=100,
+    )
+
+    LMTask.main(
+        cmd=[
+            "--iterator_type",
+            "task",
+            "--train_data_path_and_name_and_type",
+            f"{tmp_path / 'corpus'},text,token_corpus",
+            "--valid_data_path_and_name_and_type",
+            f"{tmp_path / 'corpus'},text,token_corpus",
+            "--token_type",
+            "char",
+            "--token_list",
+            str(tmp_path / "tokens.txt"),
+            "--pack_block_size",
+            "8",
+            "--batch_size",
+            "2",
+            "--max_epoch",
+            "1",
+            "--lm_conf",
+            "unit=4",
+            "--lm_conf",
+            "nlayers=1",
+            "--output_dir",
+            str(tmp_path / "exp"),
+        ]
+    )
+    assert (tmp_path / "exp" / "1epoch.pth").exists()
@@ -1,5 +1,7 @@
+import numpy as np
 import pytest
 
+from espnet2.fileio.mmap_store import MmapStoreWriter
 from espnet2.tasks.tts import TTSTask
 
 
@@ -34,3 +36,39 @@ def test_print_config_and_load_it(tmp_path):
         TTSTask.print_config(f)
     parser = TTSTask.get_parser()
     parser.parse_args(["--config", str(config_file)])
+
+
+def test_get_extract_hash():
+    args = TTSTask.get_parser().parse_args(
+        ["--token_list", "dummy", "--pitch_extract", "dio"]
+    )
+    hash1 = TTSTask.get_extract_hash(args)
+    args.pitch_extract_conf = {"f0min": 80}
+    assert TTSTask.get_extract_hash(args) == hash1
+    args.pitch_extract_conf = {"f0min": 60}
+    assert TTSTask.get_extract_hash(args) != hash1
+
+
+def test_check_collected_feats(tmp_path):
+    args = TTSTask.get_parser().parse_args(
+        ["--token_list", "dummy", "--pitch_extract", "dio"]
+    )
+    with MmapStoreWriter(
+        tmp_path / "pitch", meta=TTSTask.collected_feats_meta(args)
+    ) as writer:
+        writer["a"] = np.random.randn(10, 1).astype(np.float32)
+    args.train_data_path_and_name_and_type = [
+        (str(tmp_path / "pitch"), "pitch", "mmap")
+    ]
+    TTSTask.check_collected_feats(args)
+
+    args.pitch_extract_conf = {"hop_length": 128}
+    with pytest.raises(RuntimeError):
+        TTSTask.check_collected_feats(args)
+
+
+def test_g2p_cache_is_disabled_by_default():
+    # The in-memory cache is lost when the data loader workers are re-forked
+    args = TTSTask.get_parser().parse_args(["--token_list", "dummy"])
+    assert args.g2p_cache_size == 0
+    assert args.g2p_cache_dir is None
@@ -1,5 +1,8 @@
+import pickle
+
 import pytest
 
+from espnet2.text.phoneme_tokenizer import G2pCache
 from espnet2.text.phoneme_tokenizer import PhonemeTokenizer
 
 params = ["g2p_en", "g2p_en_no_space"]
@@ -105,3 +108,47 @@ def test_text2tokens(phoneme_tokenizer: PhonemeTokenizer):
 
 def test_token2text(phoneme_tokenizer: PhonemeTokenizer):
     assert phoneme_tokenizer.tokens2text(["a", "b", "c"]) == "abc"
+
+
+class CountingG2p:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, text):
+        self.count += 1
+        return list(text.replace(" ", ""))
+
+
+def test_g2p_cache_memory():
+    g2p = CountingG2p()
+    cache = G2pCache(g2p, g2p_type="g2p_en", cache_size=2)
+    assert cache("a b") == ["a", "b"]
+    assert cache("a b") == ["a", "b"]
+    assert g2p.count == 1
+    cache("c")
+    cache("d")
+    assert len(cache.memory) == 2
+    cache("a b")
+    assert g2p.count == 4
+
+
+def test_g2p_cache_disk(tmp_path):
+    g2p = CountingG2p()
+    cache = G2pCache(g2p, g2p_type="g2p_en", cache_size=0, cache_dir=tmp_path)
+    assert cache("a b") == ["a", "b"]
+    assert cache("a b") == ["a", "b"]
+    assert g2p.count == 1
+
+    # The disk cache is shared by the other instances, e.g. DataLoader workers
+    cache2 = pickle.loads(pickle.dumps(cache))
+    assert cache2("a b") == ["a", "b"]
+    assert cache2.g2p.count == 1
+
+
+def test_text2tokens_with_g2p_cache(tmp_path):
+    tokenizer = PhonemeTokenizer(
+        g2p_type="g2p_en", g2p_cache_size=10, g2p_cache_dir=tmp_path
+    )
+    output = ["HH", "AH0", "L", "OW1", " ", "W", "ER1", "L", "D"]
+    assert tokenizer.text2tokens("Hello World") == output
+    assert tokenizer.text2tokens("Hello World") == output
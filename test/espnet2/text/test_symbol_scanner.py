@@ -0,0 +1,48 @@
+import random
+
+from espnet2.text.symbol_scanner import SymbolScanner
+
+
+def _naive_scan(line, symbols, remove_symbols):
+    tokens = []
+    while len(line) != 0:
+        for w in symbols:
+            if line.startswith(w):
+                if not remove_symbols:
+                    tokens.append(w)
+                line = line[len(w) :]
+                break
+        else:
+            tokens.append(line[0])
+            line = line[1:]
+    return tokens
+
+
+def test_scan():
+    scanner = SymbolScanner(["<noise>", "<unk>", "a.b"])
+    assert scanner("x<noise> a.b<unk>") == ["x", "<noise>", " ", "a.b", "<unk>"]
+    assert scanner("x<noise> a.b", remove_symbols=True) == ["x", " "]
+
+
+def test_scan_without_symbols():
+    scanner = SymbolScanner([])
+    assert scanner("a b\n") == ["a", " ", "b", "\n"]
+
+
+def test_scan_longest_symbol():
+    scanner = SymbolScanner(["ab", "abcd", ""])
+    assert scanner("abcabcd") == ["ab", "c", "abcd"]
+
+
+def test_scan_large_symbol_set():
+    rng = random.Random(0)
+    symbols = [f"[sym{i}]" for i in range(1000)]
+    line = "".join(
+        rng.choice(symbols) if rng.random() < 0.1 else rng.choice("ab [s]y")
+        for _ in range(5000)
+    )
+    scanner = SymbolScanner(symbols)
+    for remove_symbols in [False, True]:
+        assert scanner(line, remove_symbols) == _naive_scan(
+            line, symbols, remove_symbols
+        )
@@ -4,9 +4,13 @@ import numpy as np
 import pytest
 import soundfile
 
+from espnet2.fileio.mmap_store import MmapStoreWriter
 from espnet2.fileio.npy_scp import NpyScpWriter
 from espnet2.fileio.sound_scp import SoundScpWriter
+from espnet2.fileio.token_corpus import TokenCorpusWriter
 from espnet2.train.dataset import ESPnetDataset
+from espnet2.train.dataset import pack_sentences
+from espnet2.train.dataset import PackedTokenDataset
 
 
 def preprocess(id: str, data):
@@ -139,6 +143,34 @@ def test_ESPnetDataset_npy_scp(npy_scp):
     )
 
 
+@pytest.fixture
+def mmap_store(tmp_path):
+    p = tmp_path / "mmap"
+    with MmapStoreWriter(p) as w:
+        w["a"] = np.random.randn(100, 80)
+        w["b"] = np.random.randn(150, 80)
+    return str(p)
+
+
+def test_ESPnetDataset_mmap(mmap_store):
+    dataset = ESPnetDataset(
+        path_name_type_list=[(mmap_store, "data3", "mmap")],
+        preprocess=preprocess,
+    )
+
+    _, data = dataset["a"]
+    assert data["data3"].shape == (
+        100,
+        80,
+    )
+
+    _, data = dataset["b"]
+    assert data["data3"].shape == (
+        150,
+        80,
+    )
+
+
 @pytest.fixture
 def h5file_1(tmp_path):
     p = tmp_path / "file.h5"
@@ -322,3 +354,27 @@ def test_ESPnetDataset_csv_int(csv_int):
 
     _, data = dataset["b"]
     assert tuple(data["data8"]) == (2, 3, 4)
+
+
+def test_pack_sentences():
+    boundaries = pack_sentences(np.array([3, 2, 4, 9, 1, 0, 2]), block_size=6)
+    np.testing.assert_array_equal(boundaries, [0, 2, 3, 4, 7])
+
+
+def test_PackedTokenDataset(tmp_path):
+    sentences = [[3, 4, 5], [6, 7], [8, 8, 8, 8], [1] * 9]
+    with TokenCorpusWriter(tmp_path / "corpus") as writer:
+        for s in sentences:
+            writer.append(np.array(s))
+    dataset = PackedTokenDataset(tmp_path / "corpus", block_size=6, eos=99)
+    assert len(dataset) == 3
+    assert dataset.has_name("text")
+    assert dataset.names() == ("text",)
+    print(dataset)
+
+    uid, data = dataset[0]
+    assert uid == "0"
+    assert data["text"].dtype == np.int64
+    np.testing.assert_array_equal(data["text"], [3, 4, 5, 99, 6, 7])
+    np.testing.assert_array_equal(dataset["1"][1]["text"], [8, 8, 8, 8])
+    np.testing.assert_array_equal(dataset[2][1]["text"], [1] * 9)
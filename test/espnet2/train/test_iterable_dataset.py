@@ -1,4 +1,5 @@
 from distutils.version import LooseVersion
+from io import BytesIO
 
 import h5py
 import kaldiio
@@ -55,6 +56,44 @@ def test_ESPnetDataset_sound_scp(sound_scp):
             assert data["data1"].shape == (80000,)
 
 
+@pytest.fixture
+def sound_ark_scp(tmp_path):
+    # The wav files packed in a Kaldi-ark as format_wav_scp.py --archive true
+    audios = {
+        "a": np.random.randint(-100, 100, (1600,), dtype=np.int16),
+        "b": np.random.randint(-100, 100, (800,), dtype=np.int16),
+    }
+    ark = tmp_path / "data_wav.ark"
+    p = tmp_path / "wav.scp"
+    with ark.open("wb") as fark, p.open("w") as f:
+        for k, audio in audios.items():
+            fark.write(f"{k} ".encode())
+            f.write(f"{k} {ark}:{fark.tell()}\n")
+            with BytesIO() as g:
+                soundfile.write(g, audio, 16000, format="wav", subtype="PCM_16")
+                fark.write(g.getvalue())
+    return str(p), audios
+
+
+@pytest.mark.skipif(
+    LooseVersion(torch.__version__) < LooseVersion("1.2"), reason="require pytorch>=1.2"
+)
+def test_ESPnetDataset_sound_ark_scp(sound_ark_scp):
+    path, audios = sound_ark_scp
+    dataset = IterableESPnetDataset(
+        path_name_type_list=[(path, "data1", "sound")],
+        preprocess=preprocess,
+    )
+
+    keys = []
+    for key, data in dataset:
+        keys.append(key)
+        np.testing.assert_allclose(
+            data["data1"], audios[key].astype(np.float32) / (1 << 15)
+        )
+    assert keys == ["a", "b"]
+
+
 @pytest.fixture
 def pipe_wav(tmp_path):
     p = tmp_path / "wav.scp"
@@ -0,0 +1,21 @@
+import torch
+
+from espnet2.tts.feats_extract.average_by_duration import average_by_duration
+
+
+def test_average_by_duration():
+    xs = torch.tensor([[1.0, 3.0, 2.0, 4.0, 6.0], [4.0, 2.0, 1.0, 5.0, 5.0]])
+    xlens = torch.LongTensor([5, 3])
+    ds = torch.LongTensor([[2, 0, 3], [1, 2, 0]])
+    es = average_by_duration(xs, xlens, ds)
+    expected = torch.tensor([[2.0, 0.0, 4.0], [4.0, 1.5, 0.0]])
+    assert torch.allclose(es, expected)
+
+
+def test_average_by_duration_voiced_only():
+    xs = torch.tensor([[1.0, 0.0, 3.0, 0.0, 0.0, 2.0], [4.0, 2.0, 0.0, 0.0, 0.0, 0.0]])
+    xlens = torch.LongTensor([6, 3])
+    ds = torch.LongTensor([[2, 0, 3, 1], [1, 2, 0, 0]])
+    ps = average_by_duration(xs, xlens, ds, voiced_only=True)
+    expected = torch.tensor([[1.0, 0.0, 3.0, 2.0], [4.0, 2.0, 0.0, 0.0]])
+    assert torch.allclose(ps, expected)
@@ -0,0 +1,104 @@
+import math
+
+import pytest
+import torch
+
+from espnet2.tts.feats_extract.yin import Yin
+
+
+@pytest.mark.parametrize("use_continuous_f0", [False, True])
+@pytest.mark.parametrize("use_log_f0", [False, True])
+@pytest.mark.parametrize("use_token_averaged_f0", [False, True])
+def test_forward(use_continuous_f0, use_log_f0, use_token_averaged_f0):
+    layer = Yin(
+        n_fft=128,
+        hop_length=64,
+        f0min=300,
+        f0max=800,
+        fs="16k",
+        use_continuous_f0=use_continuous_f0,
+        use_log_f0=use_log_f0,
+        use_token_averaged_f0=use_token_averaged_f0,
+    )
+    xs = torch.randn(2, 256)
+    if not use_token_averaged_f0:
+        ps, plens = layer(xs, torch.LongTensor([256, 128]))
+        assert ps.shape[1] == max(plens)
+    else:
+        ds = torch.LongTensor([[3, 0, 2], [3, 0, 0]])
+        dlens = torch.LongTensor([3, 1])
+        ps, _ = layer(
+            xs, torch.LongTensor([256, 128]), durations=ds, durations_lengths=dlens
+        )
+        assert torch.isnan(ps).sum() == 0
+
+
+def test_forward_with_feats_lengths():
+    layer = Yin(n_fft=128, hop_length=64, f0min=300, f0max=800, fs="16k")
+    xs = torch.randn(2, 256)
+    ds = torch.LongTensor([[3, 0, 3], [2, 1, 0]])
+    ps, plens = layer(
+        xs,
+        torch.LongTensor([256, 128]),
+        feats_lengths=torch.LongTensor([6, 3]),
+        durations=ds,
+        durations_lengths=torch.LongTensor([3, 2]),
+    )
+    assert ps.shape == (2, 3, 1)
+
+
+@pytest.mark.parametrize("f0", [100.0, 150.0, 220.0])
+def test_f0_accuracy(f0):
+    fs = 16000
+    layer = Yin(
+        fs=fs,
+        n_fft=1024,
+        hop_length=256,
+        f0min=80,
+        f0max=400,
+        use_token_averaged_f0=False,
+        use_continuous_f0=False,
+        use_log_f0=False,
+    )
+    t = torch.arange(fs) / fs
+    xs = sum(torch.sin(2 * math.pi * k * f0 * t) / k for k in range(1, 5))
+    ps, _ = layer(xs[None])
+    # Ignore the frames at the edges
+    ps = ps[0, 4:-4, 0]
+    assert (ps > 0).all()
+    assert ((ps - f0).abs() / f0).max() < 0.01
+
+
+def test_silence_is_unvoiced():
+    layer = Yin(
+        n_fft=128,
+        hop_length=64,
+        f0min=300,
+        f0max=800,
+        fs="16k",
+        use_token_averaged_f0=False,
+    )
+    ps, _ = layer(torch.zeros(1, 256))
+    assert (ps == 0).all()
+
+
+def test_convert_to_continuous_f0():
+    f0 = torch.tensor(
+        [[0.0, 100.0, 0.0, 200.0, 0.0, 0.0], [0.0, 0.0, 0.0, 0.0, 0.0, 0.0]]
+    )
+    mask = torch.tensor([[True] * 5 + [False], [True] * 6])
+    ps = Yin._convert_to_continuous_f0(f0, mask)
+    expected = torch.tensor(
+        [[100.0, 100.0, 150.0, 200.0, 200.0, 0.0], [0.0, 0.0, 0.0, 0.0, 0.0, 0.0]]
+    )
+    assert torch.allclose(ps, expected)
+
+
+def test_output_size():
+    layer = Yin(n_fft=128, hop_length=1, f0min=300, f0max=800, fs="16k")
+    print(layer.output_size())
+
+
+def test_get_parameters():
+    layer = Yin(n_fft=128, hop_length=1, f0min=300, f0max=800, fs="16k")
+    print(layer.get_parameters())
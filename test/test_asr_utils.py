@@ -0,0 +1,103 @@
+# coding: utf-8
+
+#  Apache 2.0  (http://www.apache.org/licenses/LICENSE-2.0)
+
+import json
+
+import pytest
+
+from espnet.asr.asr_utils import decode_recog_json
+from espnet.asr.asr_utils import iter_recog_json
+from espnet.asr.asr_utils import JsonlResultWriter
+
+
+def make_utts(n=5):
+    return {
+        f"utt{i}": {"input": [{"shape": [10 + i, 3]}], "output": [], "utt2spk": "spk"}
+        for i in range(n)
+    }
+
+
+def dummy_decode(batch):
+    return [
+        {"utt2spk": info["utt2spk"], "output": [{"name": name}]} for name, info in batch
+    ]
+
+
+@pytest.fixture
+def recog_json(tmp_path):
+    p = tmp_path / "data.json"
+    with open(p, "w") as f:
+        json.dump({"utts": make_utts()}, f)
+    return str(p)
+
+
+@pytest.fixture
+def recog_jsonl(tmp_path):
+    p = tmp_path / "data.jsonl"
+    with open(p, "w") as f:
+        for k, v in make_utts().items():
+            f.write(json.dumps({k: v}) + "\n")
+    return str(p)
+
+
+def test_iter_recog_json(recog_json, recog_jsonl):
+    assert dict(iter_recog_json(recog_json)) == make_utts()
+    assert dict(iter_recog_json(recog_jsonl)) == make_utts()
+
+
+def test_JsonlResultWriter_resume(tmp_path):
+    p = str(tmp_path / "result.jsonl")
+    writer = JsonlResultWriter(p)
+    writer["a"] = {"x": 1}
+    writer["b"] = {"x": 2}
+    writer.close()
+    # Simulate an interrupted write
+    with open(p, "a") as f:
+        f.write('{"c": {"x"')
+
+    writer = JsonlResultWriter(p)
+    assert "a" in writer
+    assert "b" in writer
+    assert "c" not in writer
+    writer["c"] = {"x": 3}
+    writer.close()
+    assert dict(iter_recog_json(p)) == {"a": {"x": 1}, "b": {"x": 2}, "c": {"x": 3}}
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+@pytest.mark.parametrize("batchsize, sort", [(0, False), (1, False), (2, True)])
+def test_decode_recog_json(recog_json, tmp_path, num_workers, batchsize, sort):
+    result_label = tmp_path / "result.json"
+    decode_recog_json(
+        dummy_decode,
+        recog_json,
+        str(result_label),
+        batchsize=batchsize,
+        sort_in_input_length=sort,
+        num_workers=num_workers,
+    )
+    with open(result_label) as f:
+        js = json.load(f)["utts"]
+    assert js == {k: dummy_decode([(k, v)])[0] for k, v in make_utts().items()}
+
+
+def test_decode_recog_json_resume(recog_jsonl, tmp_path):
+    result_label = tmp_path / "result.json"
+    result_jsonl = str(tmp_path / "result.jsonl")
+    writer = JsonlResultWriter(result_jsonl)
+    writer["utt0"] = {"done": True}
+    writer.close()
+
+    decoded = []
+
+    def decode(batch):
+        decoded.extend(name for name, _ in batch)
+        return dummy_decode(batch)
+
+    decode_recog_json(decode, recog_jsonl, str(result_label), result_jsonl=result_jsonl)
+    assert decoded == ["utt1", "utt2", "utt3", "utt4"]
+    with open(result_label) as f:
+        js = json.load(f)["utts"]
+    assert js["utt0"] == {"done": True}
+    assert set(js) == set(make_utts())
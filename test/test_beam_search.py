@@ -220,3 +220,78 @@ def test_beam_search_equal(
         actual = actual.asdict()
         assert expected["yseq"] == actual["yseq"]
         numpy.testing.assert_allclose(expected["score"], actual["score"], rtol=1e-6)
+
+
+def prepare_espnet2(beam_class, **kwargs):
+    from espnet.nets.scorers.ctc import CTCPrefixScorer
+    from espnet2.asr.ctc import CTC
+    from espnet2.asr.decoder.transformer_decoder import TransformerDecoder
+    from espnet2.lm.transformer_lm import TransformerLM
+
+    torch.manual_seed(0)
+    vocab_size = 10
+    decoder = TransformerDecoder(
+        vocab_size, 8, attention_heads=2, linear_units=8, num_blocks=1
+    ).eval()
+    ctc = CTC(vocab_size, 8)
+    lm = TransformerLM(vocab_size, unit=8, att_unit=8, layer=1).eval()
+    beam = beam_class(
+        scorers=dict(
+            decoder=decoder,
+            ctc=CTCPrefixScorer(ctc, vocab_size - 1),
+            lm=lm,
+            length_bonus=LengthBonus(vocab_size),
+        ),
+        weights=dict(decoder=0.7, ctc=0.3, lm=0.3, length_bonus=1.0),
+        beam_size=4,
+        vocab_size=vocab_size,
+        sos=vocab_size - 1,
+        eos=vocab_size - 1,
+        pre_beam_score_key="full",
+        **kwargs,
+    )
+    return beam, ctc, torch.randn(20, 8)
+
+
+def _results(nbest):
+    return [(h.yseq.tolist(), round(float(h.score), 4)) for h in nbest]
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_beam_search_pruning_options(batch):
+    from espnet.nets.batch_beam_search import BatchBeamSearch
+
+    beam_class = BatchBeamSearch if batch else BeamSearch
+    beam, _, x = prepare_espnet2(beam_class)
+    with torch.no_grad():
+        expected = _results(beam(x, maxlenratio=0.5))
+
+    # The options which don't prune anything don't change the results
+    beam, _, x = prepare_espnet2(
+        beam_class, score_threshold=1e10, adaptive_beam_patience=1, min_beam_size=4
+    )
+    with torch.no_grad():
+        assert _results(beam(x, maxlenratio=0.5)) == expected
+
+    beam, _, x = prepare_espnet2(
+        beam_class, score_threshold=0.0, adaptive_beam_patience=1
+    )
+    with torch.no_grad():
+        nbest = beam(x, maxlenratio=0.5)
+    assert len(nbest) > 0
+
+
+@pytest.mark.parametrize("batch", [False, True])
+def test_beam_search_ctc_endpoint(batch):
+    from espnet.nets.batch_beam_search import BatchBeamSearch
+
+    beam_class = BatchBeamSearch if batch else BeamSearch
+    beam, ctc, x = prepare_espnet2(beam_class, ctc_endpoint_margin=1)
+    ids = torch.unique_consecutive(ctc.argmax(x[None])[0])
+    ctc_length = int((ids != 0).sum())
+    assert beam.ctc_length(x) == ctc_length
+    with torch.no_grad():
+        nbest = beam(x, maxlenratio=1.0)
+    # <sos> + tokens + <eos>
+    assert all(len(h.yseq) <= ctc_length + 1 + 2 for h in nbest)
+    assert any(len(h.yseq) == ctc_length + 1 + 2 for h in nbest)
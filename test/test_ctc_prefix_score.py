@@ -0,0 +1,73 @@
+import numpy
+import pytest
+import torch
+
+from espnet.nets.ctc_prefix_score import CTCPrefixScore
+from espnet.nets.ctc_prefix_score import CTCPrefixScoreTH
+
+
+def _reference_scores(x, xlens, ys, eos):
+    """Compute the prefix scores of each hypothesis with CTCPrefixScore."""
+    odim = x.size(2)
+    n_hyps = len(ys) // x.size(0)
+    scores = []
+    for i, y in enumerate(ys):
+        x_i = x[i // n_hyps, : xlens[i // n_hyps]].numpy()
+        scorer = CTCPrefixScore(x_i, 0, eos, numpy)
+        r = scorer.initial_state()
+        s = 0.0
+        for j in range(1, len(y)):
+            log_psi, states = scorer(y[:j], numpy.array([y[j]]), r)
+            r, s = states[0], log_psi[0]
+        log_psi, _ = scorer(y, numpy.arange(odim), r)
+        scores.append(torch.as_tensor(log_psi - s))
+    return torch.stack(scores)
+
+
+@pytest.mark.parametrize("scoring_num", [0, 3])
+def test_ctc_prefix_score_th(scoring_num):
+    torch.manual_seed(0)
+    batch, n_hyps, odim = 2, 3, 6
+    eos = odim - 1
+    xlens = torch.tensor([12, 8])
+    x = torch.randn(batch, 12, odim).log_softmax(-1)
+    ys = [[eos, 1, 2], [eos, 2, 2], [eos, 3, 1], [eos, 4, 1], [eos, 2, 3], [eos, 1, 4]]
+
+    scorer = CTCPrefixScoreTH(x.clone(), xlens, 0, eos)
+    state = None
+    for j in range(1, len(ys[0]) + 1):
+        y = [y_i[:j] for y_i in ys]
+        if scoring_num > 0:
+            scoring_ids = torch.stack(
+                [
+                    torch.tensor([y_i[j]] + [0, eos][: scoring_num - 1])
+                    if j < len(y_i)
+                    else torch.arange(1, 1 + scoring_num)
+                    for y_i in ys
+                ]
+            )
+        else:
+            scoring_ids = None
+        scores, state = scorer(y, state, scoring_ids)
+        if j == len(ys[0]):
+            break
+        best_ids = torch.tensor(
+            [[h * odim + ys[b * n_hyps + h][j] for h in range(n_hyps)] for b in [0, 1]]
+        )
+        state = scorer.index_select_state(state, best_ids)
+
+    ref = _reference_scores(x, xlens, ys, eos)
+    if scoring_num > 0:
+        scored = torch.zeros_like(scores, dtype=torch.bool)
+        scored[torch.arange(len(ys)).unsqueeze(1), scoring_ids] = True
+        scored[:, 0] = False
+        assert torch.allclose(scores[scored], ref[scored], atol=1e-4)
+    else:
+        assert torch.allclose(scores[:, 1:], ref[:, 1:], atol=1e-4)
+
+
+def test_ctc_prefix_score_th_doesnt_expand_input():
+    x = torch.randn(1, 10, 7).log_softmax(-1)
+    scorer = CTCPrefixScoreTH(x, torch.tensor([10]), 0, 6)
+    assert scorer.x.shape == (10, 1, 7)
+    assert scorer.xb.shape == (10, 1)
@@ -0,0 +1,52 @@
+import subprocess
+import sys
+
+import pytest
+import torch
+
+from espnet.utils.forked_imap import forked_imap
+
+
+@pytest.mark.parametrize("num_workers", [1, 3])
+def test_forked_imap(num_workers):
+    weight = torch.randn(4, 4)
+
+    def func(x):
+        # "weight" is inherited from the parent process
+        return x, weight @ x
+
+    xs = [torch.randn(4) for _ in range(10)]
+    results = list(forked_imap(func, iter(xs), num_workers=num_workers, max_pending=2))
+    assert len(results) == len(xs)
+    for x, (x2, y) in zip(xs, results):
+        assert torch.equal(x, x2)
+        assert torch.allclose(y, weight @ x)
+
+
+def test_forked_imap_num_threads():
+    results = list(
+        forked_imap(
+            lambda x: torch.get_num_threads(), range(4), num_workers=2, num_threads=1
+        )
+    )
+    assert results == [1, 1, 1, 1]
+
+
+def test_forked_imap_consumer_raises():
+    # The slow consumer lets the workers fill up "max_pending",
+    # and Pool.terminate() must not wait for the feeder blocked by it.
+    code = """
+import time
+
+from espnet.utils.forked_imap import forked_imap
+
+for i, y in enumerate(forked_imap(lambda x: x, range(100), 2, max_pending=2)):
+    time.sleep(0.2)
+    if i == 3:
+        raise RuntimeError("stop")
+"""
+    proc = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, timeout=30
+    )
+    assert proc.returncode == 1
+    assert "RuntimeError: stop" in proc.stderr
@@ -60,21 +60,47 @@ def main():
     avg = None
 
     if args.backend == "pytorch":
+        from concurrent.futures import ThreadPoolExecutor
+        import inspect
+
         import torch
 
-        # sum
-        for path in last:
-            states = torch.load(path, map_location=torch.device("cpu"))["model"]
-            if avg is None:
-                avg = states
-            else:
-                for k in avg.keys():
-                    avg[k] += states[k]
+        def load(path):
+            # Memory-map the snapshot if possible, so that the optimizer states
+            # in the snapshot are never read into memory
+            if "mmap" in inspect.signature(torch.load).parameters:
+                try:
+                    return torch.load(path, map_location="cpu", mmap=True)["model"]
+                except RuntimeError:
+                    pass
+            return torch.load(path, map_location=torch.device("cpu"))["model"]
+
+        # sum in float64, while the next snapshot is loaded in background
+        dtypes = {}
+        with ThreadPoolExecutor(1) as executor:
+            future = executor.submit(load, last[0])
+            for i in range(len(last)):
+                states = future.result()
+                if i + 1 < len(last):
+                    future = executor.submit(load, last[i + 1])
+                if avg is None:
+                    avg = {}
+                    for k, v in states.items():
+                        dtypes[k] = v.dtype
+                        avg[k] = v.to(
+                            torch.float64 if v.is_floating_point() else v.dtype,
+                            copy=True,
+                        )
+                else:
+                    for k in avg.keys():
+                        avg[k] += states[k]
+                del states
 
         # average
         for k in avg.keys():
             if avg[k] is not None:
                 avg[k] /= args.num
+                avg[k] = avg[k].to(dtypes[k])
 
         torch.save(avg, args.out)
 